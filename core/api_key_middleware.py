@@ -10,6 +10,10 @@ class ApiKeyMiddleware:
         if request.path.startswith('/media/'):
             return self.get_response(request)
 
+        # Allow access to endpoints that authenticate their callers themselves
+        if request.path in settings.API_KEY_EXEMPT_PATHS:
+            return self.get_response(request)
+
         # Check for the API key in the request headers
         api_key = request.headers.get("X-API-Key")
 
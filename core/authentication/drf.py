@@ -0,0 +1,23 @@
+from rest_framework.authentication import BaseAuthentication
+
+
+class OIDCAuthentication(BaseAuthentication):
+    """
+    Drop-in replacement for ``mozilla_django_oidc.contrib.drf.OIDCAuthentication``
+    that imports it, and with it josepy, requests and the cryptography
+    stack, when the first request is authenticated instead of when the
+    URLconf is loaded.
+    """
+
+    def __init__(self, backend=None):
+        from mozilla_django_oidc.contrib.drf import (
+            OIDCAuthentication as MozillaOIDCAuthentication,
+        )
+
+        self.authentication = MozillaOIDCAuthentication(backend=backend)
+
+    def authenticate(self, request):
+        return self.authentication.authenticate(request)
+
+    def authenticate_header(self, request):
+        return self.authentication.authenticate_header(request)
@@ -0,0 +1,220 @@
+import json
+import logging
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+from rest_framework import status
+from rest_framework.authentication import BaseAuthentication
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.authentication.drf import OIDCAuthentication
+from customers.models import Customer
+from customers.serializers import CustomerSerializer
+from customers.views import customer_etag
+from orders.models import Order
+from orders.serializers import OrderSerializer
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH_REQUESTS = 50
+
+# Detail routes whose sub-requests are answered together with a single
+# pk__in query per route instead of one view dispatch per item. Each maps
+# to (queryset, serializer class, not-found message, response headers),
+# matching what the route's own view returns.
+DETAIL_LOOKUPS = {
+    "order-detail": (
+        lambda: Order.objects.select_related("customer"),
+        OrderSerializer,
+        "Order not found",
+        lambda order: {},
+    ),
+    "customer-detail": (
+        lambda: Customer.objects.all(),
+        CustomerSerializer,
+        "Customer not found",
+        lambda customer: {"ETag": customer_etag(customer)},
+    ),
+}
+
+# Response headers passed back with each sub-request's status and body.
+RESPONSE_HEADERS = ("ETag",)
+
+# Routes that can't be answered inside a batch: the batch endpoint itself
+# and the never-ending event stream.
+EXCLUDED_ROUTES = {"batch", "order-events"}
+
+
+def error(status_code, message):
+    return {"status": status_code, "body": {"status": "error", "message": message}}
+
+
+def entry(status_code, body, headers):
+    """A sub-request's result; ``headers`` is left out when empty."""
+    result = {"status": status_code, "body": body}
+    if headers:
+        result["headers"] = headers
+    return result
+
+
+class BatchUserAuthentication(BaseAuthentication):
+    """Authenticate a sub-request as the user the batch was authenticated as."""
+
+    def __init__(self, request):
+        self.user = request.user
+        self.auth = request.auth
+
+    def authenticate(self, request):
+        return self.user, self.auth
+
+
+class BatchView(APIView):
+    authentication_classes = [OIDCAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        """
+        Run several read-only API requests in one round trip.
+
+        The batch is authenticated once; sub-requests run as the same user
+        without going through the middleware and authentication again.
+        Order and customer detail lookups are grouped so each resource type
+        costs one query however many of them are requested.
+
+        Request Body:
+            requests: List of {"method": "GET", "path": "/api/orders/1/"}
+                objects, at most 50
+
+        Returns:
+            Response: One {"status", "body"} entry per sub-request, in order
+        """
+        items = request.data.get("requests") if isinstance(request.data, dict) else None
+        if not isinstance(items, list) or not items:
+            return Response(
+                {"status": "error", "message": "requests must be a non-empty list"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(items) > MAX_BATCH_REQUESTS:
+            return Response(
+                {
+                    "status": "error",
+                    "message": f"At most {MAX_BATCH_REQUESTS} requests per batch",
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            responses = [None] * len(items)
+            lookups = defaultdict(list)
+            for index, item in enumerate(items):
+                match, url = self.resolve_item(item)
+                if isinstance(match, dict):
+                    responses[index] = match
+                elif match.url_name in DETAIL_LOOKUPS and not url.query:
+                    lookups[match.url_name].append((index, match.kwargs["pk"]))
+                else:
+                    responses[index] = self.dispatch_item(request, match, url)
+
+            for url_name, pending in lookups.items():
+                queryset, serializer_class, not_found, headers = DETAIL_LOOKUPS[
+                    url_name
+                ]
+                found = queryset().in_bulk({pk for _, pk in pending})
+                for index, pk in pending:
+                    if pk in found:
+                        responses[index] = entry(
+                            status.HTTP_200_OK,
+                            {
+                                "status": "success",
+                                "data": serializer_class(found[pk]).data,
+                            },
+                            headers(found[pk]),
+                        )
+                    else:
+                        responses[index] = error(status.HTTP_404_NOT_FOUND, not_found)
+
+            return Response({"status": "success", "responses": responses})
+        except Exception as e:
+            logger.error("Error processing batch request: %s", e)
+            return Response(
+                {"status": "error", "message": "Failed to process batch request"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+    def resolve_item(self, item):
+        """
+        Return ``(match, url)`` for a sub-request, with an error entry in
+        place of the match when it can't be run.
+        """
+        if not isinstance(item, dict) or not isinstance(item.get("path"), str):
+            return error(status.HTTP_400_BAD_REQUEST, "Each request needs a path"), None
+        url = urlsplit(item["path"])
+        if str(item.get("method", "GET")).upper() != "GET":
+            return (
+                error(
+                    status.HTTP_405_METHOD_NOT_ALLOWED,
+                    "Only GET requests can be batched",
+                ),
+                url,
+            )
+        if not url.path.startswith("/api/"):
+            return error(status.HTTP_404_NOT_FOUND, "Not found"), url
+        try:
+            match = resolve(url.path)
+        except Resolver404:
+            return error(status.HTTP_404_NOT_FOUND, "Not found"), url
+        if match.url_name in EXCLUDED_ROUTES:
+            return (
+                error(status.HTTP_400_BAD_REQUEST, "This endpoint can't be batched"),
+                url,
+            )
+        return match, url
+
+    def dispatch_item(self, request, match, url):
+        """
+        Run a sub-request through its view as the batch's user. The
+        sub-request carries the batch's headers. API views get the user the
+        batch was already authenticated as, through their authenticators, so
+        the bearer token isn't verified again per item; their permission
+        checks still run.
+        """
+        query = url.query
+        sub_request = HttpRequest()
+        sub_request.method = "GET"
+        sub_request.path = sub_request.path_info = url.path
+        sub_request.META = {
+            key: value
+            for key, value in request.META.items()
+            if key not in ("CONTENT_LENGTH", "CONTENT_TYPE")
+        }
+        sub_request.META.update(
+            REQUEST_METHOD="GET", PATH_INFO=url.path, QUERY_STRING=query
+        )
+        sub_request.GET = QueryDict(query)
+        sub_request.resolver_match = match
+
+        view_class = getattr(match.func, "view_class", None)
+        if view_class is not None and issubclass(view_class, APIView):
+            view = view_class(**match.func.view_initkwargs)
+            view.setup(sub_request, *match.args, **match.kwargs)
+            view.get_authenticators = lambda: [BatchUserAuthentication(request)]
+            response = view.dispatch(sub_request, *match.args, **match.kwargs)
+        else:
+            response = match.func(sub_request, *match.args, **match.kwargs)
+
+        if isinstance(response, Response):
+            body = response.data
+        elif response.get("Content-Type", "").startswith("application/json"):
+            body = json.loads(response.content)
+        else:
+            body = response.content.decode(response.charset, "replace")
+        headers = {
+            name: response[name]
+            for name in RESPONSE_HEADERS
+            if response.has_header(name)
+        }
+        return entry(response.status_code, body, headers)
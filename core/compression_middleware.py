@@ -0,0 +1,180 @@
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+
+DEFAULT_LEVELS = {"zstd": 3, "br": 4, "gzip": 6}
+
+
+class GzipEncoder:
+    def __init__(self, level):
+        # wbits=31 writes a gzip header and trailer around the deflate stream.
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliEncoder:
+    def __init__(self, level):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+class ZstdEncoder:
+    def __init__(self, level):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+def available_encoders():
+    """Encoders usable in this environment, in order of preference."""
+    encoders = {}
+    if zstandard is not None:
+        encoders["zstd"] = ZstdEncoder
+    if brotli is not None:
+        encoders["br"] = BrotliEncoder
+    encoders["gzip"] = GzipEncoder
+    return encoders
+
+
+def parse_accept_encoding(header):
+    """Map each coding in an Accept-Encoding header to its quality value."""
+    accepted = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+def negotiate_encoding(header, encoders):
+    """
+    Pick the encoding the client ranks highest among ``encoders``, breaking
+    ties in the server's order of preference. Returns None when the client
+    accepts none of them.
+    """
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for name in encoders:
+        quality = accepted.get(name, wildcard)
+        if quality > best_quality:
+            best, best_quality = name, quality
+    return best
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compress responses with the best encoding the client accepts: zstd or
+    brotli when their packages are installed, gzip otherwise.
+
+    Bodies smaller than ``COMPRESSION_MIN_SIZE`` are sent as is, and
+    ``COMPRESSION_LEVELS`` sets the level of each encoding. Streaming
+    responses are compressed chunk by chunk and flushed after every chunk
+    so clients keep receiving data as it is produced. Event streams are
+    never compressed since they must reach the client unbuffered.
+    """
+
+    def process_response(self, request, response):
+        if response.has_header("Content-Encoding"):
+            return response
+        if response.get("Content-Type", "").startswith("text/event-stream"):
+            return response
+        if (
+            not response.streaming
+            and len(response.content) < settings.COMPRESSION_MIN_SIZE
+        ):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        encoders = available_encoders()
+        encoding = negotiate_encoding(
+            request.META.get("HTTP_ACCEPT_ENCODING", ""), encoders
+        )
+        if encoding is None:
+            return response
+        level = settings.COMPRESSION_LEVELS.get(encoding, DEFAULT_LEVELS[encoding])
+        encoder_class = encoders[encoding]
+
+        if response.streaming:
+            if response.is_async:
+                original_iterator = response.streaming_content
+
+                async def compress_async():
+                    encoder = encoder_class(level)
+                    async for chunk in original_iterator:
+                        yield encoder.compress(chunk) + encoder.flush()
+                    yield encoder.finish()
+
+                response.streaming_content = compress_async()
+            else:
+                original_iterator = response.streaming_content
+
+                def compress_sync():
+                    encoder = encoder_class(level)
+                    for chunk in original_iterator:
+                        yield encoder.compress(chunk) + encoder.flush()
+                    yield encoder.finish()
+
+                response.streaming_content = compress_sync()
+            del response.headers["Content-Length"]
+        else:
+            encoder = encoder_class(level)
+            compressed = encoder.compress(response.content) + encoder.finish()
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        # A strong ETag would no longer match the encoded bytes, see
+        # RFC 9110 Section 8.8.1.
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
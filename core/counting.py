@@ -0,0 +1,143 @@
+import json
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.db import connections
+
+COUNT_MODES = ("auto", "exact", "estimated", "none")
+
+
+class InvalidCountMode(ValueError):
+    pass
+
+
+class InvalidPage(ValueError):
+    pass
+
+
+def get_count_mode(request) -> str:
+    """
+    Read the ``count`` query parameter of a list request.
+
+    Raises:
+        InvalidCountMode: If the value is not one of ``COUNT_MODES``
+    """
+    mode = request.query_params.get("count", "auto").lower()
+    if mode not in COUNT_MODES:
+        raise InvalidCountMode(
+            f"Invalid count mode. Use one of: {', '.join(COUNT_MODES)}"
+        )
+    return mode
+
+
+def get_page(request) -> Tuple[int, int]:
+    """
+    Read the ``limit`` and ``offset`` query parameters of a list request.
+    ``limit`` defaults to ``LIST_PAGE_SIZE`` and may not exceed
+    ``LIST_MAX_PAGE_SIZE``.
+
+    Raises:
+        InvalidPage: If either value is not a non-negative integer, or the
+            limit is zero or too large
+    """
+    try:
+        limit = int(request.query_params.get("limit", settings.LIST_PAGE_SIZE))
+        offset = int(request.query_params.get("offset", 0))
+    except ValueError:
+        raise InvalidPage("limit and offset must be integers")
+    if offset < 0 or not 0 < limit <= settings.LIST_MAX_PAGE_SIZE:
+        raise InvalidPage(
+            f"limit must be between 1 and {settings.LIST_MAX_PAGE_SIZE} "
+            "and offset must not be negative"
+        )
+    return limit, offset
+
+
+def _table_estimate(cursor, table: str) -> Optional[int]:
+    # A partitioned parent has no rows of its own, so add up its partitions.
+    cursor.execute(
+        "SELECT SUM(c.reltuples) FROM pg_class c "
+        "WHERE c.oid = to_regclass(%s) "
+        "OR c.oid IN (SELECT inhrelid FROM pg_inherits "
+        "WHERE inhparent = to_regclass(%s))",
+        [table, table],
+    )
+    estimate = cursor.fetchone()[0]
+    # reltuples is -1 (or 0) until the table has been vacuumed or analyzed.
+    if estimate is None or estimate <= 0:
+        return None
+    return int(estimate)
+
+
+def _plan_estimate(cursor, queryset) -> Optional[int]:
+    sql, params = queryset.query.sql_with_params()
+    cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+    plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def estimate_count(queryset) -> Optional[int]:
+    """
+    Return the planner's row estimate for ``queryset``, or None when no
+    estimate is available (e.g. on databases other than PostgreSQL).
+
+    Unfiltered querysets read ``pg_class.reltuples``; filtered ones ask
+    ``EXPLAIN`` for the estimated number of rows.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            return _table_estimate(cursor, queryset.model._meta.db_table)
+        return _plan_estimate(cursor, queryset)
+
+
+def count_queryset(queryset, mode: str = "auto") -> Tuple[Optional[int], str]:
+    """
+    Count ``queryset`` according to ``mode`` and return ``(count, count_type)``.
+
+    ``auto`` counts exactly while the planner expects fewer rows than
+    ``COUNT_ESTIMATE_THRESHOLD`` and returns the estimate above it.
+    A queryset that has already been evaluated is counted exactly in every
+    mode since that costs nothing. ``none`` skips counting altogether.
+    """
+    if mode == "none":
+        return None, "none"
+    if queryset._result_cache is not None:
+        return len(queryset._result_cache), "exact"
+    if mode in ("auto", "estimated"):
+        estimate = estimate_count(queryset)
+        if estimate is not None and (
+            mode == "estimated" or estimate >= settings.COUNT_ESTIMATE_THRESHOLD
+        ):
+            return estimate, "estimated"
+    return queryset.count(), "exact"
+
+
+def count_fields(queryset, mode: str = "auto") -> dict:
+    """Build the ``count``/``count_type`` entries of a list response."""
+    count, count_type = count_queryset(queryset, mode)
+    if count is None:
+        return {"count_type": count_type}
+    return {"count": count, "count_type": count_type}
+
+
+def paginate(queryset, limit: int, offset: int, mode: str = "auto"):
+    """
+    Count ``queryset`` according to ``mode`` and load one page of it.
+
+    The count runs on the unevaluated queryset, so ``none`` and
+    ``estimated`` neither count nor load more than ``limit + 1`` rows; the
+    extra row only tells whether another page follows.
+
+    Returns:
+        tuple: The page's rows and the ``count``/``count_type``/``has_more``
+            entries of the list response
+    """
+    fields = count_fields(queryset, mode)
+    rows = list(queryset[offset : offset + limit + 1])
+    fields["has_more"] = len(rows) > limit
+    return rows[:limit], fields
@@ -0,0 +1,149 @@
+"""
+WSGI/ASGI entry points that run ``/api/`` requests through a shorter
+middleware chain.
+
+API calls are stateless and authenticated by API key and bearer token, so
+they don't need sessions, CSRF protection, messages or frame options. Those
+stay in ``MIDDLEWARE`` for the admin and the OIDC login flow; requests under
+``API_PATH_PREFIXES`` are handled with ``API_MIDDLEWARE`` instead. Each list
+is compiled into its own handler once, at startup, so routing a request
+costs one prefix check.
+"""
+
+import logging
+
+import django
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.exception import convert_exception_to_response
+from django.core.handlers.wsgi import WSGIHandler
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger("django.request")
+
+
+class ApiMiddlewareMixin:
+    """Build the handler's middleware chain from ``API_MIDDLEWARE``."""
+
+    def load_middleware(self, is_async=False):
+        """
+        BaseHandler.load_middleware, reading ``API_MIDDLEWARE`` instead of
+        ``MIDDLEWARE``. Keep in step with Django's version when upgrading.
+        """
+        self._view_middleware = []
+        self._template_response_middleware = []
+        self._exception_middleware = []
+
+        get_response = self._get_response_async if is_async else self._get_response
+        handler = convert_exception_to_response(get_response)
+        handler_is_async = is_async
+        for middleware_path in reversed(settings.API_MIDDLEWARE):
+            middleware = import_string(middleware_path)
+            middleware_can_sync = getattr(middleware, "sync_capable", True)
+            middleware_can_async = getattr(middleware, "async_capable", False)
+            if not middleware_can_sync and not middleware_can_async:
+                raise RuntimeError(
+                    "Middleware %s must have at least one of "
+                    "sync_capable/async_capable set to True." % middleware_path
+                )
+            elif not handler_is_async and middleware_can_sync:
+                middleware_is_async = False
+            else:
+                middleware_is_async = middleware_can_async
+            try:
+                adapted_handler = self.adapt_method_mode(
+                    middleware_is_async,
+                    handler,
+                    handler_is_async,
+                    debug=settings.DEBUG,
+                    name="middleware %s" % middleware_path,
+                )
+                mw_instance = middleware(adapted_handler)
+            except MiddlewareNotUsed as exc:
+                if settings.DEBUG:
+                    if str(exc):
+                        logger.debug("MiddlewareNotUsed(%r): %s", middleware_path, exc)
+                    else:
+                        logger.debug("MiddlewareNotUsed: %r", middleware_path)
+                continue
+            else:
+                handler = adapted_handler
+
+            if mw_instance is None:
+                raise ImproperlyConfigured(
+                    "Middleware factory %s returned None." % middleware_path
+                )
+
+            if hasattr(mw_instance, "process_view"):
+                self._view_middleware.insert(
+                    0, self.adapt_method_mode(is_async, mw_instance.process_view)
+                )
+            if hasattr(mw_instance, "process_template_response"):
+                self._template_response_middleware.append(
+                    self.adapt_method_mode(
+                        is_async, mw_instance.process_template_response
+                    )
+                )
+            if hasattr(mw_instance, "process_exception"):
+                # Django's exception handling is always synchronous.
+                self._exception_middleware.append(
+                    self.adapt_method_mode(False, mw_instance.process_exception)
+                )
+
+            handler = convert_exception_to_response(mw_instance)
+            handler_is_async = middleware_is_async
+
+        handler = self.adapt_method_mode(is_async, handler, handler_is_async)
+        # Set last: Django treats it as the "loaded" flag.
+        self._middleware_chain = handler
+
+
+class ApiWSGIHandler(ApiMiddlewareMixin, WSGIHandler):
+    pass
+
+
+class ApiASGIHandler(ApiMiddlewareMixin, ASGIHandler):
+    pass
+
+
+def is_api_path(path: str) -> bool:
+    return path.startswith(tuple(settings.API_PATH_PREFIXES))
+
+
+class RoutingWSGIHandler:
+    def __init__(self):
+        self.default = WSGIHandler()
+        self.api = ApiWSGIHandler()
+
+    def __call__(self, environ, start_response):
+        # PATH_INFO is relative to the script prefix, like URL patterns.
+        if is_api_path(environ.get("PATH_INFO", "")):
+            return self.api(environ, start_response)
+        return self.default(environ, start_response)
+
+
+class RoutingASGIHandler:
+    def __init__(self):
+        self.default = ASGIHandler()
+        self.api = ApiASGIHandler()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            path = scope["path"]
+            root_path = scope.get("root_path", "")
+            if root_path and path.startswith(root_path):
+                path = path[len(root_path) :]
+            if is_api_path(path):
+                return await self.api(scope, receive, send)
+        return await self.default(scope, receive, send)
+
+
+def get_wsgi_application() -> RoutingWSGIHandler:
+    django.setup(set_prefix=False)
+    return RoutingWSGIHandler()
+
+
+def get_asgi_application() -> RoutingASGIHandler:
+    django.setup(set_prefix=False)
+    return RoutingASGIHandler()
@@ -0,0 +1,141 @@
+import logging
+import time
+from contextlib import nullcontext
+from io import BytesIO
+from unittest import mock
+from wsgiref.util import setup_testing_defaults
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+
+from core.authentication.drf import OIDCAuthentication
+from core.handlers import ApiWSGIHandler
+from orders.models import Order
+
+
+def make_environ(path: str, host: str) -> dict:
+    environ = {
+        "HTTP_HOST": host,
+        "PATH_INFO": path,
+        "REQUEST_METHOD": "GET",
+        "HTTP_X_API_KEY": settings.API_KEY or "",
+        "wsgi.input": BytesIO(),
+    }
+    setup_testing_defaults(environ)
+    return environ
+
+
+def time_handler(handler, path: str, host: str, requests: int) -> float:
+    """Return the mean seconds per request of ``handler`` serving ``path``."""
+
+    def start_response(status, headers):
+        pass
+
+    started = time.perf_counter()
+    for _ in range(requests):
+        response = handler(make_environ(path, host), start_response)
+        b"".join(response)
+        response.close()
+    return (time.perf_counter() - started) / requests
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the per-request cost of the full middleware chain against "
+        "the API chain (API_MIDDLEWARE) for one path."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path",
+            help="Path to request. Defaults to /api/orders/1/, which API views "
+            "answer with 401 before touching the database without a bearer "
+            "token, isolating the middleware. With --authenticated it defaults "
+            "to the detail of the first order.",
+        )
+        parser.add_argument(
+            "--authenticated",
+            action="store_true",
+            help="Treat every request as signed in, skipping the OIDC token "
+            "check, to time a full API request including its queries.",
+        )
+        parser.add_argument(
+            "--host",
+            default=next(
+                (host for host in settings.ALLOWED_HOSTS if host.strip("*.")),
+                "localhost",
+            ),
+            help="Host header to send; must be in ALLOWED_HOSTS.",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=2000,
+            help="Number of timed requests per chain.",
+        )
+        parser.add_argument(
+            "--warmup", type=int, default=200, help="Untimed requests per chain."
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if options["authenticated"]:
+            if path is None:
+                order = Order.objects.order_by("pk").first()
+                if order is None:
+                    raise CommandError("There are no orders to request.")
+                path = f"/api/orders/{order.pk}/"
+            user = get_user_model()(username="benchmark")
+            authenticated = mock.patch.object(
+                OIDCAuthentication, "authenticate", lambda self, request: (user, None)
+            )
+        else:
+            path = path or "/api/orders/1/"
+            authenticated = nullcontext()
+
+        handlers = {"full": WSGIHandler(), "api": ApiWSGIHandler()}
+        # Every 4xx response is logged as a warning; keep that out of the
+        # numbers.
+        logging.disable(logging.WARNING)
+        try:
+            with authenticated:
+                for handler in handlers.values():
+                    time_handler(handler, path, options["host"], options["warmup"])
+
+                # Alternate the chains so drift (CPU frequency, GC) hits both.
+                totals = dict.fromkeys(handlers, 0.0)
+                rounds = 10
+                for _ in range(rounds):
+                    for name, handler in handlers.items():
+                        totals[name] += time_handler(
+                            handler,
+                            path,
+                            options["host"],
+                            max(1, options["requests"] // rounds),
+                        )
+        finally:
+            logging.disable(logging.NOTSET)
+
+        self.stdout.write(f"GET {path}")
+        for name, handler in handlers.items():
+            seconds = totals[name] / rounds
+            self.stdout.write(
+                f"{name:>4}: {len(self.middleware(name))} middleware, "
+                f"{seconds * 1e6:8.1f} us/request, {1 / seconds:8.0f} requests/s"
+            )
+        full, api = totals["full"] / rounds, totals["api"] / rounds
+        # Time saved is relative to the full chain's time per request; the
+        # throughput gain is relative to its requests per second, so the two
+        # percentages differ.
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"API chain saves {(full - api) * 1e6:.1f} us/request: "
+                f"{(full - api) / full:.1%} less time per request, "
+                f"{full / api - 1:.1%} more requests per second"
+            )
+        )
+
+    def middleware(self, name):
+        return settings.API_MIDDLEWARE if name == "api" else settings.MIDDLEWARE
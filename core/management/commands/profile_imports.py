@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+
+from core.startup import profile_startup
+
+
+class Command(BaseCommand):
+    help = (
+        "Profile a cold start of the WSGI/ASGI application with "
+        "python -X importtime and list the slowest imports."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--target", choices=["wsgi", "asgi"], default="wsgi")
+        parser.add_argument(
+            "--urls",
+            action="store_true",
+            help="Also load the URLconf, as the first request does.",
+        )
+        parser.add_argument(
+            "--top", type=int, default=25, help="Number of imports to list."
+        )
+
+    def handle(self, *args, **options):
+        profile = profile_startup(
+            options["target"], load_urls=options["urls"], importtime=True
+        )
+
+        self.stdout.write(f"{'cumulative':>12} {'self':>10}  module")
+        for cumulative, own, module in sorted(profile.imports, reverse=True)[
+            : options["top"]
+        ]:
+            self.stdout.write(
+                f"{cumulative / 1000:>10.1f}ms {own / 1000:>8.1f}ms  {module}"
+            )
+
+        self.stdout.write(
+            f"\ncore.{options['target']}.application ready in "
+            f"{profile.seconds * 1000:.0f}ms"
+        )
+        if profile.heavy_modules:
+            self.stdout.write(
+                self.style.WARNING(
+                    "Heavy dependencies imported at startup: "
+                    + ", ".join(profile.heavy_modules)
+                )
+            )
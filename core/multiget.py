@@ -0,0 +1,27 @@
+from typing import List, Optional
+
+MAX_IDS = 100
+
+
+class InvalidIds(ValueError):
+    pass
+
+
+def get_ids(request) -> Optional[List[int]]:
+    """
+    Read the ``ids`` query parameter of a list request: a comma-separated
+    list of at most ``MAX_IDS`` primary keys. Returns None when absent.
+
+    Raises:
+        InvalidIds: If the value is not a list of integers or is too long
+    """
+    value = request.query_params.get("ids")
+    if value is None:
+        return None
+    try:
+        ids = sorted({int(part) for part in value.split(",") if part.strip()})
+    except ValueError:
+        raise InvalidIds("ids must be a comma-separated list of integers")
+    if len(ids) > MAX_IDS:
+        raise InvalidIds(f"At most {MAX_IDS} ids can be requested at once")
+    return ids
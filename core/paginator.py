@@ -0,0 +1,21 @@
+from django.core.paginator import Paginator
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+from core.counting import count_queryset
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that reports the planner's row estimate instead of running
+    ``COUNT(*)`` once a result set grows past ``COUNT_ESTIMATE_THRESHOLD``
+    rows (see ``core.counting``). Page numbers near the end may then point
+    past the last row, which Django's paginator handles as an empty page.
+    """
+
+    @cached_property
+    def count(self):
+        if not isinstance(self.object_list, QuerySet):
+            return super().count
+        count, _ = count_queryset(self.object_list, "auto")
+        return count
@@ -0,0 +1,117 @@
+import hashlib
+import json
+import time
+import uuid
+from typing import Callable, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+GENERATION_PREFIX = "qc:generation"
+
+
+def generation_key(table: str) -> str:
+    return f"{GENERATION_PREFIX}:{table}"
+
+
+def table_generations(tables: Iterable[str]) -> dict:
+    """Current generation of each table; 0 for tables never written."""
+    keys = {generation_key(table): table for table in tables}
+    stored = cache.get_many(list(keys))
+    return {table: stored.get(key, 0) for key, table in keys.items()}
+
+
+def table_generation(table: str) -> int:
+    return cache.get(generation_key(table), 0)
+
+
+def bump_generation(table: str) -> None:
+    """
+    Invalidate every cached result that depends on ``table``. Keys embed
+    the generation of the tables they read, so bumping it makes all of
+    them unreachable without scanning for them; they expire on their own.
+    """
+    key = generation_key(table)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Start from a time-based value rather than 1 so a generation
+        # evicted from the cache can't come back to a number that older
+        # entries were stored under.
+        if not cache.add(key, time.time_ns(), timeout=None):
+            cache.incr(key)
+
+
+def invalidate_table(table: str) -> None:
+    """
+    Bump ``table``'s generation now, so the writing transaction stops
+    reading its own stale entries, and again on commit, so entries other
+    workers cached from pre-commit data in the meantime are dropped too.
+    """
+    bump_generation(table)
+    transaction.on_commit(lambda: bump_generation(table))
+
+
+def cache_key(namespace: str, params: dict, tables: Iterable[str]) -> str:
+    generations = table_generations(sorted(tables))
+    digest = hashlib.sha256(
+        json.dumps(params, sort_keys=True, default=str).encode()
+    ).hexdigest()
+    versions = ".".join(f"{table}{generations[table]}" for table in sorted(tables))
+    return f"qc:{namespace}:{versions}:{digest}"
+
+
+def cached_query(
+    namespace: str,
+    params: dict,
+    tables: Iterable[str],
+    compute: Callable,
+    rows: Optional[int] = None,
+):
+    """
+    Cache-aside lookup of ``compute()`` keyed by ``namespace``, the
+    normalized query ``params`` and the generations of ``tables``.
+
+    On a miss only one caller (across all workers sharing the cache)
+    recomputes the value; the others wait up to ``QUERY_CACHE_LOCK_TIMEOUT``
+    seconds for it to appear before falling back to computing it themselves.
+
+    ``rows`` is the most rows the result can hold. Results that may hold
+    more than ``QUERY_CACHE_MAX_ROWS`` are computed without the cache, so
+    large pages don't fill it.
+    """
+    if rows is not None and rows > settings.QUERY_CACHE_MAX_ROWS:
+        return compute()
+
+    key = cache_key(namespace, params, tables)
+    value = cache.get(key)
+    if value is not None:
+        return value
+
+    lock_key = f"{key}:lock"
+    lock_timeout = settings.QUERY_CACHE_LOCK_TIMEOUT
+    # A compute that outlives the lock timeout must not release the lock
+    # another caller has taken since, so the lock holds a per-caller token.
+    token = uuid.uuid4().hex
+    if not cache.add(lock_key, token, timeout=lock_timeout):
+        deadline = time.monotonic() + lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(settings.QUERY_CACHE_POLL_INTERVAL)
+            value = cache.get(key)
+            if value is not None:
+                return value
+        return compute()
+
+    try:
+        # The previous holder may have stored the value between our miss
+        # and taking the lock.
+        value = cache.get(key)
+        if value is not None:
+            return value
+        value = compute()
+        cache.set(key, value, timeout=settings.QUERY_CACHE_TIMEOUT)
+        return value
+    finally:
+        if cache.get(lock_key) == token:
+            cache.delete(lock_key)
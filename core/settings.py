@@ -24,13 +24,17 @@ INSTALLED_APPS = [
     "rest_framework",
     "mozilla_django_oidc",
     # Local apps
+    "core",
     "customers",
     "orders",
+    "sync",
 ]
 
 MIDDLEWARE = [
+    "core.request_id_middleware.RequestIdMiddleware",
     "core.api_key_middleware.ApiKeyMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "core.compression_middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -39,6 +43,17 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Middleware for stateless API requests under API_PATH_PREFIXES, which
+# core.wsgi/core.asgi dispatch separately from the admin and OIDC pages.
+API_PATH_PREFIXES = ["/api/"]
+API_MIDDLEWARE = [
+    "core.request_id_middleware.RequestIdMiddleware",
+    "core.api_key_middleware.ApiKeyMiddleware",
+    "django.middleware.security.SecurityMiddleware",
+    "core.compression_middleware.CompressionMiddleware",
+    "django.middleware.common.CommonMiddleware",
+]
+
 # Authentication backends
 AUTHENTICATION_BACKENDS = (
     "core.authentication.backend.CustomOIDCAuthenticationBackend",
@@ -78,12 +93,26 @@ DATABASES = {
     }
 }
 
+# Cache. Defaults to a per-process locmem cache; point CACHE_BACKEND and
+# CACHE_LOCATION at a shared backend (e.g.
+# django.core.cache.backends.redis.RedisCache, redis://redis:6379/0) in
+# production so query-cache invalidation and single-flight locks span workers.
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
+    }
+}
+
 # OIDC Settings
 OIDC_RP_CLIENT_ID = os.getenv("OIDC_RP_CLIENT_ID")
 OIDC_RP_CLIENT_SECRET = os.getenv("OIDC_RP_CLIENT_SECRET")
 OIDC_OP_AUTHORIZATION_ENDPOINT = os.getenv("OIDC_OP_AUTHORIZATION_ENDPOINT")
 OIDC_OP_TOKEN_ENDPOINT = os.getenv("OIDC_OP_TOKEN_ENDPOINT")
 OIDC_OP_USER_ENDPOINT = os.getenv("OIDC_OP_USER_ENDPOINT")
+OIDC_OP_JWKS_ENDPOINT = os.getenv("OIDC_OP_JWKS_ENDPOINT")
 OIDC_RP_SIGN_ALGO = "RS256"
 OIDC_STORE_ACCESS_TOKEN = True
 OIDC_STORE_ID_TOKEN = True
@@ -111,7 +140,7 @@ AUTH_PASSWORD_VALIDATORS = [
 # Rest Framework settings
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "mozilla_django_oidc.contrib.drf.OIDCAuthentication",
+        "core.authentication.drf.OIDCAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
@@ -119,6 +148,60 @@ REST_FRAMEWORK = {
     ],
 }
 
+# List responses switch from an exact COUNT(*) to the planner's estimate
+# once the planner expects at least this many rows.
+COUNT_ESTIMATE_THRESHOLD = int(os.getenv("COUNT_ESTIMATE_THRESHOLD", "10000"))
+
+# List endpoints return one page of at most LIST_MAX_PAGE_SIZE rows; the
+# limit query parameter defaults to LIST_PAGE_SIZE.
+LIST_PAGE_SIZE = int(os.getenv("LIST_PAGE_SIZE", "100"))
+LIST_MAX_PAGE_SIZE = int(os.getenv("LIST_MAX_PAGE_SIZE", "1000"))
+
+# Delta sync holds back rows written in the last few seconds so that
+# transactions still in flight cannot slip behind a client's sync token.
+SYNC_SAFETY_LAG_SECONDS = int(os.getenv("SYNC_SAFETY_LAG_SECONDS", "5"))
+
+# Order event stream (/api/orders/events/). Use orders.events.PostgresBroker
+# to fan events out across worker processes with LISTEN/NOTIFY.
+ORDER_EVENTS_BROKER = os.getenv("ORDER_EVENTS_BROKER", "orders.events.InMemoryBroker")
+ORDER_EVENTS_REPLAY_SIZE = int(os.getenv("ORDER_EVENTS_REPLAY_SIZE", "1000"))
+ORDER_EVENTS_QUEUE_SIZE = int(os.getenv("ORDER_EVENTS_QUEUE_SIZE", "100"))
+ORDER_EVENTS_KEEPALIVE_SECONDS = 15
+# Lifetime of the ?token= issued by /api/orders/events/token/ for browsers'
+# EventSource, which can't send the API key and bearer token headers.
+ORDER_EVENTS_TOKEN_MAX_AGE = int(os.getenv("ORDER_EVENTS_TOKEN_MAX_AGE", "300"))
+
+# Response compression: bodies below COMPRESSION_MIN_SIZE bytes are sent
+# uncompressed. zstd and brotli are used when `zstandard`/`brotli` are installed.
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_LEVELS = {
+    "zstd": int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3")),
+    "br": int(os.getenv("COMPRESSION_BROTLI_LEVEL", "4")),
+    "gzip": int(os.getenv("COMPRESSION_GZIP_LEVEL", "6")),
+}
+
+# Upper bound, in seconds, for core.wsgi/core.asgi to build `application`
+# in a fresh interpreter (enforced by core/tests/test_startup.py).
+STARTUP_BUDGET_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS", "2.0"))
+
+# Per-worker cache of customer autocomplete results
+CUSTOMER_AUTOCOMPLETE_CACHE_SIZE = int(
+    os.getenv("CUSTOMER_AUTOCOMPLETE_CACHE_SIZE", "1024")
+)
+CUSTOMER_AUTOCOMPLETE_CACHE_TTL = int(
+    os.getenv("CUSTOMER_AUTOCOMPLETE_CACHE_TTL", "60")
+)
+
+# Cached order search and list results (core.query_cache). Entries live
+# for QUERY_CACHE_TIMEOUT seconds unless an order or customer write
+# invalidates them first; concurrent misses wait up to
+# QUERY_CACHE_LOCK_TIMEOUT seconds for the worker recomputing the entry.
+# Pages of more than QUERY_CACHE_MAX_ROWS rows are never cached.
+QUERY_CACHE_TIMEOUT = int(os.getenv("QUERY_CACHE_TIMEOUT", "60"))
+QUERY_CACHE_LOCK_TIMEOUT = int(os.getenv("QUERY_CACHE_LOCK_TIMEOUT", "10"))
+QUERY_CACHE_MAX_ROWS = int(os.getenv("QUERY_CACHE_MAX_ROWS", "200"))
+QUERY_CACHE_POLL_INTERVAL = 0.05
+
 # JWT
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
@@ -147,6 +230,66 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 AFRICASTALKING_USERNAME = os.getenv("AFRICASTALKING_USERNAME")
 AFRICASTALKING_API_KEY = os.getenv("AFRICASTALKING_API_KEY")
 
+# SMS delivery report callback. Register
+# https://<host>/api/orders/sms/delivery-reports/?token=<SMS_CALLBACK_TOKEN>
+# as the delivery report URL; reports are buffered and applied in batches.
+SMS_CALLBACK_TOKEN = os.getenv("SMS_CALLBACK_TOKEN")
+SMS_REPORT_BATCH_SIZE = int(os.getenv("SMS_REPORT_BATCH_SIZE", "500"))
+SMS_REPORT_FLUSH_SECONDS = float(os.getenv("SMS_REPORT_FLUSH_SECONDS", "2"))
+SMS_REPORT_MAX_BUFFERED = int(os.getenv("SMS_REPORT_MAX_BUFFERED", "10000"))
+
+# Paths served without an X-API-Key header. Callers of these endpoints
+# authenticate some other way.
+API_KEY_EXEMPT_PATHS = [
+    "/api/orders/sms/delivery-reports/",
+    "/api/orders/events/",
+]
+
+# Logging: JSON lines written by a background thread (see
+# core.structured_logging). At most LOG_QUEUE_SIZE records wait to be
+# written; more are dropped rather than blocking requests. Only
+# LOG_INFO_SAMPLE_RATE (0-1) of INFO and DEBUG records are kept.
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_INFO_SAMPLE_RATE = float(os.getenv("LOG_INFO_SAMPLE_RATE", "1"))
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "filters": {
+        "sample_info": {
+            "()": "core.structured_logging.SamplingFilter",
+            "rate": LOG_INFO_SAMPLE_RATE,
+        },
+        "request_id": {"()": "core.structured_logging.RequestIdFilter"},
+    },
+    "formatters": {
+        "json": {"()": "core.structured_logging.JsonFormatter"},
+    },
+    "handlers": {
+        "queue": {
+            "()": "core.structured_logging.BoundedQueueHandler",
+            "maxsize": LOG_QUEUE_SIZE,
+            "target": "logging.StreamHandler",
+            "formatter": "json",
+            # In this order, so sampled-out records aren't stamped.
+            "filters": ["sample_info", "request_id"],
+        },
+    },
+    "root": {"handlers": ["queue"], "level": LOG_LEVEL},
+}
+
+# Orders table partitioning (see `manage.py partition_orders`)
+ORDERS_PARTITION_MONTHS_AHEAD = int(os.getenv("ORDERS_PARTITION_MONTHS_AHEAD", "3"))
+ORDERS_PARTITION_ARCHIVE_DIR = os.getenv(
+    "ORDERS_PARTITION_ARCHIVE_DIR", os.path.join(BASE_DIR, "archive", "partitions")
+)
+
+# Columnar archives of old orders (see `manage.py archive_orders`)
+ORDERS_ARCHIVE_AFTER_MONTHS = int(os.getenv("ORDERS_ARCHIVE_AFTER_MONTHS", "12"))
+ORDERS_ARCHIVE_DIR = os.getenv(
+    "ORDERS_ARCHIVE_DIR", os.path.join(BASE_DIR, "archive", "orders")
+)
+
 # OpenID Connect Configuration
 OIDC_RP_CLIENT_ID = os.getenv("OIDC_RP_CLIENT_ID")
 OIDC_RP_CLIENT_SECRET = os.getenv("OIDC_RP_CLIENT_SECRET")
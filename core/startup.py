@@ -0,0 +1,84 @@
+import json
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+from django.conf import settings
+
+# Dependencies that must stay out of a worker's startup path and load on
+# first use instead. (requests isn't listed: DRF's compat module imports it
+# whenever it is installed.)
+HEAVY_MODULES = (
+    "africastalking",
+    "mozilla_django_oidc.auth",
+    "josepy",
+    "jose",
+    "cryptography",
+)
+
+STARTUP_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+{module}.application
+if {load_urls}:
+    from django.urls import get_resolver
+    get_resolver().url_patterns
+print(json.dumps({{
+    "seconds": time.perf_counter() - started,
+    "heavy": [name for name in {heavy!r} if name in sys.modules],
+}}))
+"""
+
+
+@dataclass
+class StartupProfile:
+    seconds: float
+    heavy_modules: List[str]
+    # (cumulative microseconds, self microseconds, module) per import
+    imports: List[Tuple[int, int, str]] = field(default_factory=list)
+
+
+def parse_importtime(output: str) -> List[Tuple[int, int, str]]:
+    """Parse ``python -X importtime`` output into (cumulative, self, module)."""
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:") :].split("|")
+        imports.append((int(cumulative_us), int(self_us), module.strip()))
+    return imports
+
+
+def profile_startup(
+    target: str = "wsgi", load_urls: bool = False, importtime: bool = False
+) -> StartupProfile:
+    """
+    Start ``core.wsgi`` or ``core.asgi`` in a fresh interpreter and report
+    how long it took until ``application`` was ready, and which heavy
+    dependencies were imported on the way. ``load_urls`` also loads the
+    URLconf, i.e. the extra work the first request pays for.
+    """
+    script = STARTUP_SCRIPT.format(
+        module=f"core.{target}", load_urls=load_urls, heavy=HEAVY_MODULES
+    )
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE}
+    result = subprocess.run(
+        command + ["-c", script],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=settings.BASE_DIR,
+        check=True,
+    )
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    return StartupProfile(
+        seconds=report["seconds"],
+        heavy_modules=report["heavy"],
+        imports=parse_importtime(result.stderr) if importtime else [],
+    )
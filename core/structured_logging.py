@@ -0,0 +1,165 @@
+"""
+Non-blocking JSON logging.
+
+Request threads only filter a record and put it on a bounded in-memory
+queue; a background ``QueueListener`` formats it as one JSON object per line
+and writes it to the real handler. When the sink can't keep up and the
+queue is full, new records are dropped instead of blocking the request, and
+the number dropped is logged once there's room again.
+
+Messages use %-style arguments, so a record that is sampled out or dropped
+is never formatted at all.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from django.utils.module_loading import import_string
+
+from core.request_id_middleware import get_request_id
+
+# LogRecord attributes that aren't user-supplied ``extra`` fields.
+RESERVED_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Render a record as a single-line JSON object."""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in RESERVED_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp records with the id of the request being handled, if any."""
+
+    def filter(self, record):
+        if not hasattr(record, "request_id"):
+            record.request_id = get_request_id()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Let through only ``rate`` (0-1) of the records at or below ``max_level``.
+    Records above it, i.e. warnings and errors by default, always pass.
+    """
+
+    def __init__(self, rate=1.0, max_level=logging.INFO):
+        super().__init__()
+        self.rate = float(rate)
+        if isinstance(max_level, str):
+            max_level = logging.getLevelName(max_level.upper())
+        self.max_level = max_level
+
+    def filter(self, record):
+        if record.levelno > self.max_level or self.rate >= 1:
+            return True
+        return random.random() < self.rate
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    Hand records to a background thread that writes them to ``target``,
+    an instance of the handler class at that dotted path built with
+    ``target_kwargs``. At most ``maxsize`` records wait; further records
+    are dropped and counted.
+
+    The listener thread starts on first use in each process, so workers
+    forked after logging was configured get their own.
+    """
+
+    def __init__(self, maxsize=10000, target="logging.StreamHandler", **target_kwargs):
+        super().__init__(queue.Queue(maxsize))
+        self.target = import_string(target)(**target_kwargs)
+        self.dropped = 0
+        self._listener = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+    def setFormatter(self, fmt):
+        # Formatting happens in the listener, with the target's formatter.
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record):
+        """
+        Keep the message unformatted, unlike QueueHandler, and only render
+        the traceback, which would otherwise keep the request's frames
+        alive until the record is written.
+        """
+        record = logging.makeLogRecord(record.__dict__)
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        self._ensure_listener()
+        try:
+            if self.dropped:
+                self._report_dropped()
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _report_dropped(self):
+        dropped, self.dropped = self.dropped, 0
+        try:
+            self.queue.put_nowait(
+                logging.makeLogRecord(
+                    {
+                        "name": __name__,
+                        "levelno": logging.WARNING,
+                        "levelname": "WARNING",
+                        "msg": "Dropped %d log records, the log queue was full",
+                        "args": (dropped,),
+                    }
+                )
+            )
+        except queue.Full:
+            self.dropped += dropped
+            raise
+
+    def _ensure_listener(self):
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self._listener = QueueListener(self.queue, self.target)
+            self._listener.start()
+            self._pid = os.getpid()
+            atexit.register(self.flush_and_stop)
+
+    def flush_and_stop(self):
+        """Write out every queued record and stop the listener thread."""
+        if self._listener is not None and self._pid == os.getpid():
+            self._listener.stop()
+            self._listener = None
+            self._pid = None
+
+    def close(self):
+        self.flush_and_stop()
+        self.target.close()
+        super().close()
@@ -0,0 +1,113 @@
+import pytest
+from decimal import Decimal
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.permissions import BasePermission
+from rest_framework.test import APIClient
+from customers.models import Customer
+from customers.views import customer_etag
+from orders.models import Order
+from orders.views import OrderSearchView
+
+
+@pytest.mark.django_db
+class TestBatchView:
+    @pytest.fixture
+    def auth_client(self, settings, django_user_model):
+        cache.clear()
+        settings.API_KEY = "test-key"
+        settings.OIDC_OP_JWKS_ENDPOINT = "https://oidc.example.com/jwks"
+        client = APIClient()
+        user = django_user_model.objects.create_user(username="tester")
+        client.force_authenticate(user=user)
+        client.credentials(HTTP_X_API_KEY="test-key")
+        return client
+
+    @pytest.fixture
+    def orders(self):
+        customer = Customer.objects.create(
+            name="Test Customer", code="TEST123", phone_number="+254722000000"
+        )
+        return [
+            Order.objects.create(
+                customer=customer, item=f"Item {i}", amount=Decimal("10.00")
+            )
+            for i in range(3)
+        ]
+
+    def batch(self, client, *paths):
+        return client.post(
+            reverse("batch"),
+            {"requests": [{"method": "GET", "path": path} for path in paths]},
+            format="json",
+        )
+
+    def test_detail_lookups_share_one_query_per_type(
+        self, auth_client, orders, django_assert_num_queries
+    ):
+        customer = orders[0].customer
+        paths = [f"/api/orders/{order.pk}/" for order in orders]
+        paths += [f"/api/customers/{customer.pk}/", "/api/orders/999999/"]
+        with django_assert_num_queries(2):
+            response = self.batch(auth_client, *paths)
+        assert response.status_code == status.HTTP_200_OK
+        items = response.data["responses"]
+        assert [item["status"] for item in items] == [200, 200, 200, 200, 404]
+        assert items[0]["body"]["data"]["item"] == "Item 0"
+        assert items[3]["body"]["data"]["code"] == "TEST123"
+
+    def test_other_gets_are_dispatched_to_their_views(self, auth_client, orders):
+        ids = ",".join(str(order.pk) for order in orders[:2])
+        response = self.batch(
+            auth_client, f"/api/orders/?ids={ids}", "/api/orders/search/?q=item"
+        )
+        items = response.data["responses"]
+        assert items[0]["status"] == 200
+        assert items[0]["body"]["count"] == 2
+        assert items[1]["body"]["count"] == 3
+
+    def test_customer_detail_keeps_its_etag(self, auth_client, orders):
+        customer = orders[0].customer
+        single = auth_client.get(reverse("customer-detail", args=[customer.pk]))
+        response = self.batch(auth_client, f"/api/customers/{customer.pk}/")
+        item = response.data["responses"][0]
+        assert item["headers"] == {"ETag": customer_etag(customer)}
+        assert single["ETag"] == customer_etag(customer)
+
+    def test_dispatched_items_go_through_the_views_permissions(
+        self, auth_client, orders, monkeypatch
+    ):
+        seen = []
+
+        class RecordUserAndDeny(BasePermission):
+            def has_permission(self, request, view):
+                seen.append(request.user.username)
+                return False
+
+        monkeypatch.setattr(OrderSearchView, "permission_classes", [RecordUserAndDeny])
+        response = self.batch(auth_client, "/api/orders/search/?q=item", "/api/orders/")
+        statuses = [item["status"] for item in response.data["responses"]]
+        assert statuses == [403, 200]
+        assert seen == ["tester"]
+
+    def test_invalid_items_fail_individually(self, auth_client, orders):
+        response = auth_client.post(
+            reverse("batch"),
+            {
+                "requests": [
+                    {"method": "DELETE", "path": f"/api/orders/{orders[0].pk}/"},
+                    {"path": "/api/nowhere/"},
+                    {"path": "/api/orders/events/"},
+                    {"path": f"/api/orders/{orders[0].pk}/"},
+                ]
+            },
+            format="json",
+        )
+        statuses = [item["status"] for item in response.data["responses"]]
+        assert statuses == [405, 404, 400, 200]
+        assert Order.objects.count() == 3
+
+    def test_rejects_empty_batch(self, auth_client):
+        response = auth_client.post(reverse("batch"), {"requests": []}, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,43 @@
+import gzip
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
+from core.compression_middleware import CompressionMiddleware, negotiate_encoding
+
+
+class TestCompressionMiddleware:
+    def compress(self, response, accept_encoding="gzip"):
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_negotiation_honours_quality_values(self):
+        encoders = ["zstd", "br", "gzip"]
+        assert negotiate_encoding("gzip, br", encoders) == "br"
+        assert negotiate_encoding("br;q=0.5, gzip", encoders) == "gzip"
+        assert negotiate_encoding("*, zstd;q=0", encoders) == "br"
+        assert negotiate_encoding("identity", encoders) is None
+
+    def test_large_body_is_compressed(self, settings):
+        settings.COMPRESSION_MIN_SIZE = 100
+        body = b'{"item": "Product XYZ"}' * 100
+        response = self.compress(HttpResponse(body))
+        assert response["Content-Encoding"] == "gzip"
+        assert response["Vary"] == "Accept-Encoding"
+        assert gzip.decompress(response.content) == body
+
+    def test_small_body_is_not_compressed(self, settings):
+        settings.COMPRESSION_MIN_SIZE = 1024
+        response = self.compress(HttpResponse(b"{}"))
+        assert not response.has_header("Content-Encoding")
+
+    def test_streaming_body_is_compressed_incrementally(self):
+        chunks = [b"a" * 500, b"b" * 500]
+        response = self.compress(StreamingHttpResponse(iter(chunks)))
+        parts = list(response.streaming_content)
+        assert len(parts) == 3
+        assert gzip.decompress(b"".join(parts)) == b"".join(chunks)
+
+    def test_event_streams_are_left_alone(self):
+        response = StreamingHttpResponse(
+            iter([b"data: 1\n\n"]), content_type="text/event-stream"
+        )
+        assert not self.compress(response).has_header("Content-Encoding")
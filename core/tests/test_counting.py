@@ -0,0 +1,41 @@
+import pytest
+from django.db import connection
+from customers.models import Customer
+from core.counting import count_fields, count_queryset, estimate_count
+
+
+@pytest.mark.django_db
+class TestCounting:
+    @pytest.fixture
+    def customers(self):
+        for i in range(3):
+            Customer.objects.create(
+                name=f"Customer {i}", code=f"CUST{i}", phone_number="+254722000000"
+            )
+        return Customer.objects.all()
+
+    def test_exact_count(self, customers):
+        assert count_queryset(customers, "exact") == (3, "exact")
+
+    def test_none_mode_skips_counting(self, customers, django_assert_num_queries):
+        with django_assert_num_queries(0):
+            assert count_fields(customers, "none") == {"count_type": "none"}
+
+    def test_evaluated_queryset_is_counted_without_a_query(
+        self, customers, django_assert_num_queries, monkeypatch
+    ):
+        # Even where an estimate would be available, the rows are at hand.
+        monkeypatch.setattr("core.counting.estimate_count", lambda queryset: 1000)
+        list(customers)
+        with django_assert_num_queries(0):
+            for mode in ("auto", "exact", "estimated"):
+                assert count_queryset(customers, mode) == (3, "exact")
+
+    def test_auto_mode_uses_estimate_above_threshold(self, customers, settings):
+        if connection.vendor != "postgresql":
+            pytest.skip("Planner estimates require PostgreSQL")
+        settings.COUNT_ESTIMATE_THRESHOLD = 0
+        filtered = customers.filter(code__startswith="CUST")
+        count, count_type = count_queryset(filtered, "auto")
+        assert count_type == "estimated"
+        assert count == estimate_count(filtered)
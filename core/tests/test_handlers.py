@@ -0,0 +1,110 @@
+import asyncio
+import pytest
+from io import BytesIO
+from wsgiref.util import setup_testing_defaults
+from asgiref.sync import async_to_sync
+from django.conf import settings as django_settings
+from django.core.signals import request_finished, request_started
+from django.db import close_old_connections
+from django.urls import set_script_prefix
+from core.handlers import ApiWSGIHandler, RoutingASGIHandler, RoutingWSGIHandler
+
+
+@pytest.fixture(autouse=True)
+def api_settings(settings):
+    settings.API_KEY = "test-key"
+    settings.ALLOWED_HOSTS = ["testserver"]
+    settings.OIDC_OP_JWKS_ENDPOINT = "https://oidc.example.com/jwks"
+
+
+@pytest.fixture(autouse=True)
+def keep_connections():
+    # Like the test client, don't let requests close the test database.
+    request_started.disconnect(close_old_connections)
+    request_finished.disconnect(close_old_connections)
+    yield
+    request_started.connect(close_old_connections)
+    request_finished.connect(close_old_connections)
+    # The ASGI handler sets the script prefix from root_path.
+    set_script_prefix("/")
+
+
+def wsgi_get(application, path):
+    environ = {
+        "HTTP_HOST": "testserver",
+        "PATH_INFO": path,
+        "REQUEST_METHOD": "GET",
+        "HTTP_X_API_KEY": "test-key",
+        "wsgi.input": BytesIO(),
+    }
+    setup_testing_defaults(environ)
+    started = {}
+
+    def start_response(status, headers):
+        started["status"] = int(status.split()[0])
+        started["headers"] = dict(headers)
+
+    b"".join(application(environ, start_response))
+    return started["status"], started["headers"]
+
+
+class TestRoutingWSGIHandler:
+    def test_api_requests_skip_browser_middleware(self):
+        application = RoutingWSGIHandler()
+        assert django_settings.MIDDLEWARE != django_settings.API_MIDDLEWARE
+
+        status, headers = wsgi_get(application, "/api/orders/1/")
+        assert status == 401
+        assert "X-Request-ID" in headers
+        assert "X-Frame-Options" not in headers
+
+        status, headers = wsgi_get(application, "/admin/login/")
+        assert status == 200
+        assert headers["X-Frame-Options"] == "DENY"
+        assert "Cookie" in headers["Vary"]
+
+    def test_api_chain_is_built_without_touching_settings(self, monkeypatch):
+        assigned = []
+        settings_class = type(django_settings)
+        original = settings_class.__setattr__
+
+        def record(self, name, value):
+            assigned.append(name)
+            original(self, name, value)
+
+        monkeypatch.setattr(settings_class, "__setattr__", record)
+        ApiWSGIHandler()
+        assert assigned == []
+
+
+class TestRoutingASGIHandler:
+    def asgi_get(self, application, path, root_path=""):
+        messages = []
+        requests = [{"type": "http.request", "body": b"", "more_body": False}]
+
+        async def receive():
+            if requests:
+                return requests.pop()
+            # Stay connected until the handler stops listening.
+            await asyncio.Future()
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": root_path + path,
+            "root_path": root_path,
+            "query_string": b"",
+            "headers": [(b"host", b"testserver"), (b"x-api-key", b"test-key")],
+        }
+        async_to_sync(application)(scope, receive, send)
+        start = messages[0]
+        return start["status"], {k.decode(): v.decode() for k, v in start["headers"]}
+
+    def test_routes_on_path_below_root_path(self):
+        application = RoutingASGIHandler()
+        status, headers = self.asgi_get(application, "/api/orders/1/", "/shop")
+        assert status == 401
+        assert "X-Frame-Options" not in headers
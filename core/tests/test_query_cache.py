@@ -0,0 +1,70 @@
+import threading
+
+import pytest
+from django.core.cache import cache
+from core.query_cache import bump_generation, cache_key, cached_query
+
+
+class TestQueryCache:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        cache.clear()
+
+    def test_key_ignores_parameter_order(self):
+        assert cache_key("ns", {"a": 1, "b": 2}, ["orders"]) == cache_key(
+            "ns", {"b": 2, "a": 1}, ["orders"]
+        )
+
+    def test_hit_skips_compute(self):
+        calls = []
+        compute = lambda: calls.append(1) or {"rows": len(calls)}
+        assert cached_query("ns", {"q": "x"}, ["orders"], compute) == {"rows": 1}
+        assert cached_query("ns", {"q": "x"}, ["orders"], compute) == {"rows": 1}
+        assert len(calls) == 1
+
+    def test_bumping_a_table_invalidates_dependent_entries(self):
+        calls = []
+        compute = lambda: calls.append(1) or len(calls)
+        cached_query("ns", {}, ["orders", "customers"], compute)
+        bump_generation("customers")
+        assert cached_query("ns", {}, ["orders", "customers"], compute) == 2
+        bump_generation("orders")
+        assert cached_query("ns", {}, ["orders", "customers"], compute) == 3
+
+    def test_concurrent_misses_compute_once(self, settings):
+        settings.QUERY_CACHE_POLL_INTERVAL = 0.01
+        calls = []
+        release = threading.Event()
+
+        def compute():
+            calls.append(1)
+            release.wait(5)
+            return "value"
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    cached_query("ns", {"q": "hot"}, ["orders"], compute)
+                )
+            )
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join()
+        assert results == ["value"] * 5
+        assert len(calls) == 1
+
+    def test_expired_lock_taken_by_another_caller_is_kept(self):
+        lock_key = f"{cache_key('ns', {'q': 'slow'}, ['orders'])}:lock"
+
+        def compute():
+            # Our lock expires mid-compute and another caller takes it.
+            cache.set(lock_key, "other-caller")
+            return "value"
+
+        assert cached_query("ns", {"q": "slow"}, ["orders"], compute) == "value"
+        assert cache.get(lock_key) == "other-caller"
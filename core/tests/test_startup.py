@@ -0,0 +1,20 @@
+import pytest
+from core.startup import HEAVY_MODULES, profile_startup
+
+
+class TestStartup:
+    @pytest.mark.parametrize("target", ["wsgi", "asgi"])
+    def test_application_is_ready_within_budget(self, target, settings):
+        profile = profile_startup(target)
+        assert profile.heavy_modules == []
+        assert profile.seconds < settings.STARTUP_BUDGET_SECONDS
+
+    def test_urlconf_defers_heavy_sdks(self):
+        profile = profile_startup("wsgi", load_urls=True)
+        assert profile.heavy_modules == []
+
+    def test_importtime_profile_is_parsed(self):
+        profile = profile_startup("wsgi", importtime=True)
+        modules = {module for _, _, module in profile.imports}
+        assert "core.wsgi" in modules
+        assert not modules & set(HEAVY_MODULES)
@@ -0,0 +1,103 @@
+import json
+import logging
+import os
+import sys
+import pytest
+from django.test import Client
+from core.request_id_middleware import REQUEST_ID_HEADER
+from core.structured_logging import (
+    BoundedQueueHandler,
+    JsonFormatter,
+    RequestIdFilter,
+    SamplingFilter,
+)
+
+
+def make_record(msg="Created order %s", args=(1,), level=logging.INFO, **extra):
+    return logging.makeLogRecord(
+        {
+            "name": "orders.views",
+            "levelno": level,
+            "levelname": logging.getLevelName(level),
+            "msg": msg,
+            "args": args,
+            **extra,
+        }
+    )
+
+
+class TestJsonFormatter:
+    def test_formats_message_extras_and_exception(self):
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = make_record(exc_info=sys.exc_info(), customer="C1")
+        RequestIdFilter().filter(record)
+        entry = json.loads(JsonFormatter().format(record))
+        assert entry["level"] == "INFO"
+        assert entry["logger"] == "orders.views"
+        assert entry["message"] == "Created order 1"
+        assert entry["customer"] == "C1"
+        assert entry["request_id"] is None
+        assert "ValueError: boom" in entry["exception"]
+
+
+class TestSamplingFilter:
+    def test_samples_info_but_keeps_warnings(self):
+        sampler = SamplingFilter(rate=0)
+        assert not sampler.filter(make_record())
+        assert sampler.filter(make_record(level=logging.WARNING))
+        assert SamplingFilter(rate=1).filter(make_record())
+
+
+class TestBoundedQueueHandler:
+    @pytest.fixture
+    def handler(self):
+        handler = BoundedQueueHandler(
+            maxsize=2, target="logging.handlers.BufferingHandler", capacity=100
+        )
+        handler.setFormatter(JsonFormatter())
+        yield handler
+        handler.close()
+
+    def test_drops_records_when_full_and_reports_them(self, handler):
+        # Pretend the listener runs but is stuck, so nothing is dequeued.
+        handler._pid = os.getpid()
+        for i in range(4):
+            handler.handle(make_record(args=(i,)))
+        assert handler.dropped == 2
+        assert [r.getMessage() for r in (handler.queue.get(), handler.queue.get())] == [
+            "Created order 0",
+            "Created order 1",
+        ]
+
+        handler.handle(make_record(args=(4,)))
+        assert handler.dropped == 0
+        assert handler.queue.get().getMessage() == (
+            "Dropped 2 log records, the log queue was full"
+        )
+        assert handler.queue.get().getMessage() == "Created order 4"
+
+    def test_listener_formats_records_in_background(self, handler):
+        record = make_record(args=({"id": 1},))
+        handler.handle(record)
+        handler.flush_and_stop()
+        (written,) = handler.target.buffer
+        # The message is formatted by the listener, not by the caller.
+        assert written.msg == "Created order %s"
+        assert json.loads(handler.target.format(written))["message"] == (
+            "Created order {'id': 1}"
+        )
+
+
+class TestRequestIdMiddleware:
+    def test_generates_or_reuses_request_id(self):
+        client = Client()
+        response = client.get("/admin/login/")
+        assert len(response[REQUEST_ID_HEADER]) == 32
+
+        response = client.get("/admin/login/", HTTP_X_REQUEST_ID="abc-123")
+        assert response[REQUEST_ID_HEADER] == "abc-123"
+
+        response = client.get("/admin/login/", HTTP_X_REQUEST_ID="bad id\n")
+        assert response[REQUEST_ID_HEADER] != "bad id\n"
@@ -1,13 +1,20 @@
 from django.contrib import admin
 from django.urls import path, include
+from django.urls.resolvers import RoutePattern, URLResolver
 from django.conf import settings
 from django.conf.urls.static import static
 
+from core.batch import BatchView
+
 urlpatterns = [
     path("admin/", admin.site.urls),
-    # OpenID Connect URLs
-    path("oidc/", include("mozilla_django_oidc.urls")),
+    # OpenID Connect URLs. Unlike include(), a resolver given the module
+    # path imports the OIDC views (and their crypto dependencies) only when
+    # a request under oidc/ is first resolved.
+    URLResolver(RoutePattern("oidc/"), "mozilla_django_oidc.urls"),
     # API endpoints
     path("api/customers/", include("customers.urls")),
     path("api/orders/", include("orders.urls")),
+    path("api/sync/", include("sync.urls")),
+    path("api/batch/", BatchView.as_view(), name="batch"),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -2,6 +2,8 @@
 WSGI config for core project.
 
 It exposes the WSGI callable as a module-level variable named ``application``.
+Requests under /api/ skip the session, CSRF and other browser-only
+middleware (see core.handlers).
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/wsgi/
@@ -9,7 +11,7 @@ https://docs.djangoproject.com/en/5.1/howto/deployment/wsgi/
 
 import os
 
-from django.core.wsgi import get_wsgi_application
+from core.handlers import get_wsgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
 
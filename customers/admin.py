@@ -1,3 +1,48 @@
 from django.contrib import admin
+from django.db.models import Q
 
-# Register your models here.
+from core.paginator import EstimatedCountPaginator
+
+from .models import Customer
+
+
+@admin.register(Customer)
+class CustomerAdmin(admin.ModelAdmin):
+    list_display = [
+        "code",
+        "name",
+        "phone_number",
+        "order_count",
+        "total_spent",
+        "last_order_at",
+        "created_at",
+    ]
+    # Declared for the admin's search box and the order form's autocomplete
+    # widget; the lookups themselves are in get_search_results.
+    search_fields = ["code", "name"]
+    readonly_fields = [
+        "order_count",
+        "total_spent",
+        "last_order_at",
+        "created_at",
+        "updated_at",
+        "version",
+    ]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Match code and name prefixes only, the lookups the prefix indexes
+        from migration 0003 can serve, instead of the default
+        ``icontains`` that scans the whole table.
+        """
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        return (
+            queryset.filter(
+                Q(code__startswith=term.upper()) | Q(name__istartswith=term)
+            ),
+            False,
+        )
@@ -0,0 +1,243 @@
+"""
+Per-customer order counters: ``order_count``, ``total_spent`` and
+``last_order_at`` over the customer's orders that aren't cancelled.
+
+Order signals keep them current with single-row ``F()`` updates, so
+concurrent orders for one customer can't lose increments. Writes that skip
+model signals (``QuerySet.update()``, ``bulk_create()``, COPY) leave them
+behind until ``reconcile`` runs. Orders pruned into archives (see
+``manage.py archive_orders``) stay counted.
+"""
+
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional
+
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    Max,
+    OuterRef,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, Greatest
+
+from orders.archive import from_micros, get_archive_store
+from orders.models import Order
+
+from .models import Customer
+
+CANCELLED = "CANCELLED"
+CENTS = Decimal("0.01")
+
+
+def counts_towards_totals(status: str) -> bool:
+    return status != CANCELLED
+
+
+def add_order(customer_id: int, amount: Decimal, order_time) -> None:
+    Customer.objects.filter(pk=customer_id).update(
+        order_count=F("order_count") + 1,
+        total_spent=F("total_spent") + amount,
+        last_order_at=Greatest(Coalesce("last_order_at", order_time), order_time),
+    )
+
+
+def remove_order(customer_id: int, amount: Decimal, order_time) -> None:
+    Customer.objects.filter(pk=customer_id).update(
+        order_count=F("order_count") - 1,
+        total_spent=F("total_spent") - amount,
+    )
+    # Only the removal of the latest order moves last_order_at back.
+    Customer.objects.filter(pk=customer_id, last_order_at__lte=order_time).update(
+        last_order_at=_latest_order_time(customer_id)
+    )
+
+
+def adjust_spent(customer_id: int, delta: Decimal) -> None:
+    Customer.objects.filter(pk=customer_id).update(total_spent=F("total_spent") + delta)
+
+
+def _latest_order_time(customer_id: int):
+    return (
+        Order.objects.filter(customer_id=customer_id)
+        .exclude(status=CANCELLED)
+        .aggregate(latest=Max("order_time"))["latest"]
+    )
+
+
+def archived_totals() -> Dict[int, dict]:
+    """
+    Counters contributed by archived orders that were pruned from the
+    orders table, keyed by customer id. Archived orders that are still
+    live are skipped since they are counted already.
+    """
+    totals = {}
+    for archive in get_archive_store().archives():
+        if not len(archive):
+            continue
+        # Every archived id lies in [min_id, max_id].
+        live_ids = set(
+            Order.objects.filter(
+                pk__gte=archive.header["min_id"], pk__lte=archive.header["max_id"]
+            ).values_list("pk", flat=True)
+        )
+        statuses = archive.dictionary("status")
+        cancelled = statuses.index(CANCELLED) if CANCELLED in statuses else None
+        columns = zip(
+            archive.column("id"),
+            archive.column("customer_id"),
+            archive.column("amount"),
+            archive.column("order_time"),
+            archive.column("status"),
+        )
+        for order_id, customer_id, cents, order_time, status in columns:
+            if status == cancelled or order_id in live_ids:
+                continue
+            entry = totals.setdefault(customer_id, [0, 0, order_time])
+            entry[0] += 1
+            entry[1] += cents
+            entry[2] = max(entry[2], order_time)
+    return {
+        customer_id: {
+            "order_count": count,
+            "total_spent": Decimal(cents).scaleb(-2),
+            "last_order_at": from_micros(latest),
+        }
+        for customer_id, (count, cents, latest) in totals.items()
+    }
+
+
+def actual_totals(
+    customer_ids: Iterable[int], archived: Optional[Dict[int, dict]] = None
+) -> Dict[int, dict]:
+    """
+    Compute the counters of ``customer_ids`` from their orders, plus their
+    ``archived`` counters (from ``archived_totals``) if given.
+    """
+    totals = {
+        customer_id: {
+            "order_count": 0,
+            "total_spent": Decimal("0.00"),
+            "last_order_at": None,
+        }
+        for customer_id in customer_ids
+    }
+    rows = (
+        Order.objects.filter(customer_id__in=list(totals))
+        .exclude(status=CANCELLED)
+        .order_by()
+        .values("customer_id")
+        .annotate(
+            order_count=Count("id"),
+            total_spent=Sum("amount"),
+            last_order_at=Max("order_time"),
+        )
+    )
+    for row in rows:
+        # SQLite sums decimals as floats.
+        row["total_spent"] = row["total_spent"].quantize(CENTS)
+        totals[row.pop("customer_id")] = row
+    for customer_id, extra in (archived or {}).items():
+        if customer_id not in totals:
+            continue
+        total = totals[customer_id]
+        total["order_count"] += extra["order_count"]
+        total["total_spent"] += extra["total_spent"]
+        total["last_order_at"] = max(
+            filter(None, [total["last_order_at"], extra["last_order_at"]])
+        )
+    return totals
+
+
+def recount(customer_ids: List[int], archived: Optional[Dict[int, dict]] = None):
+    """
+    Overwrite the counters of ``customer_ids`` with totals computed from
+    their orders, plus their ``archived`` counters if given.
+
+    The totals are computed by the UPDATE itself rather than read first and
+    written back, so an order created or cancelled while reconciling, whose
+    signal applies an ``F()`` increment, isn't overwritten by a stale total.
+    """
+    orders = (
+        Order.objects.filter(customer_id=OuterRef("pk"))
+        .exclude(status=CANCELLED)
+        .order_by()
+        .values("customer_id")
+    )
+    live_count = Coalesce(Subquery(orders.annotate(n=Count("id")).values("n")), 0)
+    live_spent = Coalesce(
+        Subquery(orders.annotate(total=Sum("amount")).values("total")),
+        Value(Decimal("0.00")),
+        output_field=Customer._meta.get_field("total_spent"),
+    )
+    live_latest = Subquery(orders.annotate(latest=Max("order_time")).values("latest"))
+    extra = {
+        customer_id: archived[customer_id]
+        for customer_id in customer_ids
+        if customer_id in (archived or {})
+    }
+
+    def plus_archived(live, field):
+        return live + Case(
+            *(
+                When(pk=customer_id, then=Value(totals[field]))
+                for customer_id, totals in extra.items()
+            ),
+            default=Value(0 if field == "order_count" else Decimal("0.00")),
+            output_field=Customer._meta.get_field(field),
+        )
+
+    Customer.objects.filter(pk__in=customer_ids).update(
+        order_count=plus_archived(live_count, "order_count"),
+        total_spent=plus_archived(live_spent, "total_spent"),
+        last_order_at=Case(
+            *(
+                When(
+                    pk=customer_id,
+                    then=Greatest(
+                        Coalesce(live_latest, Value(totals["last_order_at"])),
+                        Value(totals["last_order_at"]),
+                    ),
+                )
+                for customer_id, totals in extra.items()
+            ),
+            default=live_latest,
+        ),
+    )
+
+
+def reconcile(batch_size: int = 1000, fix: bool = False) -> List[int]:
+    """
+    Compare every customer's counters with its orders, in batches of
+    ``batch_size`` customers, and return the ids of customers that drifted.
+    With ``fix``, their counters are recomputed with ``recount``.
+    """
+    drifted = []
+    last_id = 0
+    fields = ["order_count", "total_spent", "last_order_at"]
+    archived = archived_totals()
+    while True:
+        customers = list(
+            Customer.objects.filter(pk__gt=last_id)
+            .order_by("pk")
+            .only("pk", *fields)[:batch_size]
+        )
+        if not customers:
+            return drifted
+        last_id = customers[-1].pk
+        totals = actual_totals((customer.pk for customer in customers), archived)
+        stale = [
+            customer.pk
+            for customer in customers
+            if any(
+                getattr(customer, field) != totals[customer.pk][field]
+                for field in fields
+            )
+        ]
+        drifted.extend(stale)
+        if fix and stale:
+            recount(stale, archived)
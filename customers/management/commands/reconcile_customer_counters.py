@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+
+from customers.counters import reconcile
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare each customer's order counters with its orders and report "
+        "(or, with --fix, repair) customers whose counters drifted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Overwrite drifted counters with the values from orders.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of customers checked per query.",
+        )
+
+    def handle(self, *args, **options):
+        drifted = reconcile(batch_size=options["batch_size"], fix=options["fix"])
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS("All customer counters match"))
+            return
+        shown = ", ".join(str(pk) for pk in drifted[:20])
+        if len(drifted) > 20:
+            shown += ", ..."
+        if options["fix"]:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Fixed counters of {len(drifted)} customers: {shown}"
+                )
+            )
+        else:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Counters of {len(drifted)} customers drifted: {shown}. "
+                    "Run with --fix to repair them."
+                )
+            )
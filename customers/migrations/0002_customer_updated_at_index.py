@@ -0,0 +1,19 @@
+# Generated by Django 5.1.4 on 2026-10-19 01:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("customers", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="customer",
+            index=models.Index(
+                fields=["updated_at", "id"], name="customers_updated_697413_idx"
+            ),
+        ),
+    ]
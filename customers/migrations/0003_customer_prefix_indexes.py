@@ -0,0 +1,42 @@
+from django.db import migrations
+
+INDEXES = [
+    (
+        "customers_code_pattern_idx",
+        'CREATE INDEX IF NOT EXISTS "customers_code_pattern_idx" '
+        'ON "customers" ("code" varchar_pattern_ops)',
+    ),
+    # Matches the UPPER(name::text) LIKE 'PREFIX%' that istartswith produces.
+    (
+        "customers_name_upper_pattern_idx",
+        'CREATE INDEX IF NOT EXISTS "customers_name_upper_pattern_idx" '
+        'ON "customers" (UPPER("name"::text) text_pattern_ops)',
+    ),
+]
+
+
+def create_prefix_indexes(apps, schema_editor):
+    # Pattern operator classes only exist on PostgreSQL. Other backends
+    # fall back to scanning, which is fine for development databases.
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for _, sql in INDEXES:
+        schema_editor.execute(sql)
+
+
+def drop_prefix_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, _ in INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{name}"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("customers", "0002_customer_updated_at_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_prefix_indexes, drop_prefix_indexes),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.1.4 on 2026-10-19 01:21
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, Max, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Customer = apps.get_model("customers", "Customer")
+    Order = apps.get_model("orders", "Order")
+    orders = (
+        Order.objects.filter(customer=OuterRef("pk"))
+        .exclude(status="CANCELLED")
+        .order_by()
+        .values("customer")
+    )
+    Customer.objects.update(
+        order_count=Coalesce(
+            Subquery(orders.annotate(n=Count("id")).values("n")), Value(0)
+        ),
+        total_spent=Coalesce(
+            Subquery(orders.annotate(total=Sum("amount")).values("total")),
+            Value(Decimal("0")),
+            output_field=models.DecimalField(max_digits=12, decimal_places=2),
+        ),
+        last_order_at=Subquery(orders.annotate(last=Max("order_time")).values("last")),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("customers", "0003_customer_prefix_indexes"),
+        ("orders", "0004_order_sms_delivery"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="customer",
+            name="last_order_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="customer",
+            name="order_count",
+            field=models.PositiveIntegerField(db_default=0, default=0),
+        ),
+        migrations.AddField(
+            model_name="customer",
+            name="total_spent",
+            field=models.DecimalField(
+                db_default=0, decimal_places=2, default=0, max_digits=12
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="customer",
+            index=models.Index(
+                fields=["total_spent", "id"], name="customers_total_s_1437e2_idx"
+            ),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-19 01:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("customers", "0004_customer_order_counters"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="customer",
+            name="version",
+            field=models.PositiveIntegerField(db_default=1, default=1),
+        ),
+    ]
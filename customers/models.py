@@ -1,7 +1,17 @@
 from django.db import models
+from django.db.models import F
 from django.core.validators import RegexValidator
 
 
+class StaleCustomer(Exception):
+    """The customer was changed by someone else since it was loaded."""
+
+
+# Maintained with F() updates by customers.counters; ordinary saves never
+# write them, so they can't overwrite increments with stale values.
+COUNTER_FIELDS = ("order_count", "total_spent", "last_order_at")
+
+
 class Customer(models.Model):
     name = models.CharField(max_length=100)
     code = models.CharField(
@@ -16,10 +26,84 @@ class Customer(models.Model):
     phone_number = models.CharField(max_length=15)  # For SMS notifications
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Totals over the customer's orders that aren't cancelled, maintained
+    # by orders.signals and checked by `manage.py reconcile_customer_counters`.
+    # The database defaults let bulk loads omit them.
+    order_count = models.PositiveIntegerField(default=0, db_default=0)
+    total_spent = models.DecimalField(
+        max_digits=12, decimal_places=2, default=0, db_default=0
+    )
+    last_order_at = models.DateTimeField(null=True, blank=True)
+    # Bumped by every save; the API only applies an update on top of the
+    # version it loaded (optimistic concurrency, see save_at_version()).
+    version = models.PositiveIntegerField(default=1, db_default=1)
 
     class Meta:
         db_table = "customers"
         ordering = ["-created_at"]
+        indexes = [
+            # Keyset order for delta sync (see the sync app).
+            models.Index(fields=["updated_at", "id"]),
+            # Sorting and range filters on spend, in either direction.
+            models.Index(fields=["total_spent", "id"]),
+        ]
+
+    def save(self, *args, **kwargs):
+        """
+        Save and bump ``version`` in the database, so every update gets a
+        new version whoever makes it.
+
+        Updates leave the order counters (COUNTER_FIELDS) alone unless they
+        are listed in ``update_fields``.
+        """
+        if self._state.adding:
+            return super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None:
+            update_fields = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in COUNTER_FIELDS
+            ]
+        kwargs["update_fields"] = {*update_fields, "version"}
+        loaded = self.version
+        self.version = F("version") + 1
+        try:
+            super().save(*args, **kwargs)
+        except BaseException:
+            self.version = loaded
+            raise
+        self.refresh_from_db(fields=["version"])
+
+    def save_at_version(self, expected: int, update_fields) -> None:
+        """
+        Save ``update_fields`` only if the row is still at version
+        ``expected``; otherwise raise StaleCustomer and write nothing. No
+        row lock is held between loading and saving.
+        """
+        self._expected_version = expected
+        try:
+            self.save(update_fields=update_fields)
+        finally:
+            del self._expected_version
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        expected = getattr(self, "_expected_version", None)
+        if expected is None:
+            return super()._do_update(
+                base_qs, using, pk_val, values, update_fields, forced_update
+            )
+        updated = super()._do_update(
+            base_qs.filter(version=expected),
+            using,
+            pk_val,
+            values,
+            update_fields,
+            forced_update,
+        )
+        if not updated and base_qs.filter(pk=pk_val).exists():
+            raise StaleCustomer(f"Customer {pk_val} changed since version {expected}")
+        return updated
 
     def __str__(self):
         return f"{self.code} - {self.name}"
@@ -5,8 +5,8 @@ from .models import Customer
 class CustomerSerializer(serializers.ModelSerializer):
     class Meta:
         model = Customer
-        fields = ["id", "name", "code", "phone_number", "created_at"]
-        read_only_fields = ["created_at"]
+        fields = ["id", "name", "code", "phone_number", "created_at", "version"]
+        read_only_fields = ["created_at", "version"]
 
     def validate_code(self, value):
         """
@@ -17,3 +17,20 @@ class CustomerSerializer(serializers.ModelSerializer):
                 "Code must contain only uppercase letters and numbers"
             )
         return value
+
+
+class OrderSummarySerializer(serializers.Serializer):
+    """The customer's order counters (see ``customers.counters``)."""
+
+    order_count = serializers.IntegerField(read_only=True)
+    total_amount = serializers.DecimalField(
+        source="total_spent", max_digits=12, decimal_places=2, read_only=True
+    )
+    last_order_time = serializers.DateTimeField(source="last_order_at", read_only=True)
+
+
+class CustomerSummarySerializer(CustomerSerializer):
+    order_summary = OrderSummarySerializer(source="*", read_only=True)
+
+    class Meta(CustomerSerializer.Meta):
+        fields = CustomerSerializer.Meta.fields + ["order_summary"]
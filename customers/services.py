@@ -0,0 +1,87 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+from core.query_cache import table_generation
+
+from .models import Customer
+
+
+class CustomerAutocomplete:
+    """
+    Prefix search over customer codes and names.
+
+    Each worker keeps an LRU cache of recent prefixes so hot prefixes are
+    answered from memory. Customer writes bump the customers table's
+    generation in the shared Django cache (see ``core.query_cache``), which
+    empties the local cache of every worker on its next lookup.
+    ``CUSTOMER_AUTOCOMPLETE_CACHE_TTL`` bounds how stale an entry can get if the shared cache is unavailable.
+    """
+
+    def __init__(self, max_entries=None, ttl=None):
+        self.max_entries = max_entries or settings.CUSTOMER_AUTOCOMPLETE_CACHE_SIZE
+        self.ttl = ttl if ttl is not None else settings.CUSTOMER_AUTOCOMPLETE_CACHE_TTL
+        self._entries = OrderedDict()
+        self._generation = None
+        self._lock = threading.Lock()
+
+    def search(self, prefix: str, limit: int) -> list:
+        prefix = prefix.strip()
+        if not prefix:
+            return []
+        key = (prefix.upper(), limit)
+        generation = table_generation(Customer._meta.db_table)
+        now = time.monotonic()
+
+        with self._lock:
+            if generation != self._generation:
+                self._entries.clear()
+                self._generation = generation
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        results = self.query(prefix, limit)
+
+        with self._lock:
+            if self._generation == generation:
+                self._entries[key] = (now + self.ttl, results)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return results
+
+    @staticmethod
+    def query(prefix: str, limit: int) -> list:
+        """
+        Code matches first, then name matches. Each branch is a separate
+        LIMITed query so it can walk its own prefix index.
+        """
+        fields = ("id", "code", "name")
+        results = list(
+            Customer.objects.filter(code__startswith=prefix.upper())
+            .order_by("code")
+            .values(*fields)[:limit]
+        )
+        if len(results) < limit:
+            seen = {row["id"] for row in results}
+            names = (
+                Customer.objects.filter(name__istartswith=prefix)
+                .order_by("name")
+                .values(*fields)[: limit + len(seen)]
+            )
+            results.extend(row for row in names if row["id"] not in seen)
+        return results[:limit]
+
+
+_autocomplete = None
+
+
+def get_autocomplete() -> CustomerAutocomplete:
+    global _autocomplete
+    if _autocomplete is None:
+        _autocomplete = CustomerAutocomplete()
+    return _autocomplete
@@ -0,0 +1,16 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.query_cache import invalidate_table
+
+from .models import Customer
+
+
+@receiver(post_save, sender=Customer)
+@receiver(post_delete, sender=Customer)
+def invalidate_cached_queries(sender, instance, **kwargs):
+    """
+    Drop cached query results and autocomplete entries that read the
+    customers table once a customer is written.
+    """
+    invalidate_table(Customer._meta.db_table)
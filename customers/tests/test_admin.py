@@ -0,0 +1,38 @@
+import pytest
+from django.contrib.admin import ModelAdmin
+from django.db.models import F
+from django.test import Client
+from django.urls import reverse
+from customers.admin import CustomerAdmin
+from customers.models import Customer
+
+
+@pytest.mark.django_db
+class TestCustomerAdmin:
+    @pytest.fixture
+    def client(self, settings, admin_user):
+        settings.API_KEY = "test-key"
+        settings.OIDC_OP_JWKS_ENDPOINT = "https://oidc.example.com/jwks"
+        client = Client(HTTP_X_API_KEY="test-key")
+        client.force_login(admin_user)
+        return client
+
+    def test_change_form_saves_over_a_concurrent_update(self, client, monkeypatch):
+        customer = Customer.objects.create(
+            name="Test Customer", code="TEST123", phone_number="+254722000000"
+        )
+
+        def save_model(self, request, obj, form, change):
+            # An API update lands between loading the form and saving it.
+            Customer.objects.filter(pk=obj.pk).update(version=F("version") + 1)
+            ModelAdmin.save_model(self, request, obj, form, change)
+
+        monkeypatch.setattr(CustomerAdmin, "save_model", save_model)
+        response = client.post(
+            reverse("admin:customers_customer_change", args=[customer.pk]),
+            {"name": "Renamed", "code": "TEST123", "phone_number": "+254722000000"},
+        )
+        assert response.status_code == 302
+        customer.refresh_from_db()
+        assert customer.name == "Renamed"
+        assert customer.version == 3
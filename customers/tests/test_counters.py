@@ -0,0 +1,110 @@
+import pytest
+from datetime import datetime, timezone
+from decimal import Decimal
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from customers import counters
+from customers.counters import reconcile
+from customers.models import Customer
+from orders.models import Order
+
+
+@pytest.mark.django_db
+class TestCustomerCounters:
+    @pytest.fixture
+    def customer(self):
+        return Customer.objects.create(
+            name="Test Customer", code="TEST123", phone_number="+254722000000"
+        )
+
+    def counters(self, customer):
+        customer.refresh_from_db()
+        return customer.order_count, customer.total_spent, customer.last_order_at
+
+    def test_orders_update_counters(self, customer):
+        first = Order.objects.create(customer=customer, item="A", amount=Decimal("10"))
+        second = Order.objects.create(
+            customer=customer, item="B", amount=Decimal("2.50")
+        )
+        assert self.counters(customer) == (2, Decimal("12.50"), second.order_time)
+
+        second.status = "CANCELLED"
+        second.save()
+        assert self.counters(customer) == (1, Decimal("10.00"), first.order_time)
+
+        first.amount = Decimal("15")
+        first.save()
+        assert self.counters(customer)[:2] == (1, Decimal("15.00"))
+
+        second.status = "PENDING"
+        second.save()
+        first.delete()
+        assert self.counters(customer) == (1, Decimal("2.50"), second.order_time)
+
+    def test_deleting_customer_skips_counter_updates(self, customer):
+        for i in range(5):
+            Order.objects.create(customer=customer, item="A", amount=Decimal("1"))
+        with CaptureQueriesContext(connection) as queries:
+            customer.delete()
+        assert not Order.objects.exists()
+        assert not [q for q in queries if q["sql"].startswith('UPDATE "customers"')]
+
+    def test_reconcile_fixes_drift(self, customer):
+        order = Order.objects.create(customer=customer, item="A", amount=Decimal("10"))
+        # Queryset updates bypass the signals that maintain the counters.
+        Order.objects.filter(pk=order.pk).update(
+            amount=Decimal("7"), order_time=datetime(2025, 1, 1, tzinfo=timezone.utc)
+        )
+        assert reconcile() == [customer.pk]
+        assert self.counters(customer)[1] == Decimal("10.00")
+
+        assert reconcile(fix=True) == [customer.pk]
+        assert self.counters(customer) == (
+            1,
+            Decimal("7.00"),
+            datetime(2025, 1, 1, tzinfo=timezone.utc),
+        )
+        assert reconcile() == []
+
+    def test_saving_customer_keeps_counters(self, customer):
+        loaded = Customer.objects.get(pk=customer.pk)
+        Order.objects.create(customer=customer, item="A", amount=Decimal("10"))
+        Order.objects.create(customer=customer, item="B", amount=Decimal("5"))
+
+        loaded.name = "Renamed"
+        loaded.save()
+        assert self.counters(customer)[:2] == (2, Decimal("15.00"))
+        assert customer.name == "Renamed"
+        assert reconcile() == []
+
+    def test_moving_order_to_another_customer(self, customer):
+        other = Customer.objects.create(
+            name="Other", code="OTHER1", phone_number="+254722000001"
+        )
+        Order.objects.create(customer=customer, item="A", amount=Decimal("4"))
+        order = Order.objects.create(customer=customer, item="B", amount=Decimal("6"))
+
+        order = Order.objects.get(pk=order.pk)
+        order.customer = other
+        order.amount = Decimal("7")
+        order.save()
+        assert self.counters(customer)[:2] == (1, Decimal("4.00"))
+        assert self.counters(other) == (1, Decimal("7.00"), order.order_time)
+        assert reconcile() == []
+
+    def test_reconcile_keeps_orders_created_while_fixing(self, customer, monkeypatch):
+        order = Order.objects.create(customer=customer, item="A", amount=Decimal("10"))
+        Order.objects.filter(pk=order.pk).update(amount=Decimal("7"))
+        actual_totals = counters.actual_totals
+
+        def read_then_order(*args, **kwargs):
+            totals = actual_totals(*args, **kwargs)
+            # Another request creates an order after the totals were read.
+            Order.objects.create(customer=customer, item="B", amount=Decimal("5"))
+            return totals
+
+        monkeypatch.setattr(counters, "actual_totals", read_then_order)
+        assert reconcile(fix=True) == [customer.pk]
+        assert self.counters(customer)[:2] == (2, Decimal("12.00"))
+        monkeypatch.undo()
+        assert reconcile() == []
@@ -1,6 +1,7 @@
 import pytest
 from django.core.exceptions import ValidationError
-from customers.models import Customer
+from django.db import transaction
+from customers.models import Customer, StaleCustomer
 
 
 @pytest.mark.django_db
@@ -26,3 +27,31 @@ class TestCustomerModel:
                 phone_number="+254722000000",
             )
             customer.full_clean()
+
+    def test_concurrent_save_raises_stale_customer(self):
+        customer = Customer.objects.create(
+            name="Test Customer", code="TEST123", phone_number="+254722000000"
+        )
+        first = Customer.objects.get(pk=customer.pk)
+        second = Customer.objects.get(pk=customer.pk)
+        first.name = "First"
+        first.save_at_version(1, update_fields=["name"])
+        second.name = "Second"
+        with pytest.raises(StaleCustomer), transaction.atomic():
+            second.save_at_version(1, update_fields=["name"])
+        assert second.version == 1
+        assert Customer.objects.get(pk=customer.pk).version == 2
+
+    def test_plain_save_bumps_version_without_checking(self):
+        customer = Customer.objects.create(
+            name="Test Customer", code="TEST123", phone_number="+254722000000"
+        )
+        stale = Customer.objects.get(pk=customer.pk)
+        customer.name = "First"
+        customer.save()
+        # Admin edits, scripts and commands save whatever they loaded, but
+        # still give the row a version the API hasn't handed out yet.
+        stale.phone_number = "+254722000001"
+        stale.save()
+        assert stale.version == 3
+        assert Customer.objects.get(pk=customer.pk).version == 3
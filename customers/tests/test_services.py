@@ -0,0 +1,30 @@
+import pytest
+from django.core.cache import cache
+from customers.models import Customer
+from customers.services import CustomerAutocomplete
+
+
+@pytest.mark.django_db
+class TestCustomerAutocomplete:
+    @pytest.fixture(autouse=True)
+    def customers(self):
+        cache.clear()
+        Customer.objects.create(name="Alpha Stores", code="AB100", phone_number="1")
+        Customer.objects.create(name="Abby Kamau", code="ZZ900", phone_number="2")
+        Customer.objects.create(name="Beta Ltd", code="BA200", phone_number="3")
+
+    def test_matches_code_then_name_prefix(self):
+        results = CustomerAutocomplete().query("ab", 10)
+        assert [r["code"] for r in results] == ["AB100", "ZZ900"]
+
+    def test_hot_prefix_is_served_from_memory(self, django_assert_num_queries):
+        autocomplete = CustomerAutocomplete()
+        autocomplete.search("ab", 10)
+        with django_assert_num_queries(0):
+            assert len(autocomplete.search("AB", 10)) == 2
+
+    def test_customer_write_invalidates_cache(self):
+        autocomplete = CustomerAutocomplete()
+        assert len(autocomplete.search("ab", 10)) == 2
+        Customer.objects.create(name="Abacus", code="CC300", phone_number="4")
+        assert len(autocomplete.search("ab", 10)) == 3
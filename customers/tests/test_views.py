@@ -2,7 +2,11 @@ import pytest
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from customers.models import Customer
+from orders.models import Order
+from decimal import Decimal
 
 
 @pytest.mark.django_db
@@ -11,6 +15,15 @@ class TestCustomerViews:
     def api_client(self):
         return APIClient()
 
+    @pytest.fixture
+    def auth_client(self, api_client, settings, django_user_model):
+        settings.API_KEY = "test-key"
+        settings.OIDC_OP_JWKS_ENDPOINT = "https://oidc.example.com/jwks"
+        user = django_user_model.objects.create_user(username="tester")
+        api_client.force_authenticate(user=user)
+        api_client.credentials(HTTP_X_API_KEY="test-key")
+        return api_client
+
     @pytest.fixture
     def customer_data(self):
         return {
@@ -32,3 +45,143 @@ class TestCustomerViews:
         response = api_client.get(url)
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data) == 1
+
+    def test_customer_orders_are_cursor_paginated(self, auth_client, customer_data):
+        customer = Customer.objects.create(**customer_data)
+        other = Customer.objects.create(
+            name="Other", code="OTHER1", phone_number="+254722000001"
+        )
+        for i in range(3):
+            Order.objects.create(
+                customer=customer, item=f"Item {i}", amount=Decimal("10.00")
+            )
+        Order.objects.create(customer=other, item="Other", amount=Decimal("5.00"))
+
+        url = reverse("customer-order-list", args=[customer.pk])
+        response = auth_client.get(url, {"page_size": 2})
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data["results"]) == 2
+        assert response.data["next"] is not None
+
+        response = auth_client.get(response.data["next"])
+        assert [o["item"] for o in response.data["results"]] == ["Item 0"]
+        assert response.data["next"] is None
+
+    def test_customer_list_with_order_summary(self, auth_client, customer_data):
+        customer = Customer.objects.create(**customer_data)
+        Order.objects.create(customer=customer, item="A", amount=Decimal("10.00"))
+        Order.objects.create(customer=customer, item="B", amount=Decimal("2.50"))
+
+        url = reverse("customer-list-create")
+        response = auth_client.get(url, {"summary": "true"})
+        assert response.status_code == status.HTTP_200_OK
+        summary = response.data["results"][0]["order_summary"]
+        assert summary["order_count"] == 2
+        assert summary["total_amount"] == "12.50"
+
+        response = auth_client.get(url)
+        assert "order_summary" not in response.data["results"][0]
+
+    def test_autocomplete_caps_results(self, auth_client):
+        for i in range(30):
+            Customer.objects.create(
+                name=f"Customer {i}", code=f"AC{i:03d}", phone_number="+254722000000"
+            )
+        url = reverse("customer-autocomplete")
+        response = auth_client.get(url, {"q": "ac", "limit": 100})
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data["results"]) == 20
+        assert response.data["results"][0]["code"] == "AC000"
+
+    def test_customer_list_multi_get(self, auth_client):
+        customers = [
+            Customer.objects.create(
+                name=f"Customer {i}", code=f"MG{i}", phone_number="+254722000000"
+            )
+            for i in range(3)
+        ]
+        url = reverse("customer-list-create")
+        ids = f"{customers[0].pk},{customers[2].pk}"
+        response = auth_client.get(url, {"ids": ids})
+        assert response.status_code == status.HTTP_200_OK
+        assert {c["code"] for c in response.data["results"]} == {"MG0", "MG2"}
+
+        response = auth_client.get(url, {"ids": "1,abc"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_customer_list_is_paged_with_estimated_count(
+        self, auth_client, settings, monkeypatch
+    ):
+        for i in range(3):
+            Customer.objects.create(
+                name=f"Customer {i}", code=f"PG{i}", phone_number="+254722000000"
+            )
+        monkeypatch.setattr("core.counting.estimate_count", lambda queryset: 50000)
+        settings.COUNT_ESTIMATE_THRESHOLD = 10000
+        url = reverse("customer-list-create")
+        response = auth_client.get(url, {"limit": 2, "ordering": "total_spent"})
+        assert response.data["count_type"] == "estimated"
+        assert response.data["count"] == 50000
+        assert response.data["has_more"]
+        assert [c["code"] for c in response.data["results"]] == ["PG0", "PG1"]
+
+    def test_customer_list_by_spend(self, auth_client):
+        for i, amount in enumerate(["5.00", "50.00", "20.00"]):
+            customer = Customer.objects.create(
+                name=f"Customer {i}", code=f"SP{i}", phone_number="+254722000000"
+            )
+            Order.objects.create(customer=customer, item="A", amount=Decimal(amount))
+
+        url = reverse("customer-list-create")
+        response = auth_client.get(url, {"ordering": "-total_spent", "min_spent": "10"})
+        assert response.status_code == status.HTTP_200_OK
+        assert [c["code"] for c in response.data["results"]] == ["SP1", "SP2"]
+
+        response = auth_client.get(url, {"ordering": "name"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        response = auth_client.get(url, {"min_spent": "lots"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_patch_writes_only_changed_fields(self, auth_client, customer_data):
+        customer = Customer.objects.create(**customer_data)
+        url = reverse("customer-detail", args=[customer.pk])
+        etag = auth_client.get(url)["ETag"]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = auth_client.patch(
+                url,
+                {"name": "Renamed", "code": customer.code},
+                format="json",
+                HTTP_IF_MATCH=etag,
+            )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["data"]["name"] == "Renamed"
+        assert response["ETag"] != etag
+        [update] = [q["sql"] for q in queries if q["sql"].startswith("UPDATE")]
+        assert '"name"' in update and '"code"' not in update.split("WHERE")[0]
+
+    def test_put_writes_only_writable_fields(self, auth_client, customer_data):
+        customer = Customer.objects.create(**customer_data)
+        url = reverse("customer-detail", args=[customer.pk])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = auth_client.put(
+                url, {**customer_data, "name": "Renamed"}, format="json"
+            )
+        assert response.status_code == status.HTTP_200_OK
+        [update] = [q["sql"] for q in queries if q["sql"].startswith("UPDATE")]
+        columns = update.split("WHERE")[0]
+        assert '"name"' in columns and '"phone_number"' in columns
+        assert '"order_count"' not in columns and '"total_spent"' not in columns
+
+    def test_patch_with_stale_etag_fails(self, auth_client, customer_data):
+        customer = Customer.objects.create(**customer_data)
+        url = reverse("customer-detail", args=[customer.pk])
+        etag = auth_client.get(url)["ETag"]
+        auth_client.patch(url, {"name": "First"}, format="json", HTTP_IF_MATCH=etag)
+
+        response = auth_client.patch(
+            url, {"name": "Second"}, format="json", HTTP_IF_MATCH=etag
+        )
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+        assert Customer.objects.get(pk=customer.pk).name == "First"
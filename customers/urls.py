@@ -1,7 +1,22 @@
 from django.urls import path
-from .views import CustomerListCreateView, CustomerDetailView
+from .views import (
+    CustomerAutocompleteView,
+    CustomerListCreateView,
+    CustomerDetailView,
+    CustomerOrderListView,
+)
 
 urlpatterns = [
     path("", CustomerListCreateView.as_view(), name="customer-list-create"),
+    path(
+        "autocomplete/",
+        CustomerAutocompleteView.as_view(),
+        name="customer-autocomplete",
+    ),
     path("<int:pk>/", CustomerDetailView.as_view(), name="customer-detail"),
+    path(
+        "<int:pk>/orders/",
+        CustomerOrderListView.as_view(),
+        name="customer-order-list",
+    ),
 ]
@@ -1,17 +1,87 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.exceptions import NotFound
 from rest_framework.permissions import IsAuthenticated
-from mozilla_django_oidc.contrib.drf import OIDCAuthentication
+from core.authentication.drf import OIDCAuthentication
 from django.shortcuts import get_object_or_404
+from django.http import Http404
 from django.core.exceptions import ValidationError
-from .models import Customer
-from .serializers import CustomerSerializer
-from django.db import IntegrityError
+from django.utils.http import parse_etags
+from .models import Customer, StaleCustomer
+from .serializers import CustomerSerializer, CustomerSummarySerializer
+from .services import get_autocomplete
+from core.counting import (
+    InvalidCountMode,
+    InvalidPage,
+    get_count_mode,
+    get_page,
+    paginate,
+)
+from core.multiget import InvalidIds, get_ids
+from orders.pagination import OrderCursorPagination
+from orders.serializers import OrderSerializer
+from django.db import IntegrityError, transaction
+from decimal import Decimal, InvalidOperation
 import logging
 
 logger = logging.getLogger(__name__)
 
+AUTOCOMPLETE_LIMIT = 10
+AUTOCOMPLETE_MAX_LIMIT = 20
+
+# List orderings, each backed by an index; id breaks ties.
+ORDERINGS = {
+    "total_spent": ["total_spent", "id"],
+    "-total_spent": ["-total_spent", "-id"],
+}
+
+
+def wants_summary(request):
+    """Whether the client asked for order summaries with ``?summary=true``."""
+    return request.query_params.get("summary", "").lower() in ("true", "1")
+
+
+def customer_etag(customer):
+    return f'"{customer.version}"'
+
+
+def etag_matches(request, customer):
+    """
+    Whether the request's If-Match header, if any, matches the customer.
+    The compression middleware weakens ETags (W/"3"), so weak tags are
+    compared by their version too.
+    """
+    header = request.headers.get("If-Match")
+    if not header:
+        return True
+    etags = parse_etags(header)
+    if etags == ["*"]:
+        return True
+    return customer_etag(customer) in (etag.removeprefix("W/") for etag in etags)
+
+
+def precondition_failed(customer):
+    return Response(
+        {
+            "status": "error",
+            "message": "Customer was modified by another request. "
+            "Fetch it again and retry.",
+        },
+        status=status.HTTP_412_PRECONDITION_FAILED,
+        headers={"ETag": customer_etag(customer)},
+    )
+
+
+def parse_amount(value):
+    """Parse an optional decimal amount query parameter."""
+    if not value:
+        return None
+    amount = Decimal(value)
+    if not amount.is_finite():
+        raise InvalidOperation(value)
+    return amount
+
 
 class CustomerListCreateView(APIView):
     authentication_classes = [OIDCAuthentication]
@@ -21,21 +91,70 @@ class CustomerListCreateView(APIView):
         """
         List all customers.
 
+        Query Parameters:
+            ids: Only return these customers (comma-separated IDs)
+            min_spent: Only customers whose total spend is at least this
+            max_spent: Only customers whose total spend is at most this
+            ordering: total_spent or -total_spent
+            summary: Include each customer's order summary when "true"
+            count: Count mode, one of auto (default), exact, estimated, none
+            limit: Page size (default LIST_PAGE_SIZE)
+            offset: Number of customers to skip
+
         Returns:
             Response: List of all customers with their details
         """
         try:
-            customers = Customer.objects.all()
-            serializer = CustomerSerializer(customers, many=True)
+            count_mode = get_count_mode(request)
+            limit, offset = get_page(request)
+            ids = get_ids(request)
+            customers = Customer.objects.order_by("-created_at", "-id")
+            if ids is not None:
+                customers = customers.filter(pk__in=ids)
+
+            try:
+                min_spent = parse_amount(request.query_params.get("min_spent"))
+                max_spent = parse_amount(request.query_params.get("max_spent"))
+            except InvalidOperation:
+                return Response(
+                    {
+                        "status": "error",
+                        "message": "min_spent and max_spent must be numbers",
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            if min_spent is not None:
+                customers = customers.filter(total_spent__gte=min_spent)
+            if max_spent is not None:
+                customers = customers.filter(total_spent__lte=max_spent)
+
+            ordering = request.query_params.get("ordering")
+            if ordering:
+                if ordering not in ORDERINGS:
+                    return Response(
+                        {
+                            "status": "error",
+                            "message": "Invalid ordering. Use one of: "
+                            + ", ".join(ORDERINGS),
+                        },
+                        status=status.HTTP_400_BAD_REQUEST,
+                    )
+                customers = customers.order_by(*ORDERINGS[ordering])
+
+            serializer_class = CustomerSerializer
+            if wants_summary(request):
+                serializer_class = CustomerSummarySerializer
+            page, fields = paginate(customers, limit, offset, count_mode)
+            serializer = serializer_class(page, many=True)
+            return Response({"status": "success", **fields, "results": serializer.data})
+        except (InvalidCountMode, InvalidPage, InvalidIds) as e:
             return Response(
-                {
-                    "status": "success",
-                    "count": len(serializer.data),
-                    "results": serializer.data,
-                }
+                {"status": "error", "message": str(e)},
+                status=status.HTTP_400_BAD_REQUEST,
             )
         except Exception as e:
-            logger.error(f"Error fetching customers: {str(e)}")
+            logger.error("Error fetching customers: %s", e)
             return Response(
                 {"status": "error", "message": "Failed to fetch customers"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -55,7 +174,7 @@ class CustomerListCreateView(APIView):
             serializer = CustomerSerializer(data=request.data)
             if serializer.is_valid():
                 customer = serializer.save()
-                logger.info(f"Created new customer: {customer.code}")
+                logger.info("Created new customer: %s", customer.code)
                 return Response(
                     {
                         "status": "success",
@@ -71,7 +190,7 @@ class CustomerListCreateView(APIView):
             )
 
         except IntegrityError as e:
-            logger.error(f"Database integrity error: {str(e)}")
+            logger.error("Database integrity error: %s", e)
             return Response(
                 {
                     "status": "error",
@@ -80,7 +199,7 @@ class CustomerListCreateView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
         except Exception as e:
-            logger.error(f"Error creating customer: {str(e)}")
+            logger.error("Error creating customer: %s", e)
             return Response(
                 {"status": "error", "message": "Failed to create customer"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -102,20 +221,29 @@ class CustomerDetailView(APIView):
         Args:
             pk: Customer ID
 
+        Query Parameters:
+            summary: Include the customer's order summary when "true"
+
         Returns:
             Response: Customer details or error message
         """
         try:
             customer = self.get_customer(pk)
-            serializer = CustomerSerializer(customer)
-            return Response({"status": "success", "data": serializer.data})
+            if wants_summary(request):
+                serializer = CustomerSummarySerializer(customer)
+            else:
+                serializer = CustomerSerializer(customer)
+            return Response(
+                {"status": "success", "data": serializer.data},
+                headers={"ETag": customer_etag(customer)},
+            )
         except Customer.DoesNotExist:
             return Response(
                 {"status": "error", "message": "Customer not found"},
                 status=status.HTTP_404_NOT_FOUND,
             )
         except Exception as e:
-            logger.error(f"Error retrieving customer {pk}: {str(e)}")
+            logger.error("Error retrieving customer %s: %s", pk, e)
             return Response(
                 {"status": "error", "message": "Failed to retrieve customer"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -129,33 +257,91 @@ class CustomerDetailView(APIView):
             pk: Customer ID
             request: HTTP request containing updated data
 
+        Headers:
+            If-Match: Only update if the customer still has this ETag
+
         Returns:
             Response: Updated customer data or error message
         """
+        return self.update_customer(request, pk, partial=False)
+
+    def patch(self, request, pk):
+        """
+        Update some of a customer's fields. Only fields whose values change
+        are written, in a single UPDATE.
+
+        Args:
+            pk: Customer ID
+            request: HTTP request containing the fields to change
+
+        Headers:
+            If-Match: Only update if the customer still has this ETag
+
+        Returns:
+            Response: Updated customer data or error message
+        """
+        return self.update_customer(request, pk, partial=True)
+
+    def update_customer(self, request, pk, partial):
         try:
             customer = self.get_customer(pk)
-            serializer = CustomerSerializer(customer, data=request.data)
-            if serializer.is_valid():
-                serializer.save()
-                logger.info(f"Updated customer: {customer.code}")
+            if not etag_matches(request, customer):
+                return precondition_failed(customer)
+            serializer = CustomerSerializer(
+                customer, data=request.data, partial=partial
+            )
+            if not serializer.is_valid():
                 return Response(
-                    {
-                        "status": "success",
-                        "message": "Customer updated successfully",
-                        "data": serializer.data,
-                    }
+                    {"status": "error", "errors": serializer.errors},
+                    status=status.HTTP_400_BAD_REQUEST,
                 )
+
+            loaded_version = customer.version
+            # The savepoint lets a StaleCustomer leave the connection usable.
+            with transaction.atomic():
+                if partial:
+                    changed = [
+                        field
+                        for field, value in serializer.validated_data.items()
+                        if getattr(customer, field) != value
+                    ]
+                    if changed:
+                        for field in changed:
+                            setattr(customer, field, serializer.validated_data[field])
+                        customer.save_at_version(
+                            loaded_version, update_fields=[*changed, "updated_at"]
+                        )
+                else:
+                    # Only the fields a client can write; the rest (e.g. the
+                    # order counters) may have moved on since the load.
+                    writable = [
+                        field.source
+                        for field in serializer.fields.values()
+                        if not field.read_only
+                    ]
+                    for field, value in serializer.validated_data.items():
+                        setattr(customer, field, value)
+                    customer.save_at_version(
+                        loaded_version, update_fields=[*writable, "updated_at"]
+                    )
+            logger.info("Updated customer: %s", customer.code)
             return Response(
-                {"status": "error", "errors": serializer.errors},
-                status=status.HTTP_400_BAD_REQUEST,
+                {
+                    "status": "success",
+                    "message": "Customer updated successfully",
+                    "data": CustomerSerializer(customer).data,
+                },
+                headers={"ETag": customer_etag(customer)},
             )
-        except Customer.DoesNotExist:
+        except StaleCustomer:
+            return precondition_failed(self.get_customer(pk))
+        except (Customer.DoesNotExist, Http404):
             return Response(
                 {"status": "error", "message": "Customer not found"},
                 status=status.HTTP_404_NOT_FOUND,
             )
         except Exception as e:
-            logger.error(f"Error updating customer {pk}: {str(e)}")
+            logger.error("Error updating customer %s: %s", pk, e)
             return Response(
                 {"status": "error", "message": "Failed to update customer"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -175,7 +361,7 @@ class CustomerDetailView(APIView):
             customer = self.get_customer(pk)
             customer_code = customer.code
             customer.delete()
-            logger.info(f"Deleted customer: {customer_code}")
+            logger.info("Deleted customer: %s", customer_code)
             return Response(
                 {"status": "success", "message": "Customer deleted successfully"},
                 status=status.HTTP_204_NO_CONTENT,
@@ -186,8 +372,84 @@ class CustomerDetailView(APIView):
                 status=status.HTTP_404_NOT_FOUND,
             )
         except Exception as e:
-            logger.error(f"Error deleting customer {pk}: {str(e)}")
+            logger.error("Error deleting customer %s: %s", pk, e)
             return Response(
                 {"status": "error", "message": "Failed to delete customer"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
+
+
+class CustomerOrderListView(APIView):
+    authentication_classes = [OIDCAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        """
+        List a customer's orders, newest first, one cursor page at a time.
+
+        Args:
+            pk: Customer ID
+
+        Query Parameters:
+            cursor: Opaque cursor taken from the previous page's links
+            page_size: Number of orders per page
+
+        Returns:
+            Response: A page of the customer's orders with next/previous links
+        """
+        try:
+            customer = get_object_or_404(Customer, pk=pk)
+            orders = customer.orders.select_related("customer")
+            paginator = OrderCursorPagination()
+            page = paginator.paginate_queryset(orders, request, view=self)
+            serializer = OrderSerializer(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
+        except Http404:
+            return Response(
+                {"status": "error", "message": "Customer not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        except NotFound:
+            return Response(
+                {"status": "error", "message": "Invalid cursor"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        except Exception as e:
+            logger.error("Error fetching orders for customer %s: %s", pk, e)
+            return Response(
+                {"status": "error", "message": "Failed to fetch customer orders"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class CustomerAutocompleteView(APIView):
+    authentication_classes = [OIDCAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """
+        Suggest customers whose code or name starts with a prefix.
+
+        Query Parameters:
+            q: Prefix to match against customer code and name
+            limit: Maximum number of suggestions (default 10, at most 20)
+
+        Returns:
+            Response: Matching customers' id, code and name
+        """
+        try:
+            try:
+                limit = int(request.query_params.get("limit", AUTOCOMPLETE_LIMIT))
+            except ValueError:
+                limit = AUTOCOMPLETE_LIMIT
+            limit = max(1, min(limit, AUTOCOMPLETE_MAX_LIMIT))
+            results = get_autocomplete().search(
+                request.query_params.get("q", ""), limit
+            )
+            return Response({"status": "success", "results": results})
+        except Exception as e:
+            logger.error("Error autocompleting customers: %s", e)
+            return Response(
+                {"status": "error", "message": "Failed to autocomplete customers"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
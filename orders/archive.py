@@ -0,0 +1,352 @@
+"""
+Columnar archives of closed months of orders.
+
+Each archive file holds one month of orders in ``order_time`` order:
+
+    b"ORDARCH1" | header length (uint32, little-endian) | JSON header | columns
+
+The JSON header is the file's index. It records the period, row count, id
+and time bounds, and each column's type code, byte offset and length.
+Numeric columns are stored as raw fixed-width integers: ids, epoch
+microseconds and amounts in cents. String columns (customer code, item,
+status) are dictionary-encoded. Their header entry lists the distinct
+values, and the column stores each row's index into that list in as few
+bytes as the list allows. This keeps files small and, unlike block
+compression, lets ``OrderArchive`` memory-map them and read any row or
+column range in place.
+"""
+
+import bisect
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Dict, Iterable, Iterator, List, Optional
+
+MAGIC = b"ORDARCH1"
+FORMAT_VERSION = 1
+SUFFIX = ".orders"
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+ALIGNMENT = 8
+
+# (name, kind) in file order; "int" columns are int64, "dict" columns are
+# dictionary-encoded strings.
+COLUMNS = [
+    ("id", "int"),
+    ("customer_id", "int"),
+    ("customer_code", "dict"),
+    ("item", "dict"),
+    ("amount", "int"),
+    ("order_time", "int"),
+    ("status", "dict"),
+]
+
+
+class ArchiveError(Exception):
+    """Raised for missing, corrupt or incompatible archive files."""
+
+
+def archive_name(month: date) -> str:
+    return f"orders-{month:%Y-%m}{SUFFIX}"
+
+
+def month_bounds(month: date):
+    """The UTC [start, end) datetimes of the month starting on ``month``."""
+    start = datetime(month.year, month.month, 1, tzinfo=timezone.utc)
+    if month.month == 12:
+        return start, start.replace(year=month.year + 1, month=1)
+    return start, start.replace(month=month.month + 1)
+
+
+def to_micros(value: datetime) -> int:
+    delta = value - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def from_micros(value: int) -> datetime:
+    return EPOCH + timedelta(microseconds=value)
+
+
+def _code_type(size: int) -> str:
+    if size <= 0xFF:
+        return "B"
+    if size <= 0xFFFF:
+        return "H"
+    return "I"
+
+
+def write_archive(path: str, month: date, rows: Iterable[tuple]) -> int:
+    """
+    Write ``rows`` of ``(id, customer_id, customer_code, item, amount,
+    order_time, status)``, sorted by order_time, to an archive at ``path``.
+    The file is written next to ``path`` and renamed into place, so readers
+    never see a partial archive. Returns the number of rows written.
+    """
+    values = {name: array("q") for name, kind in COLUMNS if kind == "int"}
+    codes = {name: [] for name, kind in COLUMNS if kind == "dict"}
+    dictionaries = {name: {} for name in codes}
+
+    count = 0
+    for row in rows:
+        record = dict(zip((name for name, _ in COLUMNS), row))
+        record["amount"] = int(Decimal(record["amount"]).scaleb(2))
+        record["order_time"] = to_micros(record["order_time"])
+        for name, column in values.items():
+            column.append(record[name])
+        for name, column in codes.items():
+            column.append(
+                dictionaries[name].setdefault(record[name], len(dictionaries[name]))
+            )
+        count += 1
+
+    order_times = values["order_time"]
+    ids = values["id"]
+    header = {
+        "format": FORMAT_VERSION,
+        "byteorder": sys.byteorder,
+        "period": f"{month:%Y-%m}",
+        "rows": count,
+        "min_order_time": order_times[0] if count else None,
+        "max_order_time": order_times[-1] if count else None,
+        "min_id": min(ids) if count else None,
+        "max_id": max(ids) if count else None,
+        "columns": [],
+    }
+
+    blobs = []
+    for name, kind in COLUMNS:
+        if kind == "int":
+            data = values[name]
+            entry = {"name": name, "type": "q"}
+        else:
+            data = array(_code_type(len(dictionaries[name])), codes[name])
+            entry = {
+                "name": name,
+                "type": data.typecode,
+                "dictionary": list(dictionaries[name]),
+            }
+        entry["length"] = len(data) * data.itemsize
+        header["columns"].append(entry)
+        blobs.append(data.tobytes())
+
+    # Column offsets depend on the header's own size, so lay the columns
+    # out after a header padded to a fixed boundary.
+    def encode(header):
+        return json.dumps(header, separators=(",", ":")).encode()
+
+    for entry in header["columns"]:
+        entry["offset"] = 0
+    prefix = len(MAGIC) + 4
+    while True:
+        header_size = len(encode(header))
+        offset = _align(prefix + header_size)
+        for entry in header["columns"]:
+            entry["offset"] = offset
+            offset = _align(offset + entry["length"])
+        if len(encode(header)) == header_size:
+            break
+    encoded = encode(header)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as archive:
+        archive.write(MAGIC)
+        archive.write(struct.pack("<I", len(encoded)))
+        archive.write(encoded)
+        for entry, blob in zip(header["columns"], blobs):
+            archive.write(b"\0" * (entry["offset"] - archive.tell()))
+            archive.write(blob)
+    os.replace(tmp_path, path)
+    return count
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class OrderArchive:
+    """
+    Read-only, memory-mapped view of one archive file. Columns are exposed
+    as typed memoryviews over the mapping, so nothing is read from disk
+    until it is used and lookups by time range are binary searches.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as archive:
+            try:
+                self._mmap = mmap.mmap(archive.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ArchiveError(f"{path} is empty")
+        if self._mmap[: len(MAGIC)] != MAGIC:
+            raise ArchiveError(f"{path} is not an order archive")
+        (header_size,) = struct.unpack_from("<I", self._mmap, len(MAGIC))
+        start = len(MAGIC) + 4
+        self.header = json.loads(self._mmap[start : start + header_size])
+        if self.header["format"] != FORMAT_VERSION:
+            raise ArchiveError(f"{path} has unsupported format {self.header['format']}")
+        if self.header["byteorder"] != sys.byteorder:
+            raise ArchiveError(
+                f"{path} was written on a {self.header['byteorder']}-endian machine"
+            )
+
+        self._buffer = memoryview(self._mmap)
+        self._columns = {}
+        self._dictionaries = {}
+        for entry in self.header["columns"]:
+            data = self._buffer[entry["offset"] : entry["offset"] + entry["length"]]
+            self._columns[entry["name"]] = data.cast(entry["type"])
+            if "dictionary" in entry:
+                self._dictionaries[entry["name"]] = entry["dictionary"]
+
+    def __len__(self):
+        return self.header["rows"]
+
+    @property
+    def period(self) -> str:
+        return self.header["period"]
+
+    @property
+    def month(self) -> date:
+        return datetime.strptime(self.period, "%Y-%m").date()
+
+    def overlaps(self, start: Optional[datetime], end: Optional[datetime]) -> bool:
+        """Whether any row may fall in the half-open range [start, end)."""
+        if not len(self):
+            return False
+        if start is not None and self.header["max_order_time"] < to_micros(start):
+            return False
+        if end is not None and self.header["min_order_time"] >= to_micros(end):
+            return False
+        return True
+
+    def column(self, name: str):
+        """Raw column values; dictionary codes for string columns."""
+        return self._columns[name]
+
+    def dictionary(self, name: str) -> List[str]:
+        return self._dictionaries[name]
+
+    def bounds(self, start: Optional[datetime], end: Optional[datetime]):
+        """Row index range of orders placed in [start, end)."""
+        times = self._columns["order_time"]
+        lo = 0 if start is None else bisect.bisect_left(times, to_micros(start))
+        hi = len(times) if end is None else bisect.bisect_left(times, to_micros(end))
+        return lo, hi
+
+    def row(self, index: int) -> dict:
+        record = {}
+        for name, kind in COLUMNS:
+            value = self._columns[name][index]
+            if kind == "dict":
+                value = self._dictionaries[name][value]
+            record[name] = value
+        record["amount"] = Decimal(record["amount"]).scaleb(-2)
+        record["order_time"] = from_micros(record["order_time"])
+        return record
+
+    def rows(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        customer_code: Optional[str] = None,
+    ) -> Iterator[dict]:
+        """Orders placed in [start, end), optionally for one customer."""
+        lo, hi = self.bounds(start, end)
+        if customer_code is None:
+            indexes = range(lo, hi)
+        else:
+            try:
+                code = self._dictionaries["customer_code"].index(customer_code)
+            except ValueError:
+                return
+            codes = self._columns["customer_code"]
+            indexes = (i for i in range(lo, hi) if codes[i] == code)
+        for index in indexes:
+            yield self.row(index)
+
+    def totals(
+        self, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> dict:
+        """Order count and amount per status for orders in [start, end)."""
+        lo, hi = self.bounds(start, end)
+        statuses = self._dictionaries["status"]
+        counts = [0] * len(statuses)
+        cents = [0] * len(statuses)
+        codes = self._columns["status"][lo:hi]
+        amounts = self._columns["amount"][lo:hi]
+        for code, amount in zip(codes, amounts):
+            counts[code] += 1
+            cents[code] += amount
+        return {
+            status: {"count": counts[i], "amount": Decimal(cents[i]).scaleb(-2)}
+            for i, status in enumerate(statuses)
+            if counts[i]
+        }
+
+    def close(self):
+        # The mapping can't be closed while views into it are alive.
+        for column in self._columns.values():
+            column.release()
+        self._columns.clear()
+        self._buffer.release()
+        self._mmap.close()
+
+
+class ArchiveStore:
+    """The archive files in ``directory``, opened as they are needed."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._open: Dict[str, tuple] = {}
+
+    def archives(self) -> List[OrderArchive]:
+        """Every archive in the directory, oldest period first."""
+        try:
+            names = sorted(
+                name for name in os.listdir(self.directory) if name.endswith(SUFFIX)
+            )
+        except FileNotFoundError:
+            return []
+        opened = {}
+        for name in names:
+            path = os.path.join(self.directory, name)
+            mtime = os.stat(path).st_mtime_ns
+            cached = self._open.get(path)
+            if cached is None or cached[0] != mtime:
+                # Rewritten archives are renamed into place, so an old
+                # mapping keeps reading the previous file until it is
+                # replaced here.
+                cached = (mtime, OrderArchive(path))
+            opened[path] = cached
+        self._open = opened
+        return [archive for _, archive in opened.values()]
+
+    def overlapping(
+        self, start: Optional[datetime], end: Optional[datetime]
+    ) -> List[OrderArchive]:
+        return [archive for archive in self.archives() if archive.overlaps(start, end)]
+
+    def rows(
+        self, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> Iterator[dict]:
+        for archive in self.overlapping(start, end):
+            yield from archive.rows(start, end)
+
+
+_stores: Dict[str, ArchiveStore] = {}
+
+
+def get_archive_store(directory: Optional[str] = None) -> ArchiveStore:
+    """Return this process's store for ``directory`` (ORDERS_ARCHIVE_DIR)."""
+    if directory is None:
+        from django.conf import settings
+
+        directory = settings.ORDERS_ARCHIVE_DIR
+    store = _stores.get(directory)
+    if store is None:
+        store = _stores[directory] = ArchiveStore(directory)
+    return store
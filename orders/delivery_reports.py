@@ -0,0 +1,185 @@
+import atexit
+import logging
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.query_cache import invalidate_table
+
+from .models import Order, SMSDeliveryStat
+
+logger = logging.getLogger(__name__)
+
+SENT = "Sent"
+# Africa's Talking delivery statuses. Pending statuses may still change; a
+# final one is never replaced by a pending report that arrives late.
+PENDING_STATUSES = {"Sent", "Submitted", "Buffered"}
+FINAL_STATUSES = {"Success", "Failed", "Rejected", "AbsentSubscriber", "Expired"}
+DELIVERY_STATUSES = PENDING_STATUSES | FINAL_STATUSES
+DELIVERED = "Success"
+
+
+def supersedes(new: str, old: Optional[str]) -> bool:
+    return old is None or old in PENDING_STATUSES or new not in PENDING_STATUSES
+
+
+def adjust_stats(deltas: Counter) -> None:
+    """Add ``deltas``, keyed by ``(date, status)``, to the delivery stats."""
+    for (day, status), delta in sorted(deltas.items()):
+        if not delta:
+            continue
+        stats = SMSDeliveryStat.objects.filter(date=day, status=status)
+        if stats.update(count=F("count") + delta):
+            continue
+        try:
+            with transaction.atomic():
+                SMSDeliveryStat.objects.create(date=day, status=status, count=delta)
+        except IntegrityError:
+            # Another worker created the row first.
+            stats.update(count=F("count") + delta)
+
+
+def record_sent(order: Order, message_id: str) -> None:
+    """Store the confirmation SMS's message id on ``order``."""
+    now = timezone.now()
+    with transaction.atomic():
+        # A queryset update, so the order isn't saved (and signalled) twice.
+        Order.objects.filter(pk=order.pk).update(
+            sms_message_id=message_id, sms_status=SENT, sms_status_at=now
+        )
+        adjust_stats(Counter({(timezone.localdate(order.order_time), SENT): 1}))
+    order.sms_message_id, order.sms_status, order.sms_status_at = (
+        message_id,
+        SENT,
+        now,
+    )
+    invalidate_table(Order._meta.db_table)
+
+
+def apply_delivery_reports(reports: Dict[str, str]) -> int:
+    """
+    Apply ``{message_id: status}`` reports to their orders with one UPDATE
+    per distinct status and move the affected delivery stats along.
+    Returns the number of orders whose status changed.
+    """
+    with transaction.atomic():
+        orders = (
+            Order.objects.select_for_update()
+            .filter(sms_message_id__in=list(reports))
+            .values_list("pk", "sms_message_id", "sms_status", "order_time")
+        )
+        changes = defaultdict(list)
+        deltas = Counter()
+        for pk, message_id, old, order_time in orders:
+            new = reports[message_id]
+            if new == old or not supersedes(new, old):
+                continue
+            changes[new].append(pk)
+            day = timezone.localdate(order_time)
+            if old:
+                deltas[(day, old)] -= 1
+            deltas[(day, new)] += 1
+
+        now = timezone.now()
+        for status, pks in changes.items():
+            Order.objects.filter(pk__in=pks).update(
+                sms_status=status, sms_status_at=now
+            )
+        adjust_stats(deltas)
+
+    changed = sum(len(pks) for pks in changes.values())
+    if changed:
+        invalidate_table(Order._meta.db_table)
+    return changed
+
+
+class DeliveryReportBuffer:
+    """
+    Collects delivery reports in memory so the callback endpoint can
+    acknowledge them right away, and applies them in batches.
+
+    A background thread flushes the buffer every ``SMS_REPORT_FLUSH_SECONDS``
+    or as soon as ``SMS_REPORT_BATCH_SIZE`` reports are waiting. Only the
+    latest report per message is kept. Once ``SMS_REPORT_MAX_BUFFERED``
+    messages are waiting (e.g. the database is down), new reports are
+    refused so the callback can ask Africa's Talking to retry them later.
+    Reports still buffered when a process is killed are lost.
+    """
+
+    def __init__(
+        self, batch_size=None, flush_interval=None, max_buffered=None, background=True
+    ):
+        self.batch_size = batch_size or settings.SMS_REPORT_BATCH_SIZE
+        self.flush_interval = flush_interval or settings.SMS_REPORT_FLUSH_SECONDS
+        self.max_buffered = max_buffered or settings.SMS_REPORT_MAX_BUFFERED
+        self.background = background
+        self._reports = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def __len__(self):
+        return len(self._reports)
+
+    def add(self, message_id: str, status: str) -> bool:
+        """Buffer a report; returns False if the buffer is full."""
+        with self._lock:
+            current = self._reports.get(message_id)
+            if current is None and len(self._reports) >= self.max_buffered:
+                return False
+            if supersedes(status, current):
+                self._reports[message_id] = status
+            full = len(self._reports) >= self.batch_size
+            if self.background and self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="sms-delivery-reports", daemon=True
+                )
+                self._thread.start()
+        if full:
+            self._wake.set()
+        return True
+
+    def flush(self) -> int:
+        """Apply every buffered report now."""
+        with self._lock:
+            reports, self._reports = self._reports, {}
+        if not reports:
+            return 0
+        try:
+            return apply_delivery_reports(reports)
+        except Exception:
+            # Put the batch back for the next flush, behind anything newer.
+            with self._lock:
+                for message_id, status in reports.items():
+                    self._reports.setdefault(message_id, status)
+            raise
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error("Error applying SMS delivery reports: %s", e)
+            finally:
+                close_old_connections()
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_report_buffer() -> DeliveryReportBuffer:
+    """Return this process's delivery report buffer."""
+    global _buffer
+    with _buffer_lock:
+        if _buffer is None:
+            _buffer = DeliveryReportBuffer()
+            atexit.register(_buffer.flush)
+        return _buffer
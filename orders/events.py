@@ -0,0 +1,238 @@
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+ORDER_CREATED = "order.created"
+ORDER_STATUS_CHANGED = "order.status_changed"
+
+
+@dataclass(frozen=True)
+class OrderEvent:
+    id: int
+    type: str
+    data: dict = field(default_factory=dict)
+
+    def to_json(self) -> str:
+        return json.dumps({"id": self.id, "type": self.type, "data": self.data})
+
+    @classmethod
+    def from_json(cls, payload: str) -> "OrderEvent":
+        raw = json.loads(payload)
+        return cls(id=raw["id"], type=raw["type"], data=raw["data"])
+
+    def to_sse(self) -> str:
+        return f"id: {self.id}\nevent: {self.type}\ndata: {json.dumps(self.data)}\n\n"
+
+
+class Subscription:
+    """
+    A subscriber's bounded event queue, owned by the subscriber's event loop.
+
+    A consumer that falls ``max_pending`` events behind is cut off instead
+    of letting its queue grow without bound: it receives the events already
+    queued and then ``None``, and is expected to reconnect with the last
+    event id it saw to replay what it missed.
+    """
+
+    def __init__(self, loop, customer_id=None, status=None, max_pending=100):
+        self.loop = loop
+        self.customer_id = customer_id
+        self.status = status
+        self.max_pending = max_pending
+        self.overflowed = False
+        self.queue = asyncio.Queue(maxsize=max_pending + 1)
+
+    def matches(self, event: OrderEvent) -> bool:
+        if (
+            self.customer_id is not None
+            and event.data.get("customer_id") != self.customer_id
+        ):
+            return False
+        if self.status is not None and event.data.get("status") != self.status:
+            return False
+        return True
+
+    def deliver(self, event: OrderEvent) -> None:
+        """Queue ``event``; must run on the subscriber's event loop."""
+        if self.overflowed or not self.matches(event):
+            return
+        if self.queue.qsize() >= self.max_pending:
+            self.overflowed = True
+            self.queue.put_nowait(None)
+            return
+        self.queue.put_nowait(event)
+
+    async def get(self) -> Optional[OrderEvent]:
+        return await self.queue.get()
+
+
+class BaseBroker:
+    """
+    Fans order events out to the subscribers of this process and keeps the
+    most recent ones so reconnecting clients can resume from an event id.
+    Subclasses decide how published events reach every process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._recent = deque(maxlen=settings.ORDER_EVENTS_REPLAY_SIZE)
+
+    def publish(self, event_type: str, data: dict) -> OrderEvent:
+        raise NotImplementedError
+
+    def dispatch(self, event: OrderEvent) -> None:
+        """Hand ``event`` to every local subscriber; safe from any thread."""
+        with self._lock:
+            self._recent.append(event)
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+
+    def subscribe(self, last_event_id=None, customer_id=None, status=None):
+        """
+        Register a subscription on the running event loop. Events newer than
+        ``last_event_id`` that are still in the replay buffer are queued
+        straight away.
+        """
+        subscription = Subscription(
+            asyncio.get_running_loop(),
+            customer_id=customer_id,
+            status=status,
+            max_pending=settings.ORDER_EVENTS_QUEUE_SIZE,
+        )
+        with self._lock:
+            self._subscribers.add(subscription)
+            missed = (
+                [event for event in self._recent if event.id > last_event_id]
+                if last_event_id is not None
+                else []
+            )
+        for event in missed:
+            subscription.deliver(event)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+
+class InMemoryBroker(BaseBroker):
+    """Single-process broker for development and tests."""
+
+    def __init__(self):
+        super().__init__()
+        self._last_id = 0
+
+    def next_event_id(self) -> int:
+        with self._lock:
+            self._last_id += 1
+            return self._last_id
+
+    def publish(self, event_type: str, data: dict) -> OrderEvent:
+        event = OrderEvent(self.next_event_id(), event_type, data)
+        self.dispatch(event)
+        return event
+
+
+class PostgresBroker(BaseBroker):
+    """
+    Broker that fans events out across worker processes with Postgres
+    ``LISTEN/NOTIFY``. Each process runs one listener thread on a dedicated
+    connection, started when the first client subscribes.
+
+    Event ids come from the ``order_events_id_seq`` database sequence, so
+    they increase in the order events are published, whichever process
+    publishes them, and a client can resume on any worker.
+    """
+
+    channel = "order_events"
+    sequence = "order_events_id_seq"
+
+    def __init__(self):
+        super().__init__()
+        self._listener = None
+
+    def publish(self, event_type: str, data: dict) -> OrderEvent:
+        # Publishers take turns, so notifications are committed, and so
+        # delivered, in id order and resuming never skips a late lower id.
+        with transaction.atomic(), connections["default"].cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", [self.channel])
+            cursor.execute("SELECT nextval(%s)", [self.sequence])
+            event = OrderEvent(cursor.fetchone()[0], event_type, data)
+            cursor.execute("SELECT pg_notify(%s, %s)", [self.channel, event.to_json()])
+        return event
+
+    def subscribe(self, *args, **kwargs):
+        self._ensure_listener()
+        return super().subscribe(*args, **kwargs)
+
+    def _ensure_listener(self):
+        with self._lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = threading.Thread(
+                    target=self._listen, name="order-events-listener", daemon=True
+                )
+                self._listener.start()
+
+    def _listen(self):
+        import psycopg2
+
+        params = connections["default"].get_connection_params()
+        while True:
+            try:
+                conn = psycopg2.connect(**params)
+                conn.set_isolation_level(0)  # autocommit
+                with conn.cursor() as cursor:
+                    cursor.execute(f"LISTEN {self.channel}")
+                while True:
+                    if select.select([conn], [], [], 5) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        self.dispatch(OrderEvent.from_json(notify.payload))
+            except Exception as e:
+                logger.error("Order event listener failed, reconnecting: %s", e)
+                time.sleep(1)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker() -> BaseBroker:
+    """Return this process's broker, built from ``ORDER_EVENTS_BROKER``."""
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            _broker = import_string(settings.ORDER_EVENTS_BROKER)()
+        return _broker
+
+
+def publish_on_commit(event_type: str, data: dict) -> None:
+    """
+    Publish an event once the current transaction commits. A failure to
+    publish is logged, not raised: the write has committed by then, and
+    failing the request would make the client retry it.
+    """
+
+    def publish():
+        try:
+            get_broker().publish(event_type, data)
+        except Exception as e:
+            logger.error("Failed to publish %s event: %s", event_type, e)
+
+    transaction.on_commit(publish)
@@ -0,0 +1,152 @@
+import heapq
+import os
+from datetime import date, datetime, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Min
+
+from core.query_cache import invalidate_table
+from orders.archive import OrderArchive, archive_name, month_bounds, write_archive
+from orders.models import Order
+from orders.partitioning import (
+    add_months,
+    detach_partition,
+    is_partitioned,
+    list_partitions,
+    month_start,
+    partition_name,
+)
+
+EXPORT_FIELDS = (
+    "id",
+    "customer_id",
+    "customer__code",
+    "item",
+    "amount",
+    "order_time",
+    "status",
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Export closed months of orders to memory-mapped columnar archives "
+        "and optionally prune them from the orders table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than",
+            type=int,
+            default=settings.ORDERS_ARCHIVE_AFTER_MONTHS,
+            help="Archive months that ended at least this many months ago.",
+        )
+        parser.add_argument(
+            "--dir",
+            default=settings.ORDERS_ARCHIVE_DIR,
+            help="Directory that receives the archive files.",
+        )
+        parser.add_argument(
+            "--prune",
+            action="store_true",
+            help="Delete archived orders from the orders table.",
+        )
+
+    def handle(self, *args, **options):
+        directory = options["dir"]
+        os.makedirs(directory, exist_ok=True)
+        this_month = month_start(datetime.now(timezone.utc).date())
+        cutoff = add_months(this_month, -options["older_than"])
+
+        first = Order.objects.aggregate(first=Min("order_time"))["first"]
+        if first is None:
+            self.stdout.write("No orders to archive")
+            return
+
+        archived = 0
+        month = month_start(first.astimezone(timezone.utc).date())
+        while month < cutoff:
+            start, end = month_bounds(month)
+            live = Order.objects.filter(order_time__gte=start, order_time__lt=end)
+            if live.exists():
+                path = os.path.join(directory, archive_name(month))
+                rows = self.export(month, live, path)
+                archived += rows
+                self.stdout.write(f"Archived {rows} orders of {month:%Y-%m} to {path}")
+                if options["prune"]:
+                    self.prune(month, live, path)
+            month = add_months(month, 1)
+
+        if archived:
+            # Archived ranges show up in (and pruning removes rows from)
+            # cached order lists.
+            invalidate_table(Order._meta.db_table)
+        self.stdout.write(self.style.SUCCESS(f"Archived {archived} orders"))
+
+    def export(self, month: date, live, path: str) -> int:
+        """
+        Write the month's live orders to its archive, keeping orders that an
+        earlier run archived and pruned. Returns the archive's row count.
+        """
+        rows = live.order_by("order_time", "id").values_list(*EXPORT_FIELDS)
+        if not os.path.exists(path):
+            return write_archive(path, month, rows.iterator())
+
+        previous = OrderArchive(path)
+        try:
+            live_ids = set(live.values_list("id", flat=True))
+            kept = (
+                tuple(row.values())
+                for row in previous.rows()
+                if row["id"] not in live_ids
+            )
+            merged = heapq.merge(
+                kept, rows.iterator(), key=lambda row: (row[5], row[0])
+            )
+            return write_archive(path, month, merged)
+        finally:
+            previous.close()
+
+    def prune(self, month: date, live, path: str) -> None:
+        """
+        Delete the month's orders without firing model signals, so customer
+        counters keep the archived orders and no sync tombstones are
+        written for them. A monthly partition is dropped instead.
+        """
+        archive = OrderArchive(path)
+        try:
+            archived_ids = set(archive.column("id"))
+        finally:
+            archive.close()
+
+        with transaction.atomic():
+            live_ids = set(live.select_for_update().values_list("id", flat=True))
+            missing = live_ids - archived_ids
+            if missing:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"Not pruning {month:%Y-%m}: {len(missing)} orders "
+                        "were added since it was archived"
+                    )
+                )
+                return
+
+            name = partition_name(month)
+            with connection.cursor() as cursor:
+                if (
+                    connection.vendor == "postgresql"
+                    and is_partitioned()
+                    and name in list_partitions()
+                ):
+                    detach_partition(name)
+                    cursor.execute(f'DROP TABLE "{name}"')
+                else:
+                    start, end = month_bounds(month)
+                    cursor.execute(
+                        f'DELETE FROM "{Order._meta.db_table}" '
+                        "WHERE order_time >= %s AND order_time < %s",
+                        [start, end],
+                    )
+        self.stdout.write(f"Pruned {len(live_ids)} orders of {month:%Y-%m}")
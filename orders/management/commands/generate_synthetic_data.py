@@ -0,0 +1,230 @@
+import csv
+import io
+import multiprocessing
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+
+from customers.counters import reconcile
+from customers.models import Customer
+from orders import synthetic
+from orders.models import Order
+
+
+@contextmanager
+def explicit_timestamps(model):
+    """Let bulk_create keep the generated auto_now/auto_now_add values."""
+    fields = [
+        field
+        for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def copy_rows(model, columns, rows):
+    """Load ``rows`` into ``model``'s table with a single Postgres COPY."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    column_list = ", ".join(f'"{column}"' for column in columns)
+    with connection.cursor() as cursor:
+        cursor.cursor.copy_expert(
+            f'COPY "{model._meta.db_table}" ({column_list}) '
+            "FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+
+
+def bulk_rows(model, columns, rows, batch_size):
+    with explicit_timestamps(model):
+        model.objects.bulk_create(
+            [model(**dict(zip(columns, row))) for row in rows],
+            batch_size=batch_size,
+        )
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate deterministic synthetic customers and orders with "
+        "realistic distributions and bulk-load them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--customers", type=int, default=10_000)
+        parser.add_argument("--orders", type=int, default=100_000)
+        parser.add_argument(
+            "--seed", type=int, default=42, help="Same seed, same data."
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Number of generator processes feeding the loader.",
+        )
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument(
+            "--start",
+            default="2024-01-01",
+            help="First day of the order period (YYYY-MM-DD).",
+        )
+        parser.add_argument(
+            "--days", type=int, default=365, help="Length of the order period."
+        )
+        parser.add_argument(
+            "--skew",
+            type=float,
+            default=1.1,
+            help="Zipf exponent of the orders-per-customer distribution.",
+        )
+        parser.add_argument(
+            "--code-prefix",
+            default="S",
+            help="Uppercase prefix of generated customer codes.",
+        )
+        parser.add_argument(
+            "--loader",
+            choices=["auto", "copy", "bulk"],
+            default="auto",
+            help="COPY (PostgreSQL only) or batched bulk_create.",
+        )
+
+    def handle(self, *args, **options):
+        prefix = options["code_prefix"]
+        if not (prefix.isalnum() and prefix.isupper()) or len(prefix) > 2:
+            raise CommandError(
+                "--code-prefix must be at most 2 uppercase letters or digits"
+            )
+        try:
+            start = datetime.strptime(options["start"], "%Y-%m-%d").replace(
+                tzinfo=timezone.utc
+            )
+        except ValueError:
+            raise CommandError("Invalid --start date. Use YYYY-MM-DD")
+
+        loader = options["loader"]
+        if loader == "auto":
+            loader = "copy" if connection.vendor == "postgresql" else "bulk"
+        elif loader == "copy" and connection.vendor != "postgresql":
+            raise CommandError("The copy loader requires PostgreSQL")
+
+        self.loader = loader
+        self.batch_size = options["batch_size"]
+        self.workers = max(1, options["workers"])
+        seed = options["seed"]
+        # Customer sign-up dates are relative to the end of the order period
+        # so the data doesn't depend on when the command runs.
+        period_end = start + timedelta(days=options["days"])
+
+        # Orders only go to the customers this run inserts, so existing
+        # customers neither receive synthetic orders nor change the output.
+        codes = [
+            synthetic.customer_code(prefix, index)
+            for index in range(options["customers"])
+        ]
+        taken = self.existing_codes(codes)
+        if taken:
+            raise CommandError(
+                f"{len(taken)} customer codes already exist (e.g. {min(taken)}); "
+                "use another --code-prefix"
+            )
+
+        started = time.monotonic()
+        customer_chunks = [
+            (seed, prefix, index * self.batch_size, count, period_end)
+            for index, count in synthetic.chunks(options["customers"], self.batch_size)
+        ]
+        loaded = self.load(
+            Customer,
+            ["name", "code", "phone_number", "created_at", "updated_at"],
+            synthetic.customer_chunk,
+            customer_chunks,
+            lambda row: row + (row[3],),
+        )
+        self.stdout.write(f"Loaded {loaded} customers")
+
+        ids_by_code = {}
+        for index in range(0, len(codes), self.batch_size):
+            ids_by_code.update(
+                Customer.objects.filter(
+                    code__in=codes[index : index + self.batch_size]
+                ).values_list("code", "id")
+            )
+        customer_ids = [ids_by_code[code] for code in codes]
+        if not customer_ids and options["orders"]:
+            raise CommandError("No synthetic customers to attach orders to")
+
+        loaded = self.load(
+            Order,
+            ["customer_id", "item", "amount", "order_time", "status", "updated_at"],
+            synthetic.order_chunk,
+            synthetic.chunks(options["orders"], self.batch_size),
+            lambda row: row + (row[3],),
+            initializer=synthetic.init_order_worker,
+            initargs=(seed, customer_ids, start, options["days"], options["skew"]),
+        )
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Loaded {loaded} orders in {elapsed:.1f}s using the {self.loader} loader"
+            )
+        )
+
+        # Bulk loading skips the signals that maintain customer counters.
+        drifted = reconcile(batch_size=self.batch_size, fix=True)
+        self.stdout.write(f"Updated order counters of {len(drifted)} customers")
+
+    def existing_codes(self, codes):
+        taken = set()
+        for index in range(0, len(codes), self.batch_size):
+            taken.update(
+                Customer.objects.filter(
+                    code__in=codes[index : index + self.batch_size]
+                ).values_list("code", flat=True)
+            )
+        return taken
+
+    def load(
+        self, model, columns, generate, chunks, to_row, initializer=None, initargs=()
+    ):
+        """
+        Generate ``chunks`` in worker processes and load each one as it
+        arrives. ``imap`` hands chunks back in order, so ids are assigned
+        deterministically as well.
+        """
+        if self.workers == 1 or len(chunks) <= 1:
+            if initializer is not None:
+                initializer(*initargs)
+            results = map(generate, chunks)
+            return self._load_chunks(model, columns, results, to_row)
+
+        # Don't let forked workers inherit open database connections.
+        connections.close_all()
+        with multiprocessing.Pool(
+            self.workers, initializer=initializer, initargs=initargs
+        ) as pool:
+            results = pool.imap(generate, chunks)
+            return self._load_chunks(model, columns, results, to_row)
+
+    def _load_chunks(self, model, columns, results, to_row):
+        loaded = 0
+        for rows in results:
+            rows = [to_row(row) for row in rows]
+            if self.loader == "copy":
+                copy_rows(model, columns, rows)
+            else:
+                bulk_rows(model, columns, rows, self.batch_size)
+            loaded += len(rows)
+            self.stdout.write(f"  {model._meta.verbose_name_plural}: {loaded}")
+        return loaded
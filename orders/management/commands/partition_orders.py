@@ -0,0 +1,103 @@
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from orders.partitioning import (
+    PartitioningError,
+    add_months,
+    archive_partition,
+    convert_to_partitioned,
+    detach_partition,
+    detached_partitions,
+    drop_partition,
+    ensure_partitions,
+    is_partitioned,
+    list_partitions,
+    month_start,
+    partition_month,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Maintain monthly range partitions of the orders table: create "
+        "upcoming partitions and detach or archive expired ones."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--convert",
+            action="store_true",
+            help="Rebuild an unpartitioned orders table as a partitioned one. "
+            "Apply all migrations first. The new primary key is (id, order_time), "
+            "so id on its own is only unique while ids come from the table's "
+            "sequence.",
+        )
+        parser.add_argument(
+            "--ahead",
+            type=int,
+            default=settings.ORDERS_PARTITION_MONTHS_AHEAD,
+            help="Number of future months to create partitions for.",
+        )
+        parser.add_argument(
+            "--retain",
+            type=int,
+            default=None,
+            help="Detach partitions older than this many months.",
+        )
+        parser.add_argument(
+            "--archive",
+            action="store_true",
+            help="Dump expired (and previously detached) partitions to "
+            "compressed files and drop them.",
+        )
+        parser.add_argument(
+            "--archive-dir",
+            default=settings.ORDERS_PARTITION_ARCHIVE_DIR,
+            help="Directory that receives archived partitions.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            if options["convert"]:
+                convert_to_partitioned(options["ahead"])
+                self.stdout.write(self.style.SUCCESS("Converted orders table"))
+            elif not is_partitioned():
+                raise CommandError(
+                    "The orders table is not partitioned, run with --convert first"
+                )
+
+            this_month = month_start(date.today())
+            created = ensure_partitions(
+                this_month, add_months(this_month, options["ahead"])
+            )
+            self.stdout.write(f"Ensured partitions: {', '.join(created)}")
+
+            if options["retain"] is None:
+                return
+
+            if options["archive"]:
+                # Partitions detached by an earlier run that failed to
+                # archive them.
+                for name in detached_partitions():
+                    path = archive_partition(name, options["archive_dir"])
+                    self.stdout.write(f"Archived leftover {name} to {path}")
+
+            cutoff = add_months(this_month, -options["retain"])
+            for name in list_partitions():
+                month = partition_month(name)
+                if month is None or month >= cutoff:
+                    continue
+                # Dump before detaching, so a failed dump leaves the
+                # partition attached and it is retried on the next run.
+                if options["archive"]:
+                    path = archive_partition(name, options["archive_dir"], drop=False)
+                    self.stdout.write(f"Archived {name} to {path}")
+                detach_partition(name)
+                self.stdout.write(f"Detached {name}")
+                if options["archive"]:
+                    drop_partition(name)
+                    self.stdout.write(f"Dropped {name}")
+        except PartitioningError as e:
+            raise CommandError(str(e))
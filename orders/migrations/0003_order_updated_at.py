@@ -0,0 +1,25 @@
+# Generated by Django 5.1.4 on 2026-10-19 01:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("customers", "0002_customer_updated_at_index"),
+        ("orders", "0002_customer_order_time_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="order",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["updated_at", "id"], name="orders_updated_4de207_idx"
+            ),
+        ),
+    ]
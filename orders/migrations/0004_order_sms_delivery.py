@@ -0,0 +1,54 @@
+# Generated by Django 5.1.4 on 2026-10-19 01:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0003_order_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="order",
+            name="sms_message_id",
+            field=models.CharField(blank=True, db_index=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name="order",
+            name="sms_status",
+            field=models.CharField(blank=True, max_length=20, null=True),
+        ),
+        migrations.AddField(
+            model_name="order",
+            name="sms_status_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name="SMSDeliveryStat",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("status", models.CharField(max_length=20)),
+                ("count", models.IntegerField(default=0)),
+            ],
+            options={
+                "db_table": "sms_delivery_stats",
+                "ordering": ["date", "status"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("date", "status"), name="sms_delivery_stats_date_status"
+                    )
+                ],
+            },
+        ),
+    ]
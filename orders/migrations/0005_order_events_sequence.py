@@ -0,0 +1,25 @@
+from django.db import migrations
+
+
+def create_sequence(apps, schema_editor):
+    # Only PostgresBroker uses the sequence; other backends run InMemoryBroker.
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE SEQUENCE IF NOT EXISTS order_events_id_seq")
+
+
+def drop_sequence(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP SEQUENCE IF EXISTS order_events_id_seq")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0004_order_sms_delivery"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_sequence, drop_sequence),
+    ]
@@ -13,6 +13,7 @@ class Order(models.Model):
         max_digits=10, decimal_places=2, validators=[MinValueValidator(Decimal("0.01"))]
     )
     order_time = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     status = models.CharField(
         max_length=20,
         choices=[
@@ -22,14 +23,65 @@ class Order(models.Model):
         ],
         default="PENDING",
     )
+    # Africa's Talking message id of the order confirmation SMS and the
+    # latest delivery status reported for it (see orders.delivery_reports).
+    sms_message_id = models.CharField(
+        max_length=64, null=True, blank=True, db_index=True
+    )
+    sms_status = models.CharField(max_length=20, null=True, blank=True)
+    sms_status_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         db_table = "orders"
         ordering = ["-order_time"]
         indexes = [
             models.Index(fields=["order_time"]),
-            models.Index(fields=["customer"]),
+            # Serves per-customer order listings in order_time order; the
+            # customer_id foreign key index already covers plain lookups.
+            models.Index(fields=["customer", "order_time"]),
+            # Keyset order for delta sync (see the sync app).
+            models.Index(fields=["updated_at", "id"]),
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._remember_stored_values()
+        return instance
+
+    def _remember_stored_values(self):
+        # Lets post_save receivers tell what a save changed.
+        self._loaded_status = self.__dict__.get("status")
+        self._loaded_amount = self.__dict__.get("amount")
+        self._loaded_customer_id = self.__dict__.get("customer_id")
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._remember_stored_values()
+
     def __str__(self):
         return f"Order {self.id} - {self.customer.name} - {self.amount}"
+
+
+class SMSDeliveryStat(models.Model):
+    """
+    Number of order confirmation SMSes sent on ``date`` that are currently
+    in ``status``. Kept up to date as delivery reports are applied, so
+    delivery rates can be read without scanning orders.
+    """
+
+    date = models.DateField()
+    status = models.CharField(max_length=20)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = "sms_delivery_stats"
+        ordering = ["date", "status"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["date", "status"], name="sms_delivery_stats_date_status"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.status}: {self.count}"
@@ -0,0 +1,25 @@
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+
+
+class OrderCursorPagination(CursorPagination):
+    """
+    Keyset pagination over orders, newest first. Pages are located with a
+    ``WHERE order_time < cursor`` seek on the (customer, order_time) index
+    instead of an OFFSET, so deep pages cost the same as the first one.
+    """
+
+    ordering = "-order_time"
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "status": "success",
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
@@ -0,0 +1,275 @@
+import gzip
+import os
+import re
+from datetime import date
+from typing import List, Optional
+
+from django.db import connection, transaction
+from django.db.migrations.executor import MigrationExecutor
+
+from .models import Order
+
+PARTITION_NAME_RE = re.compile(r"^orders_p(\d{4})(\d{2})$")
+LEGACY_TABLE = "orders_unpartitioned"
+# Catches rows outside the monthly partitions, so inserts never fail on
+# partition routing.
+DEFAULT_PARTITION = "orders_default"
+ID_SEQUENCE = "orders_partitioned_id_seq"
+
+
+class PartitioningError(Exception):
+    """Raised when the orders table cannot be (re)partitioned."""
+
+
+def month_start(value: date) -> date:
+    """Return the first day of the month containing ``value``."""
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    """Return the first day of the month ``months`` away from ``value``."""
+    index = value.year * 12 + (value.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"orders_p{month:%Y%m}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    """Parse the month out of a partition name, or None if it isn't one."""
+    match = PARTITION_NAME_RE.match(name)
+    if not match:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def create_partition_sql(month: date) -> str:
+    table = Order._meta.db_table
+    start = month_start(month)
+    end = add_months(start, 1)
+    return (
+        f'CREATE TABLE IF NOT EXISTS "{partition_name(start)}" '
+        f'PARTITION OF "{table}" '
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+
+
+def create_default_partition_sql() -> str:
+    return (
+        f'CREATE TABLE IF NOT EXISTS "{DEFAULT_PARTITION}" '
+        f'PARTITION OF "{Order._meta.db_table}" DEFAULT'
+    )
+
+
+def move_from_default_sql(month: date) -> List[str]:
+    """
+    Statements that create ``month``'s partition from rows that landed in
+    the default partition. Postgres can't create a partition while the
+    default one holds rows that belong in it, so they are copied into a
+    plain table which is then attached in their place.
+    """
+    table = Order._meta.db_table
+    name = partition_name(month)
+    start = month_start(month)
+    end = add_months(start, 1)
+    bounds = f"order_time >= '{start.isoformat()}' AND order_time < '{end.isoformat()}'"
+    return [
+        f'CREATE TABLE "{name}" (LIKE "{table}" INCLUDING DEFAULTS)',
+        f'INSERT INTO "{name}" SELECT * FROM "{DEFAULT_PARTITION}" WHERE {bounds}',
+        f'DELETE FROM "{DEFAULT_PARTITION}" WHERE {bounds}',
+        f'ALTER TABLE "{table}" ATTACH PARTITION "{name}" '
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')",
+    ]
+
+
+def _require_postgres():
+    if connection.vendor != "postgresql":
+        raise PartitioningError(
+            "Order partitioning requires PostgreSQL, "
+            f"current backend is {connection.vendor}"
+        )
+
+
+def is_partitioned() -> bool:
+    """Check whether the orders table is a partitioned table."""
+    _require_postgres()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relkind FROM pg_class c "
+            "JOIN pg_namespace n ON n.oid = c.relnamespace "
+            "WHERE c.relname = %s AND n.nspname = current_schema()",
+            [Order._meta.db_table],
+        )
+        row = cursor.fetchone()
+    return bool(row) and row[0] == "p"
+
+
+def list_partitions() -> List[str]:
+    """Return the names of the monthly partitions attached to orders."""
+    _require_postgres()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = %s ORDER BY c.relname",
+            [Order._meta.db_table],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def ensure_partitions(start: date, end: date) -> List[str]:
+    """
+    Create monthly partitions covering every month from ``start`` up to and
+    including ``end``. Returns the names of the partitions that were checked.
+    """
+    _require_postgres()
+    names = []
+    existing = set(list_partitions())
+    month = month_start(start)
+    with connection.cursor() as cursor:
+        cursor.execute(create_default_partition_sql())
+        while month <= month_start(end):
+            name = partition_name(month)
+            if name not in existing:
+                cursor.execute(
+                    f'SELECT 1 FROM "{DEFAULT_PARTITION}" '
+                    "WHERE order_time >= %s AND order_time < %s LIMIT 1",
+                    [month, add_months(month, 1)],
+                )
+                if cursor.fetchone():
+                    with transaction.atomic():
+                        for sql in move_from_default_sql(month):
+                            cursor.execute(sql)
+                else:
+                    cursor.execute(create_partition_sql(month))
+            names.append(name)
+            month = add_months(month, 1)
+    return names
+
+
+def detached_partitions() -> List[str]:
+    """
+    Return monthly partition tables that exist but are no longer attached
+    to orders, e.g. left behind by an interrupted archive run.
+    """
+    _require_postgres()
+    attached = set(list_partitions())
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_class c "
+            "JOIN pg_namespace n ON n.oid = c.relnamespace "
+            "WHERE c.relkind = 'r' AND n.nspname = current_schema() "
+            "ORDER BY c.relname"
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    return [
+        name
+        for name in names
+        if partition_month(name) is not None and name not in attached
+    ]
+
+
+def convert_to_partitioned(months_ahead: int = 3) -> None:
+    """
+    Rebuild the orders table as a table range-partitioned by month on
+    ``order_time``, copying the existing rows across.
+
+    Postgres requires the partition key in every unique constraint, so the
+    new primary key is ``(id, order_time)`` and the database no longer
+    enforces that ``id`` alone is unique. Ids stay unique as long as they
+    come from the table's sequence; rows inserted with explicit ids are
+    not checked against each other.
+
+    The table is rebuilt from the current model, so every migration must
+    be applied first. The foreign key and indexes get the names Django
+    generates, so later migrations find them as usual.
+    """
+    _require_postgres()
+    if is_partitioned():
+        raise PartitioningError("The orders table is already partitioned")
+    executor = MigrationExecutor(connection)
+    if executor.migration_plan(executor.loader.graph.leaf_nodes()):
+        raise PartitioningError(
+            "Apply all migrations before converting the orders table"
+        )
+
+    table = Order._meta.db_table
+
+    with connection.schema_editor() as schema_editor, connection.cursor() as cursor:
+        cursor.execute(f'LOCK TABLE "{table}" IN ACCESS EXCLUSIVE MODE')
+        cursor.execute(f'SELECT MIN(order_time), MAX(order_time) FROM "{table}"')
+        first, last = cursor.fetchone()
+
+        cursor.execute(f'ALTER TABLE "{table}" RENAME TO "{LEGACY_TABLE}"')
+        cursor.execute(
+            f'CREATE TABLE "{table}" (LIKE "{LEGACY_TABLE}" INCLUDING DEFAULTS) '
+            "PARTITION BY RANGE (order_time)"
+        )
+        cursor.execute(f'CREATE SEQUENCE "{ID_SEQUENCE}" OWNED BY "{table}".id')
+        cursor.execute(
+            f'ALTER TABLE "{table}" '
+            f"ALTER COLUMN id SET DEFAULT nextval('{ID_SEQUENCE}')"
+        )
+        cursor.execute(
+            f"SELECT setval('{ID_SEQUENCE}', "
+            f'COALESCE((SELECT MAX(id) FROM "{LEGACY_TABLE}"), 0) + 1, false)'
+        )
+
+        today = date.today()
+        ensure_partitions(
+            first.date() if first else today,
+            add_months(max(last.date() if last else today, today), months_ahead),
+        )
+        cursor.execute(f'INSERT INTO "{table}" SELECT * FROM "{LEGACY_TABLE}"')
+        # Frees the constraint and index names for the new table.
+        cursor.execute(f'DROP TABLE "{LEGACY_TABLE}"')
+
+        # The name Postgres gives a table's primary key, as in CREATE TABLE.
+        cursor.execute(
+            f'ALTER TABLE "{table}" ADD CONSTRAINT "{table}_pkey" '
+            "PRIMARY KEY (id, order_time)"
+        )
+        schema_editor.execute(
+            schema_editor._create_fk_sql(
+                Order,
+                Order._meta.get_field("customer"),
+                "_fk_%(to_table)s_%(to_column)s",
+            )
+        )
+        for sql in schema_editor._model_indexes_sql(Order):
+            schema_editor.execute(sql)
+
+
+def detach_partition(name: str) -> None:
+    _require_postgres()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'ALTER TABLE "{Order._meta.db_table}" DETACH PARTITION "{name}"'
+        )
+
+
+def drop_partition(name: str) -> None:
+    _require_postgres()
+    with connection.cursor() as cursor:
+        cursor.execute(f'DROP TABLE "{name}"')
+
+
+def archive_partition(name: str, archive_dir: str, drop: bool = True) -> str:
+    """
+    Dump a partition to a gzip-compressed CSV file in ``archive_dir`` and
+    optionally drop it. Returns the archive path.
+    """
+    _require_postgres()
+    os.makedirs(archive_dir, exist_ok=True)
+    path = os.path.join(archive_dir, f"{name}.csv.gz")
+
+    connection.ensure_connection()
+    with connection.cursor() as cursor, gzip.open(path, "wb") as archive:
+        cursor.cursor.copy_expert(
+            f'COPY "{name}" TO STDOUT WITH (FORMAT csv, HEADER true)', archive
+        )
+        if drop:
+            cursor.execute(f'DROP TABLE "{name}"')
+    return path
@@ -17,8 +17,9 @@ class OrderSerializer(serializers.ModelSerializer):
             "amount",
             "order_time",
             "status",
+            "sms_status",
         ]
-        read_only_fields = ["order_time", "status"]
+        read_only_fields = ["order_time", "status", "sms_status"]
 
     def validate_customer_code(self, value):
         try:
@@ -33,11 +34,14 @@ class OrderSerializer(serializers.ModelSerializer):
         order = Order.objects.create(customer=customer, **validated_data)
 
         # Send SMS notification
+        from .delivery_reports import record_sent
         from .services import SMSService
 
         sms_service = SMSService()
-        sms_service.send_order_confirmation(
+        message_id = sms_service.send_order_confirmation(
             customer.phone_number, order.id, order.amount
         )
+        if message_id:
+            record_sent(order, message_id)
 
         return order
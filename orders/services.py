@@ -1,16 +1,28 @@
-import africastalking
 from django.conf import settings
 from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class SMSService:
     def __init__(self):
         self.username = settings.AFRICASTALKING_USERNAME
         self.api_key = settings.AFRICASTALKING_API_KEY
+        self._sms = None
+
+    @property
+    def sms(self):
+        """
+        Africa's Talking SMS client, initialized on first use so the SDK
+        isn't imported until a message is actually sent.
+        """
+        if self._sms is None:
+            import africastalking
 
-        # Initialize Africa's Talking
-        africastalking.initialize(self.username, self.api_key)
-        self.sms = africastalking.SMS
+            africastalking.initialize(self.username, self.api_key)
+            self._sms = africastalking.SMS
+        return self._sms
 
     def send_order_confirmation(
         self, phone_number: str, order_id: int, amount: float
@@ -23,6 +35,5 @@ class SMSService:
             response = self.sms.send(message, [phone_number])
             return response["SMSMessageData"]["Recipients"][0]["messageId"]
         except Exception as e:
-            # Log the error in production
-            print(f"Error sending SMS: {str(e)}")
+            logger.error("Error sending SMS: %s", e)
             return None
@@ -0,0 +1,91 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.query_cache import invalidate_table
+from customers import counters
+from customers.models import Customer
+
+from .events import ORDER_CREATED, ORDER_STATUS_CHANGED, publish_on_commit
+from .models import Order
+
+
+def order_event_data(order):
+    return {
+        "order_id": order.pk,
+        "customer_id": order.customer_id,
+        "item": order.item,
+        "amount": str(order.amount),
+        "status": order.status,
+        "order_time": order.order_time.isoformat(),
+    }
+
+
+@receiver(post_save, sender=Order)
+def publish_order_event(sender, instance, created, **kwargs):
+    """Publish order-created and status-changed events to stream subscribers."""
+    if created:
+        publish_on_commit(ORDER_CREATED, order_event_data(instance))
+    elif instance.status != getattr(instance, "_loaded_status", instance.status):
+        data = order_event_data(instance)
+        data["previous_status"] = instance._loaded_status
+        publish_on_commit(ORDER_STATUS_CHANGED, data)
+
+
+@receiver(post_save, sender=Order)
+@receiver(post_delete, sender=Order)
+def invalidate_cached_queries(sender, instance, **kwargs):
+    """Drop cached query results that read the orders table."""
+    invalidate_table(Order._meta.db_table)
+
+
+@receiver(post_save, sender=Order)
+def update_customer_counters(sender, instance, created, **kwargs):
+    """Keep the customer's order counters in step with its orders."""
+    counted = counters.counts_towards_totals(instance.status)
+    if created:
+        if counted:
+            counters.add_order(
+                instance.customer_id, instance.amount, instance.order_time
+            )
+        return
+
+    was_counted = counters.counts_towards_totals(
+        getattr(instance, "_loaded_status", instance.status)
+    )
+    previous_amount = getattr(instance, "_loaded_amount", instance.amount)
+    previous_customer_id = getattr(
+        instance, "_loaded_customer_id", instance.customer_id
+    )
+    if previous_customer_id != instance.customer_id:
+        # Moved to another customer: take it off the old one's counters and
+        # put it on the new one's together.
+        with transaction.atomic():
+            if was_counted:
+                counters.remove_order(
+                    previous_customer_id, previous_amount, instance.order_time
+                )
+            if counted:
+                counters.add_order(
+                    instance.customer_id, instance.amount, instance.order_time
+                )
+        return
+    if counted and not was_counted:
+        counters.add_order(instance.customer_id, instance.amount, instance.order_time)
+    elif was_counted and not counted:
+        counters.remove_order(
+            instance.customer_id, previous_amount, instance.order_time
+        )
+    elif counted and instance.amount != previous_amount:
+        counters.adjust_spent(instance.customer_id, instance.amount - previous_amount)
+
+
+@receiver(post_delete, sender=Order)
+def remove_from_customer_counters(sender, instance, origin=None, **kwargs):
+    # Orders deleted along with their customer have no counters to update.
+    if isinstance(origin, Customer):
+        return
+    if counters.counts_towards_totals(instance.status):
+        counters.remove_order(
+            instance.customer_id, instance.amount, instance.order_time
+        )
@@ -0,0 +1,186 @@
+import asyncio
+import hmac
+import logging
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from core.authentication.drf import OIDCAuthentication
+from rest_framework.exceptions import APIException
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .events import get_broker
+
+logger = logging.getLogger(__name__)
+
+
+TOKEN_SALT = "orders.streaming"
+
+
+def authenticate(request):
+    """Authenticate a plain Django request the way the API views do."""
+    return Request(request, authenticators=[OIDCAuthentication()]).user
+
+
+def issue_stream_token(user) -> str:
+    return signing.dumps({"user": user.pk}, salt=TOKEN_SALT)
+
+
+def token_user(token: str):
+    """
+    Return the active user a stream token was issued to, or None if the
+    token is invalid or older than ``ORDER_EVENTS_TOKEN_MAX_AGE`` seconds.
+    """
+    try:
+        payload = signing.loads(
+            token, salt=TOKEN_SALT, max_age=settings.ORDER_EVENTS_TOKEN_MAX_AGE
+        )
+    except signing.BadSignature:
+        return None
+    return get_user_model().objects.filter(pk=payload["user"], is_active=True).first()
+
+
+def has_api_key(request) -> bool:
+    api_key = request.headers.get("X-API-Key", "")
+    return bool(settings.API_KEY) and hmac.compare_digest(api_key, settings.API_KEY)
+
+
+class OrderEventTokenView(APIView):
+    authentication_classes = [OIDCAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        """
+        Issue a short-lived token for the order event stream.
+
+        Browsers' EventSource can't send the X-API-Key and Authorization
+        headers, so it passes this token as ``?token=`` instead.
+
+        Returns:
+            Response: The token and the number of seconds it stays valid
+        """
+        return Response(
+            {
+                "status": "success",
+                "token": issue_stream_token(request.user),
+                "expires_in": settings.ORDER_EVENTS_TOKEN_MAX_AGE,
+            }
+        )
+
+
+async def event_stream(broker, **subscribe_kwargs):
+    # Subscribing inside the generator ties the subscription's lifetime to
+    # the response: it is released when the client disconnects.
+    subscription = broker.subscribe(**subscribe_kwargs)
+    try:
+        # Ask clients to reconnect quickly after the stream is cut off.
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.get(),
+                    timeout=settings.ORDER_EVENTS_KEEPALIVE_SECONDS,
+                )
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if event is None:
+                logger.warning("Closing order event stream for a slow consumer")
+                return
+            yield event.to_sse()
+    finally:
+        broker.unsubscribe(subscription)
+
+
+async def order_event_stream(request):
+    """
+    Stream order-created and status-changed events as Server-Sent Events.
+
+    Callers authenticate with the X-API-Key and Authorization headers like
+    other API endpoints, or with a token from OrderEventTokenView.
+
+    Query Parameters:
+        token: Stream token, for clients that can't send headers
+        customer_id: Only send events for this customer
+        status: Only send events for orders in this status
+
+    Headers:
+        Last-Event-ID: Resume after this event id, replaying recent events
+
+    Returns:
+        StreamingHttpResponse: A text/event-stream of order events
+    """
+    if not isinstance(request, ASGIRequest):
+        # A WSGI server would iterate the endless stream synchronously and
+        # tie up a worker for as long as the client stays connected.
+        return JsonResponse(
+            {
+                "status": "error",
+                "message": "The event stream is only served by core.asgi:application",
+            },
+            status=501,
+        )
+    if request.method != "GET":
+        return JsonResponse(
+            {"status": "error", "message": "Method not allowed"}, status=405
+        )
+    # The path is exempt from ApiKeyMiddleware so that a token can stand in
+    # for the API key.
+    token = request.GET.get("token")
+    if token:
+        user = await sync_to_async(token_user)(token)
+        if user is None:
+            return JsonResponse(
+                {"status": "error", "message": "Invalid or expired stream token"},
+                status=401,
+            )
+    elif not has_api_key(request):
+        return JsonResponse({"error": "Invalid or missing API key"}, status=403)
+    else:
+        try:
+            user = await sync_to_async(authenticate)(request)
+        except APIException as e:
+            return JsonResponse(
+                {"status": "error", "message": str(e.detail)}, status=e.status_code
+            )
+    if not user or not user.is_authenticated:
+        return JsonResponse(
+            {
+                "status": "error",
+                "message": "Authentication credentials were not provided.",
+            },
+            status=401,
+        )
+
+    try:
+        customer_id = request.GET.get("customer_id")
+        customer_id = int(customer_id) if customer_id else None
+        last_event_id = request.headers.get("Last-Event-ID") or request.GET.get(
+            "last_event_id"
+        )
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        return JsonResponse(
+            {
+                "status": "error",
+                "message": "customer_id and Last-Event-ID must be integers",
+            },
+            status=400,
+        )
+
+    stream = event_stream(
+        get_broker(),
+        last_event_id=last_event_id,
+        customer_id=customer_id,
+        status=request.GET.get("status"),
+    )
+    response = StreamingHttpResponse(stream, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
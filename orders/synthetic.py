@@ -0,0 +1,143 @@
+"""
+Deterministic synthetic customers and orders for load testing.
+
+This module deliberately avoids Django imports so generator processes can
+run it without setting Django up. Every chunk is derived from the seed and
+its chunk index alone, so the generated data does not depend on how many
+worker processes produce it or in which order they finish.
+"""
+
+import itertools
+import random
+from datetime import timedelta
+
+# fmt: off
+FIRST_NAMES = [
+    "Amina", "Brian", "Cynthia", "David", "Esther", "Faith", "George", "Halima",
+    "Ian", "Joy", "Kevin", "Lilian", "Moses", "Njeri", "Otieno", "Purity",
+    "Quincy", "Rose", "Samuel", "Tabitha", "Umar", "Violet", "Wanjiru", "Zawadi",
+]
+LAST_NAMES = [
+    "Achieng", "Barasa", "Chebet", "Kamau", "Kariuki", "Kiprop", "Mwangi",
+    "Mutua", "Njoroge", "Ochieng", "Odhiambo", "Omondi", "Onyango", "Wafula",
+    "Wambui", "Wekesa",
+]
+ITEMS = [
+    "Maize Flour 2kg", "Cooking Oil 1L", "Sugar 1kg", "Rice 5kg", "Tea Leaves",
+    "Milk 500ml", "Bread Loaf", "Eggs Tray", "Soap Bar", "Detergent 1kg",
+    "Phone Charger", "Earphones", "Solar Lamp", "Water Filter", "School Bag",
+    "Exercise Books", "Gas Refill 6kg", "Blanket", "Mosquito Net", "Jerrycan 20L",
+]
+
+# Relative order volume per hour of day: quiet nights, a morning ramp, a
+# lunch peak and an evening peak.
+HOUR_WEIGHTS = [
+    1, 1, 1, 1, 2, 4, 7, 9, 10, 12, 14, 12,
+    9, 8, 9, 11, 13, 14, 11, 7, 4, 3, 2, 1,
+]
+STATUSES = ["COMPLETED", "PENDING", "CANCELLED"]
+STATUS_WEIGHTS = [75, 15, 10]
+# fmt: on
+
+# Order amounts follow a log-normal distribution with a median of ~800.
+AMOUNT_MU = 6.7
+AMOUNT_SIGMA = 1.1
+MAX_AMOUNT = 99_999_999.99
+
+
+def chunk_rng(seed, kind, index):
+    return random.Random(f"{seed}:{kind}:{index}")
+
+
+def customer_code(prefix, index):
+    return f"{prefix}{index:08d}"
+
+
+def generate_customers(seed, prefix, start, count, now):
+    """
+    Return ``(name, code, phone_number, created_at)`` tuples for customers
+    ``start`` to ``start + count - 1``.
+    """
+    rng = chunk_rng(seed, "customers", start)
+    rows = []
+    for index in range(start, start + count):
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        phone = f"+2547{rng.randrange(10**8):08d}"
+        created_at = now - timedelta(seconds=rng.randrange(3 * 365 * 86400))
+        rows.append((name, customer_code(prefix, index), phone, created_at))
+    return rows
+
+
+def zipf_cum_weights(count, exponent):
+    """Cumulative weights of a Zipf distribution over ``count`` ranks."""
+    return list(
+        itertools.accumulate(1.0 / (rank**exponent) for rank in range(1, count + 1))
+    )
+
+
+class OrderGenerator:
+    """
+    Builds order chunks for a fixed set of customers. ``customer_ids`` are
+    shuffled with the seed before being assigned Zipf ranks, so the busiest
+    customers are spread across the table.
+    """
+
+    def __init__(self, seed, customer_ids, start, days, skew):
+        self.seed = seed
+        self.customer_ids = list(customer_ids)
+        random.Random(f"{seed}:ranks").shuffle(self.customer_ids)
+        self.cum_weights = zipf_cum_weights(len(self.customer_ids), skew)
+        self.start = start
+        self.days = days
+
+    def generate(self, index, count):
+        """
+        Return ``(customer_id, item, amount, order_time, status)`` tuples for
+        order chunk ``index``.
+        """
+        rng = chunk_rng(self.seed, "orders", index)
+        customers = rng.choices(
+            self.customer_ids, cum_weights=self.cum_weights, k=count
+        )
+        hours = rng.choices(range(24), weights=HOUR_WEIGHTS, k=count)
+        statuses = rng.choices(STATUSES, weights=STATUS_WEIGHTS, k=count)
+        rows = []
+        for customer_id, hour, status in zip(customers, hours, statuses):
+            order_time = self.start + timedelta(
+                days=rng.randrange(self.days),
+                hours=hour,
+                seconds=rng.randrange(3600),
+                microseconds=rng.randrange(1_000_000),
+            )
+            amount = min(
+                max(round(rng.lognormvariate(AMOUNT_MU, AMOUNT_SIGMA), 2), 0.01),
+                MAX_AMOUNT,
+            )
+            rows.append(
+                (customer_id, rng.choice(ITEMS), f"{amount:.2f}", order_time, status)
+            )
+        return rows
+
+
+_generator = None
+
+
+def init_order_worker(seed, customer_ids, start, days, skew):
+    """Pool initializer: build the per-process order generator once."""
+    global _generator
+    _generator = OrderGenerator(seed, customer_ids, start, days, skew)
+
+
+def order_chunk(args):
+    index, count = args
+    return _generator.generate(index, count)
+
+
+def customer_chunk(args):
+    seed, prefix, start, count, now = args
+    return generate_customers(seed, prefix, start, count, now)
+
+
+def chunks(total, size):
+    """Split ``total`` rows into ``(index, count)`` chunks of ``size``."""
+    return [(i, min(size, total - i * size)) for i in range((total + size - 1) // size)]
@@ -0,0 +1,65 @@
+import pytest
+from datetime import datetime, timezone
+from decimal import Decimal
+from django.test import Client
+from django.urls import reverse
+from customers.models import Customer
+from orders.models import Order
+
+
+@pytest.mark.django_db
+class TestOrderAdmin:
+    @pytest.fixture
+    def client(self, settings, admin_user):
+        settings.API_KEY = "test-key"
+        settings.OIDC_OP_JWKS_ENDPOINT = "https://oidc.example.com/jwks"
+        client = Client(HTTP_X_API_KEY="test-key")
+        client.force_login(admin_user)
+        return client
+
+    def create_orders(self, count, start=0):
+        for i in range(start, start + count):
+            customer = Customer.objects.create(
+                name=f"Customer {i}", code=f"AD{i}", phone_number="+254722000000"
+            )
+            order = Order.objects.create(
+                customer=customer, item="Item", amount=Decimal("10.00")
+            )
+            Order.objects.filter(pk=order.pk).update(
+                order_time=datetime(2023 + i % 3, 6, 1, tzinfo=timezone.utc)
+            )
+
+    def test_changelist_queries_do_not_grow_with_rows(
+        self, client, django_assert_max_num_queries
+    ):
+        url = reverse("admin:orders_order_changelist")
+        self.create_orders(2)
+        with django_assert_max_num_queries(20) as few:
+            assert client.get(url).status_code == 200
+        self.create_orders(10, start=2)
+        with django_assert_max_num_queries(len(few.captured_queries)):
+            response = client.get(url)
+        assert response.status_code == 200
+        assert "2025" in response.content.decode()
+
+    def test_search_matches_customer_code_prefix(self, client):
+        self.create_orders(3)
+        url = reverse("admin:orders_order_changelist")
+        response = client.get(url, {"q": "ad1"})
+        assert list(
+            response.context["cl"].result_list.values_list("customer__code", flat=True)
+        ) == ["AD1"]
+
+    def test_customer_autocomplete_uses_prefix_search(self, client):
+        self.create_orders(3)
+        response = client.get(
+            reverse("admin:autocomplete"),
+            {
+                "term": "ad2",
+                "app_label": "orders",
+                "model_name": "order",
+                "field_name": "customer",
+            },
+        )
+        assert response.status_code == 200
+        assert [r["text"] for r in response.json()["results"]] == ["AD2 - Customer 2"]
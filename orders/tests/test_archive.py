@@ -0,0 +1,186 @@
+import pytest
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from customers.counters import reconcile
+from customers.models import Customer
+from orders.archive import (
+    OrderArchive,
+    archive_name,
+    get_archive_store,
+    write_archive,
+)
+from orders.models import Order
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+class TestOrderArchive:
+    ROWS = [
+        (1, 10, "ALICE", "Tea", Decimal("10.00"), utc(2024, 1, 2, 8), "COMPLETED"),
+        (3, 11, "BOB", "Sugar", Decimal("2.50"), utc(2024, 1, 5, 9), "CANCELLED"),
+        (2, 10, "ALICE", "Tea", Decimal("7.25"), utc(2024, 1, 9, 10), "PENDING"),
+    ]
+
+    @pytest.fixture
+    def archive(self, tmp_path):
+        path = tmp_path / archive_name(date(2024, 1, 1))
+        assert write_archive(str(path), date(2024, 1, 1), self.ROWS) == 3
+        archive = OrderArchive(str(path))
+        yield archive
+        archive.close()
+
+    def test_round_trip(self, archive):
+        assert archive.period == "2024-01"
+        assert len(archive) == 3
+        assert [tuple(row.values()) for row in archive.rows()] == self.ROWS
+        # Strings are stored once in each column's dictionary.
+        assert archive.dictionary("item") == ["Tea", "Sugar"]
+        assert archive.column("item").itemsize == 1
+
+    def test_rows_by_time_range_and_customer(self, archive):
+        rows = archive.rows(utc(2024, 1, 5), utc(2024, 1, 9, 10))
+        assert [row["id"] for row in rows] == [3]
+        rows = archive.rows(customer_code="ALICE")
+        assert [row["id"] for row in rows] == [1, 2]
+        assert list(archive.rows(customer_code="CAROL")) == []
+
+    def test_totals(self, archive):
+        assert archive.totals(end=utc(2024, 1, 6)) == {
+            "COMPLETED": {"count": 1, "amount": Decimal("10.00")},
+            "CANCELLED": {"count": 1, "amount": Decimal("2.50")},
+        }
+
+    def test_overlaps(self, archive):
+        assert archive.overlaps(utc(2024, 1, 9), utc(2024, 2, 1))
+        assert not archive.overlaps(utc(2024, 1, 10), None)
+        assert not archive.overlaps(None, utc(2024, 1, 2, 8))
+
+
+@pytest.mark.django_db
+class TestArchiveOrdersCommand:
+    @pytest.fixture(autouse=True)
+    def archive_dir(self, settings, tmp_path):
+        settings.ORDERS_ARCHIVE_DIR = str(tmp_path)
+        return tmp_path
+
+    @pytest.fixture
+    def customer(self):
+        return Customer.objects.create(
+            name="Test Customer", code="TEST123", phone_number="+254722000000"
+        )
+
+    def create_order(self, customer, amount, order_time, **fields):
+        order = Order.objects.create(
+            customer=customer, item="Test Item", amount=Decimal(amount), **fields
+        )
+        Order.objects.filter(pk=order.pk).update(order_time=order_time)
+        return order
+
+    @pytest.fixture
+    def orders(self, customer):
+        old = [
+            self.create_order(customer, "10.00", utc(2024, 1, 3)),
+            self.create_order(customer, "5.00", utc(2024, 1, 20), status="CANCELLED"),
+        ]
+        recent = self.create_order(customer, "1.00", datetime.now(timezone.utc))
+        # Moving order_time with update() skips the counter signals.
+        reconcile(fix=True)
+        return old, recent
+
+    def test_archive_without_prune_keeps_orders(self, orders, archive_dir):
+        call_command("archive_orders", "--older-than", "1")
+        assert Order.objects.count() == 3
+        archive = OrderArchive(str(archive_dir / archive_name(date(2024, 1, 1))))
+        assert [row["id"] for row in archive.rows()] == [o.pk for o in orders[0]]
+        archive.close()
+
+    def test_prune_keeps_counters_and_archive_is_merged(
+        self, customer, orders, archive_dir
+    ):
+        call_command("archive_orders", "--older-than", "1", "--prune")
+        assert list(Order.objects.all()) == [orders[1]]
+        customer.refresh_from_db()
+        assert (customer.order_count, customer.total_spent) == (2, Decimal("11.00"))
+        assert reconcile() == []
+
+        late = self.create_order(customer, "3.00", utc(2024, 1, 25))
+        call_command("archive_orders", "--older-than", "1", "--prune")
+        archive = get_archive_store().archives()[0]
+        assert [row["id"] for row in archive.rows()] == [
+            orders[0][0].pk,
+            orders[0][1].pk,
+            late.pk,
+        ]
+
+    def test_late_order_in_pruned_month_keeps_archive_counted(self, customer, orders):
+        call_command("archive_orders", "--older-than", "1", "--prune")
+        self.create_order(customer, "3.00", utc(2024, 1, 25))
+        # Only last_order_at is off, since order_time was moved by update().
+        reconcile(fix=True)
+        customer.refresh_from_db()
+        assert (customer.order_count, customer.total_spent) == (3, Decimal("14.00"))
+        assert reconcile() == []
+
+    def test_list_includes_archived_orders(
+        self, customer, orders, settings, django_user_model
+    ):
+        cache.clear()
+        settings.API_KEY = "test-key"
+        settings.OIDC_OP_JWKS_ENDPOINT = "https://oidc.example.com/jwks"
+        client = APIClient()
+        client.force_authenticate(django_user_model.objects.create_user("tester"))
+        client.credentials(HTTP_X_API_KEY="test-key")
+        url = reverse("order-list-create")
+        params = {"start_date": "2024-01-01", "end_date": "2024-01-10"}
+
+        live = client.get(url, params).data["results"]
+        call_command("archive_orders", "--older-than", "1")
+        response = client.get(url, {**params, "include_archived": "true"})
+        # Archived but not pruned: listed once.
+        assert response.data["results"] == live
+
+        call_command("archive_orders", "--older-than", "1", "--prune")
+        response = client.get(url, params)
+        assert response.data["results"] == []
+
+        # Pruned orders read back from the archive look like live ones.
+        response = client.get(url, {**params, "include_archived": "true"})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 1
+        assert response.data["results"] == live
+        assert live[0]["id"] == orders[0][0].pk
+
+    def test_archived_orders_are_paged_after_live_ones(
+        self, customer, orders, settings, django_user_model
+    ):
+        cache.clear()
+        settings.API_KEY = "test-key"
+        settings.OIDC_OP_JWKS_ENDPOINT = "https://oidc.example.com/jwks"
+        client = APIClient()
+        client.force_authenticate(django_user_model.objects.create_user("tester"))
+        client.credentials(HTTP_X_API_KEY="test-key")
+        call_command("archive_orders", "--older-than", "1", "--prune")
+        late = self.create_order(customer, "3.00", utc(2024, 1, 25))
+
+        url = reverse("order-list-create")
+        params = {
+            "start_date": "2024-01-01",
+            "end_date": "2024-01-31",
+            "include_archived": "true",
+            "limit": 1,
+        }
+        pages = [client.get(url, {**params, "offset": i}).data for i in range(3)]
+        assert [page["count"] for page in pages] == [3, 3, 3]
+        assert [page["has_more"] for page in pages] == [True, True, False]
+        assert [page["results"][0]["id"] for page in pages] == [
+            late.pk,
+            orders[0][0].pk,
+            orders[0][1].pk,
+        ]
@@ -0,0 +1,108 @@
+import pytest
+from decimal import Decimal
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from customers.models import Customer
+from orders import delivery_reports
+from orders.delivery_reports import DeliveryReportBuffer, record_sent
+from orders.models import Order, SMSDeliveryStat
+
+
+@pytest.mark.django_db
+class TestDeliveryReports:
+    @pytest.fixture
+    def orders(self):
+        customer = Customer.objects.create(
+            name="Test Customer", code="TEST123", phone_number="+254722000000"
+        )
+        orders = []
+        for i in range(3):
+            order = Order.objects.create(
+                customer=customer, item=f"Item {i}", amount=Decimal("10.00")
+            )
+            record_sent(order, f"ATXid_{i}")
+            orders.append(order)
+        return orders
+
+    @pytest.fixture
+    def buffer(self, monkeypatch):
+        buffer = DeliveryReportBuffer(batch_size=100, background=False)
+        monkeypatch.setattr(delivery_reports, "_buffer", buffer)
+        return buffer
+
+    def stats(self):
+        return dict(SMSDeliveryStat.objects.values_list("status", "count"))
+
+    def test_sent_messages_are_counted(self, orders):
+        assert Order.objects.get(pk=orders[0].pk).sms_message_id == "ATXid_0"
+        assert self.stats() == {"Sent": 3}
+
+    def test_flush_applies_batched_updates(self, orders, buffer):
+        buffer.add("ATXid_0", "Success")
+        buffer.add("ATXid_1", "Buffered")
+        buffer.add("ATXid_1", "Failed")
+        buffer.add("ATXid_2", "Success")
+        buffer.add("unknown", "Success")
+        # A pending report arriving after a final one is ignored.
+        buffer.add("ATXid_0", "Submitted")
+        assert len(buffer) == 4
+
+        with CaptureQueriesContext(connection) as queries:
+            assert buffer.flush() == 3
+        # One UPDATE per distinct status, not one per report.
+        updates = [q for q in queries if q["sql"].startswith('UPDATE "orders"')]
+        assert len(updates) == 2
+        statuses = dict(Order.objects.values_list("sms_message_id", "sms_status"))
+        assert statuses == {
+            "ATXid_0": "Success",
+            "ATXid_1": "Failed",
+            "ATXid_2": "Success",
+        }
+        assert self.stats() == {"Sent": 0, "Success": 2, "Failed": 1}
+        assert len(buffer) == 0
+
+    def test_full_buffer_refuses_new_messages(self):
+        buffer = DeliveryReportBuffer(max_buffered=3, background=False)
+        for i in range(3):
+            assert buffer.add(f"ATXid_{i}", "Sent")
+        assert not buffer.add("ATXid_9", "Success")
+        assert buffer.add("ATXid_0", "Success")
+
+    def test_callback_requires_token(self, settings, buffer):
+        settings.API_KEY = "test-key"
+        settings.SMS_CALLBACK_TOKEN = "secret"
+        client = APIClient()
+        url = reverse("sms-delivery-reports")
+        data = {"id": "ATXid_0", "status": "Success"}
+
+        response = client.post(f"{url}?token=wrong", data)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+        response = client.post(f"{url}?token=secret", data)
+        assert response.status_code == status.HTTP_200_OK
+        assert len(buffer) == 1
+
+        response = client.post(f"{url}?token=secret", {"id": "x", "status": "Bogus"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_delivery_stats(self, settings, django_user_model, orders, buffer):
+        cache.clear()
+        settings.API_KEY = "test-key"
+        settings.OIDC_OP_JWKS_ENDPOINT = "https://oidc.example.com/jwks"
+        buffer.add("ATXid_0", "Success")
+        buffer.flush()
+
+        client = APIClient()
+        client.force_authenticate(django_user_model.objects.create_user("tester"))
+        client.credentials(HTTP_X_API_KEY="test-key")
+        response = client.get(reverse("sms-delivery-stats"))
+        assert response.status_code == status.HTTP_200_OK
+        [day] = response.data["results"]
+        assert day["date"] == timezone.localdate(orders[0].order_time)
+        assert (day["sent"], day["delivered"], day["pending"]) == (3, 1, 2)
+        assert day["delivery_rate"] == 0.3333
@@ -0,0 +1,144 @@
+import asyncio
+import pytest
+from decimal import Decimal
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from orders.events import ORDER_CREATED, ORDER_STATUS_CHANGED, InMemoryBroker
+from orders.models import Order
+from customers.models import Customer
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, timeout=5))
+
+
+class TestInMemoryBroker:
+    def test_subscriber_receives_matching_events(self):
+        broker = InMemoryBroker()
+
+        async def scenario():
+            subscription = broker.subscribe(customer_id=1)
+            broker.publish(ORDER_CREATED, {"customer_id": 2})
+            event = broker.publish(ORDER_CREATED, {"customer_id": 1})
+            return event, await subscription.get()
+
+        published, received = run(scenario())
+        assert received == published
+
+    def test_resume_replays_events_after_last_event_id(self):
+        broker = InMemoryBroker()
+        first = broker.publish(ORDER_CREATED, {"order_id": 1})
+        second = broker.publish(ORDER_CREATED, {"order_id": 2})
+
+        async def scenario():
+            subscription = broker.subscribe(last_event_id=first.id)
+            return await subscription.get()
+
+        assert run(scenario()) == second
+
+    def test_slow_consumer_is_cut_off(self, settings):
+        settings.ORDER_EVENTS_QUEUE_SIZE = 2
+        broker = InMemoryBroker()
+
+        async def scenario():
+            subscription = broker.subscribe()
+            for i in range(5):
+                broker.publish(ORDER_CREATED, {"order_id": i})
+            await asyncio.sleep(0)
+            return [await subscription.get() for _ in range(3)], subscription
+
+        received, subscription = run(scenario())
+        assert [e.data["order_id"] for e in received[:2]] == [0, 1]
+        assert received[2] is None
+        assert subscription.overflowed
+
+
+@pytest.mark.django_db
+class TestOrderEventSignals:
+    def test_status_change_publishes_event(self, settings, monkeypatch):
+        published = []
+        monkeypatch.setattr(
+            "orders.signals.publish_on_commit",
+            lambda event_type, data: published.append((event_type, data)),
+        )
+        customer = Customer.objects.create(
+            name="Test Customer", code="TEST123", phone_number="+254722000000"
+        )
+        order = Order.objects.create(
+            customer=customer, item="Test Item", amount=Decimal("100.00")
+        )
+        order.item = "Renamed"
+        order.save()
+        order = Order.objects.get(pk=order.pk)
+        order.status = "COMPLETED"
+        order.save()
+
+        assert [event_type for event_type, _ in published] == [
+            ORDER_CREATED,
+            ORDER_STATUS_CHANGED,
+        ]
+        assert published[1][1]["previous_status"] == "PENDING"
+
+    def test_publish_failure_does_not_fail_the_order(
+        self,
+        settings,
+        monkeypatch,
+        django_user_model,
+        django_capture_on_commit_callbacks,
+    ):
+        class FailingBroker:
+            def publish(self, event_type, data):
+                raise RuntimeError("NOTIFY failed")
+
+        monkeypatch.setattr("orders.events.get_broker", FailingBroker)
+        monkeypatch.setattr(
+            "orders.services.SMSService.send_order_confirmation",
+            lambda self, *args: None,
+        )
+        settings.API_KEY = "test-key"
+        settings.OIDC_OP_JWKS_ENDPOINT = "https://oidc.example.com/jwks"
+        client = APIClient()
+        client.force_authenticate(django_user_model.objects.create_user("tester"))
+        Customer.objects.create(
+            name="Test Customer", code="TEST123", phone_number="+254722000000"
+        )
+        with django_capture_on_commit_callbacks(execute=True):
+            response = client.post(
+                reverse("order-list-create"),
+                {"customer_code": "TEST123", "item": "Test Item", "amount": "100.00"},
+                format="json",
+                HTTP_X_API_KEY="test-key",
+            )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert Order.objects.count() == 1
+
+
+class TestOrderEventStream:
+    def test_rejected_under_wsgi(self, settings, client):
+        settings.API_KEY = "test-key"
+        response = client.get("/api/orders/events/", HTTP_X_API_KEY="test-key")
+        assert response.status_code == 501
+        assert response.json()["status"] == "error"
+
+    @pytest.mark.django_db(transaction=True)
+    def test_browser_token_stands_in_for_headers(self, settings, django_user_model):
+        settings.API_KEY = "test-key"
+        settings.OIDC_OP_JWKS_ENDPOINT = "https://oidc.example.com/jwks"
+        user = django_user_model.objects.create_user("tester")
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.post(reverse("order-events-token"), HTTP_X_API_KEY="test-key")
+        assert response.status_code == status.HTTP_200_OK
+        token = response.data["token"]
+
+        async def connect(**params):
+            response = await AsyncClient().get(reverse("order-events"), params)
+            if response.streaming:
+                await response.streaming_content.aclose()
+            return response
+
+        assert run(connect(token=token)).status_code == 200
+        assert run(connect(token=token + "x")).status_code == 401
+        assert run(connect()).status_code == 403
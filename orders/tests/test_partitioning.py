@@ -0,0 +1,93 @@
+import pytest
+from datetime import date
+from decimal import Decimal
+from django.core.management import call_command
+from django.db import connection, models
+from customers.models import Customer
+from orders.models import Order
+from orders.partitioning import (
+    add_months,
+    convert_to_partitioned,
+    create_default_partition_sql,
+    create_partition_sql,
+    is_partitioned,
+    month_start,
+    move_from_default_sql,
+    partition_month,
+    partition_name,
+)
+
+
+class TestPartitionHelpers:
+    def test_add_months_crosses_year_boundaries(self):
+        assert add_months(date(2024, 11, 20), 3) == date(2025, 2, 1)
+        assert add_months(date(2025, 1, 1), -1) == date(2024, 12, 1)
+
+    def test_partition_name_round_trip(self):
+        month = month_start(date(2025, 3, 17))
+        assert partition_name(month) == "orders_p202503"
+        assert partition_month("orders_p202503") == date(2025, 3, 1)
+        assert partition_month("orders_default") is None
+
+    def test_create_partition_sql_covers_one_month(self):
+        sql = create_partition_sql(date(2024, 12, 5))
+        assert '"orders_p202412" PARTITION OF "orders"' in sql
+        assert "FROM ('2024-12-01') TO ('2025-01-01')" in sql
+
+    def test_default_partition_catches_other_months(self):
+        assert create_default_partition_sql().endswith(
+            '"orders_default" PARTITION OF "orders" DEFAULT'
+        )
+
+    def test_move_from_default_attaches_filled_partition(self):
+        create, insert, delete, attach = move_from_default_sql(date(2025, 2, 9))
+        assert create.startswith('CREATE TABLE "orders_p202502" (LIKE "orders"')
+        assert 'FROM "orders_default"' in insert and 'FROM "orders_default"' in delete
+        assert "order_time < '2025-03-01'" in delete
+        assert attach.endswith("FOR VALUES FROM ('2025-02-01') TO ('2025-03-01')")
+
+
+def table_constraints():
+    with connection.cursor() as cursor:
+        return set(connection.introspection.get_constraints(cursor, "orders"))
+
+
+@pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="Partitioning requires PostgreSQL"
+)
+@pytest.mark.django_db
+class TestConvertToPartitioned:
+    def test_conversion_keeps_django_names_for_later_migrations(self):
+        customer = Customer.objects.create(
+            name="Test Customer", code="TEST123", phone_number="+254722000000"
+        )
+        order = Order.objects.create(
+            customer=customer, item="Test Item", amount=Decimal("1.00")
+        )
+        names = table_constraints()
+
+        convert_to_partitioned()
+        assert is_partitioned()
+        assert table_constraints() == names
+
+        call_command("migrate", "orders", "0004", verbosity=0)
+        call_command("migrate", "orders", verbosity=0)
+        # What an AlterField on customer does: find the foreign key by
+        # introspection, drop it, then add it back under Django's name.
+        field = Order._meta.get_field("customer")
+        relaxed = models.ForeignKey(
+            Customer,
+            on_delete=models.CASCADE,
+            related_name="orders",
+            db_constraint=False,
+        )
+        relaxed.set_attributes_from_name("customer")
+        relaxed.model = Order
+        with connection.schema_editor() as schema_editor:
+            schema_editor.alter_field(Order, field, relaxed)
+            schema_editor.alter_field(Order, relaxed, field)
+        assert table_constraints() == names
+
+        assert Order.objects.get(pk=order.pk).customer == customer
+        Order.objects.create(customer=customer, item="Later", amount=Decimal("2.00"))
+        assert Order.objects.count() == 2
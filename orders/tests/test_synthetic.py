@@ -0,0 +1,57 @@
+import io
+import pytest
+from datetime import datetime, timezone
+from django.core.management import CommandError, call_command
+from orders import synthetic
+from orders.models import Order
+from customers.models import Customer
+
+
+class TestSyntheticGenerators:
+    def test_order_chunks_are_deterministic(self):
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        first = synthetic.OrderGenerator(7, range(1, 101), start, 30, 1.1)
+        second = synthetic.OrderGenerator(7, range(1, 101), start, 30, 1.1)
+        assert first.generate(3, 50) == second.generate(3, 50)
+        assert first.generate(3, 50) != first.generate(4, 50)
+
+    def test_orders_per_customer_are_skewed(self):
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        generator = synthetic.OrderGenerator(1, range(1000), start, 30, 1.1)
+        customers = [row[0] for row in generator.generate(0, 5000)]
+        busiest = max(customers.count(c) for c in set(customers))
+        assert busiest > 5000 / 1000 * 20
+
+    def test_chunks_cover_total(self):
+        assert synthetic.chunks(25, 10) == [(0, 10), (1, 10), (2, 5)]
+
+
+@pytest.mark.django_db
+class TestGenerateSyntheticDataCommand:
+    def test_generates_valid_rows(self):
+        call_command(
+            "generate_synthetic_data",
+            customers=20,
+            orders=200,
+            workers=1,
+            batch_size=64,
+            stdout=io.StringIO(),
+        )
+        assert Customer.objects.count() == 20
+        assert Order.objects.count() == 200
+        for customer in Customer.objects.all()[:5]:
+            customer.full_clean()
+        for order in Order.objects.all()[:20]:
+            order.full_clean()
+            assert order.order_time.year == 2024
+
+    def test_orders_only_go_to_generated_customers(self):
+        real = Customer.objects.create(
+            name="Real", code="SMITH", phone_number="+254722000000"
+        )
+        options = dict(workers=1, batch_size=64, stdout=io.StringIO())
+        call_command("generate_synthetic_data", customers=20, orders=200, **options)
+        assert not real.orders.exists()
+
+        with pytest.raises(CommandError, match="already exist"):
+            call_command("generate_synthetic_data", customers=20, orders=0, **options)
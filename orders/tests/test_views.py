@@ -5,6 +5,10 @@ from rest_framework.test import APIClient
 from orders.models import Order
 from customers.models import Customer
 from decimal import Decimal
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from datetime import datetime, timezone
 
 
 @pytest.mark.django_db
@@ -13,6 +17,16 @@ class TestOrderViews:
     def api_client(self):
         return APIClient()
 
+    @pytest.fixture
+    def auth_client(self, api_client, settings, django_user_model):
+        cache.clear()
+        settings.API_KEY = "test-key"
+        settings.OIDC_OP_JWKS_ENDPOINT = "https://oidc.example.com/jwks"
+        user = django_user_model.objects.create_user(username="tester")
+        api_client.force_authenticate(user=user)
+        api_client.credentials(HTTP_X_API_KEY="test-key")
+        return api_client
+
     @pytest.fixture
     def customer(self):
         return Customer.objects.create(
@@ -37,3 +51,122 @@ class TestOrderViews:
         response = api_client.get(url, {"q": "Test"})
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data) == 1
+
+    def test_filter_orders_by_date_range_includes_end_date(self, auth_client, customer):
+        for day in (1, 15, 31):
+            order = Order.objects.create(
+                customer=customer, item="Test Item", amount=Decimal("100.00")
+            )
+            Order.objects.filter(pk=order.pk).update(
+                order_time=datetime(2025, 1, day, 23, 30, tzinfo=timezone.utc)
+            )
+        url = reverse("order-list-create")
+        response = auth_client.get(
+            url, {"start_date": "2025-01-15", "end_date": "2025-01-31"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 2
+
+    def test_list_orders_without_count(self, auth_client, customer):
+        Order.objects.create(
+            customer=customer, item="Test Item", amount=Decimal("100.00")
+        )
+        url = reverse("order-list-create")
+        response = auth_client.get(url, {"count": "none"})
+        assert response.status_code == status.HTTP_200_OK
+        assert "count" not in response.data
+        assert response.data["count_type"] == "none"
+
+        response = auth_client.get(url, {"count": "bogus"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_list_is_paginated(self, auth_client, customer):
+        for i in range(3):
+            Order.objects.create(
+                customer=customer, item=f"Item {i}", amount=Decimal("1.00")
+            )
+        url = reverse("order-list-create")
+        first = auth_client.get(url, {"limit": 2}).data
+        assert first["count"] == 3
+        assert first["has_more"]
+        second = auth_client.get(url, {"limit": 2, "offset": 2}).data
+        assert not second["has_more"]
+        ids = [o["id"] for o in first["results"] + second["results"]]
+        assert sorted(ids) == sorted(Order.objects.values_list("pk", flat=True))
+
+        response = auth_client.get(url, {"limit": 0})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_count_none_loads_only_the_page(self, auth_client, customer):
+        for i in range(3):
+            Order.objects.create(
+                customer=customer, item=f"Item {i}", amount=Decimal("1.00")
+            )
+        url = reverse("order-list-create")
+        with CaptureQueriesContext(connection) as queries:
+            response = auth_client.get(url, {"count": "none", "limit": 1})
+        assert len(response.data["results"]) == 1
+        selects = [q["sql"] for q in queries if q["sql"].startswith("SELECT")]
+        assert not any("COUNT(" in sql for sql in selects)
+        assert any("LIMIT 2" in sql for sql in selects)
+
+    def test_count_is_estimated_above_threshold(
+        self, auth_client, customer, settings, monkeypatch
+    ):
+        Order.objects.create(customer=customer, item="Item", amount=Decimal("1.00"))
+        # Stand in for the planner, which only PostgreSQL has.
+        monkeypatch.setattr("core.counting.estimate_count", lambda queryset: 50000)
+        settings.COUNT_ESTIMATE_THRESHOLD = 10000
+        url = reverse("order-list-create")
+        response = auth_client.get(url)
+        assert response.data["count_type"] == "estimated"
+        assert response.data["count"] == 50000
+        assert len(response.data["results"]) == 1
+
+        settings.COUNT_ESTIMATE_THRESHOLD = 100000
+        response = auth_client.get(reverse("order-search"), {"q": "item"})
+        assert response.data["count_type"] == "exact"
+        assert response.data["count"] == 1
+
+    def test_repeated_search_is_served_from_cache(
+        self, auth_client, customer, django_assert_num_queries
+    ):
+        Order.objects.create(
+            customer=customer, item="Test Item", amount=Decimal("100.00")
+        )
+        url = reverse("order-search")
+        first = auth_client.get(url, {"q": "test"})
+        with django_assert_num_queries(0):
+            second = auth_client.get(url, {"q": "TEST"})
+        assert second.data == first.data
+
+    def test_pages_above_the_row_cap_are_not_cached(
+        self, auth_client, customer, settings, django_assert_num_queries
+    ):
+        settings.QUERY_CACHE_MAX_ROWS = 10
+        Order.objects.create(
+            customer=customer, item="Test Item", amount=Decimal("100.00")
+        )
+        url = reverse("order-search")
+        auth_client.get(url, {"q": "test", "limit": 10})
+        with django_assert_num_queries(0):
+            auth_client.get(url, {"q": "test", "limit": 10})
+
+        first = auth_client.get(url, {"q": "test", "limit": 11})
+        with CaptureQueriesContext(connection) as queries:
+            second = auth_client.get(url, {"q": "test", "limit": 11})
+        assert queries
+        assert second.data == first.data
+
+    def test_writes_invalidate_cached_results(self, auth_client, customer):
+        url = reverse("order-list-create")
+        Order.objects.create(customer=customer, item="First", amount=Decimal("1.00"))
+        assert auth_client.get(url).data["count"] == 1
+
+        Order.objects.create(customer=customer, item="Second", amount=Decimal("2.00"))
+        assert auth_client.get(url).data["count"] == 2
+
+        customer.name = "Renamed Customer"
+        customer.save()
+        results = auth_client.get(url).data["results"]
+        assert {r["customer_name"] for r in results} == {"Renamed Customer"}
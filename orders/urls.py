@@ -1,8 +1,27 @@
 from django.urls import path
-from .views import OrderListCreateView, OrderDetailView, OrderSearchView
+from .views import (
+    OrderListCreateView,
+    OrderDetailView,
+    OrderSearchView,
+    SMSDeliveryReportView,
+    SMSDeliveryStatsView,
+)
+from .streaming import OrderEventTokenView, order_event_stream
 
 urlpatterns = [
     path("", OrderListCreateView.as_view(), name="order-list-create"),
     path("<int:pk>/", OrderDetailView.as_view(), name="order-detail"),
     path("search/", OrderSearchView.as_view(), name="order-search"),
+    path("events/", order_event_stream, name="order-events"),
+    path("events/token/", OrderEventTokenView.as_view(), name="order-events-token"),
+    path(
+        "sms/delivery-reports/",
+        SMSDeliveryReportView.as_view(),
+        name="sms-delivery-reports",
+    ),
+    path(
+        "sms/delivery-stats/",
+        SMSDeliveryStatsView.as_view(),
+        name="sms-delivery-stats",
+    ),
 ]
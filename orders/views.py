@@ -1,18 +1,76 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.permissions import IsAuthenticated
-from mozilla_django_oidc.contrib.drf import OIDCAuthentication
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from core.authentication.drf import OIDCAuthentication
 from django.shortcuts import get_object_or_404
 from django.core.exceptions import ValidationError
-from .models import Order
+from core.counting import (
+    InvalidCountMode,
+    InvalidPage,
+    get_count_mode,
+    get_page,
+    paginate,
+)
+from core.multiget import InvalidIds, get_ids
+from core.query_cache import cached_query
+from customers.models import Customer
+from .archive import get_archive_store
+from .delivery_reports import (
+    DELIVERED,
+    DELIVERY_STATUSES,
+    FINAL_STATUSES,
+    get_report_buffer,
+)
+from .models import Order, SMSDeliveryStat
 from .serializers import OrderSerializer
-from datetime import datetime
+from datetime import datetime, timedelta
+from django.utils import timezone
 from django.db.models import Q
+from django.conf import settings
+import hmac
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Order list and search results read both tables (customer_name, search on
+# customer fields), so a write to either invalidates them.
+ORDER_QUERY_TABLES = [Order._meta.db_table, Customer._meta.db_table]
+
+
+def start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, datetime.min.time()))
+
+
+def archived_orders(start, end, ids=None, exclude=()):
+    """
+    Serialize archived orders placed in [start, end) like OrderSerializer
+    does, skipping ids in ``exclude`` (orders that are still live).
+    """
+    rows = [
+        row
+        for row in get_archive_store().rows(start, end)
+        if row["id"] not in exclude and (ids is None or row["id"] in ids)
+    ]
+    names = dict(
+        Customer.objects.filter(pk__in={row["customer_id"] for row in rows})
+        .order_by()
+        .values_list("pk", "name")
+    )
+    fields = OrderSerializer().fields
+    return [
+        {
+            "id": row["id"],
+            "customer_name": names.get(row["customer_id"]),
+            "item": row["item"],
+            "amount": fields["amount"].to_representation(row["amount"]),
+            "order_time": fields["order_time"].to_representation(row["order_time"]),
+            "status": row["status"],
+            "sms_status": None,
+        }
+        for row in rows
+    ]
+
 
 class OrderListCreateView(APIView):
     authentication_classes = [OIDCAuthentication]
@@ -23,25 +81,32 @@ class OrderListCreateView(APIView):
         List all orders with optional date range filtering.
 
         Query Parameters:
+            ids: Only return these orders (comma-separated IDs)
             start_date: Start date (YYYY-MM-DD)
             end_date: End date (YYYY-MM-DD)
+            include_archived: "true" to also return archived orders placed
+                in the date range, after the live ones
+            count: Count mode, one of auto (default), exact, estimated, none
+            limit: Page size (default LIST_PAGE_SIZE)
+            offset: Number of orders to skip
 
         Returns:
             Response: List of filtered orders
         """
         try:
+            count_mode = get_count_mode(request)
+            limit, offset = get_page(request)
+            ids = get_ids(request)
             start_date = request.query_params.get("start_date")
             end_date = request.query_params.get("end_date")
-
-            orders = Order.objects.all()
+            include_archived = (
+                request.query_params.get("include_archived", "").lower() == "true"
+            )
 
             if start_date and end_date:
                 try:
-                    start_date = datetime.strptime(start_date, "%Y-%m-%d")
-                    end_date = datetime.strptime(end_date, "%Y-%m-%d")
-                    orders = orders.filter(
-                        order_time__date__range=[start_date, end_date]
-                    )
+                    start_date = datetime.strptime(start_date, "%Y-%m-%d").date()
+                    end_date = datetime.strptime(end_date, "%Y-%m-%d").date()
                 except ValueError:
                     return Response(
                         {
@@ -50,17 +115,80 @@ class OrderListCreateView(APIView):
                         },
                         status=status.HTTP_400_BAD_REQUEST,
                     )
+            else:
+                # Archives are only searched by date range.
+                start_date = end_date = None
+                include_archived = False
 
-            serializer = OrderSerializer(orders, many=True)
-            return Response(
-                {
+            def fetch():
+                orders = Order.objects.order_by("-order_time", "-id")
+                if ids is not None:
+                    orders = orders.filter(pk__in=ids)
+                if start_date and end_date:
+                    # Compare the raw column against a half-open range so
+                    # Postgres can use the order_time index and prune
+                    # monthly partitions; casting order_time to a date
+                    # defeats both.
+                    start = start_of_day(start_date)
+                    end = start_of_day(end_date + timedelta(days=1))
+                    orders = orders.filter(order_time__gte=start, order_time__lt=end)
+                if not include_archived:
+                    page, fields = paginate(orders, limit, offset, count_mode)
+                    serializer = OrderSerializer(page, many=True)
+                    return {"status": "success", **fields, "results": serializer.data}
+
+                # Archived orders are listed after the live ones, so paging
+                # needs the number of live orders in the range, which makes
+                # the count exact. Orders archived without --prune are still
+                # live; list them once.
+                live_ids = set(orders.values_list("pk", flat=True))
+                archived = archived_orders(
+                    start,
+                    end,
+                    ids=None if ids is None else set(ids),
+                    exclude=live_ids,
+                )
+                page = list(orders[offset : offset + limit])
+                archived_offset = max(0, offset - len(live_ids))
+                results = [
+                    *OrderSerializer(page, many=True).data,
+                    *archived[archived_offset : archived_offset + limit - len(page)],
+                ]
+                total = len(live_ids) + len(archived)
+                fields = {"count_type": "none"}
+                if count_mode != "none":
+                    fields = {"count": total, "count_type": "exact"}
+                return {
                     "status": "success",
-                    "count": len(serializer.data),
-                    "results": serializer.data,
+                    **fields,
+                    "has_more": offset + limit < total,
+                    "results": results,
                 }
+
+            return Response(
+                cached_query(
+                    "orders:list",
+                    {
+                        "ids": ids,
+                        "start": start_date,
+                        "end": end_date,
+                        "archived": include_archived,
+                        "count": count_mode,
+                        "limit": limit,
+                        "offset": offset,
+                    },
+                    ORDER_QUERY_TABLES,
+                    fetch,
+                    rows=limit,
+                )
+            )
+        except (InvalidCountMode, InvalidPage, InvalidIds) as e:
+            return Response(
+                {"status": "error", "message": str(e)},
+                status=status.HTTP_400_BAD_REQUEST,
             )
         except Exception as e:
-            logger.error(f"Error fetching orders: {str(e)}")
+            logger.error("Error fetching orders: %s", e)
             return Response(
                 {"status": "error", "message": "Failed to fetch orders"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -77,7 +205,7 @@ class OrderListCreateView(APIView):
             serializer = OrderSerializer(data=request.data)
             if serializer.is_valid():
                 order = serializer.save()
-                logger.info(f"Created new order for customer: {order.customer.code}")
+                logger.info("Created new order for customer: %s", order.customer.code)
                 return Response(
                     {
                         "status": "success",
@@ -91,7 +219,7 @@ class OrderListCreateView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
         except Exception as e:
-            logger.error(f"Error creating order: {str(e)}")
+            logger.error("Error creating order: %s", e)
             return Response(
                 {"status": "error", "message": "Failed to create order"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -126,7 +254,7 @@ class OrderDetailView(APIView):
                 status=status.HTTP_404_NOT_FOUND,
             )
         except Exception as e:
-            logger.error(f"Error retrieving order {pk}: {str(e)}")
+            logger.error("Error retrieving order %s: %s", pk, e)
             return Response(
                 {"status": "error", "message": "Failed to retrieve order"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -143,28 +271,163 @@ class OrderSearchView(APIView):
 
         Query Parameters:
             q: Search query string
+            count: Count mode, one of auto (default), exact, estimated, none
+            limit: Page size (default LIST_PAGE_SIZE)
+            offset: Number of orders to skip
 
         Returns:
             Response: List of matching orders
         """
         try:
+            count_mode = get_count_mode(request)
+            limit, offset = get_page(request)
             query = request.query_params.get("q", "")
-            orders = Order.objects.filter(
-                Q(customer__name__icontains=query)
-                | Q(customer__code__icontains=query)
-                | Q(item__icontains=query)
+
+            def fetch():
+                orders = Order.objects.filter(
+                    Q(customer__name__icontains=query)
+                    | Q(customer__code__icontains=query)
+                    | Q(item__icontains=query)
+                ).order_by("-order_time", "-id")
+                page, fields = paginate(orders, limit, offset, count_mode)
+                serializer = OrderSerializer(page, many=True)
+                return {"status": "success", **fields, "results": serializer.data}
+
+            # The match is case-insensitive, so differently cased searches
+            # share one entry.
+            return Response(
+                cached_query(
+                    "orders:search",
+                    {
+                        "q": query.lower(),
+                        "count": count_mode,
+                        "limit": limit,
+                        "offset": offset,
+                    },
+                    ORDER_QUERY_TABLES,
+                    fetch,
+                    rows=limit,
+                )
             )
-            serializer = OrderSerializer(orders, many=True)
+        except (InvalidCountMode, InvalidPage) as e:
             return Response(
-                {
-                    "status": "success",
-                    "count": len(serializer.data),
-                    "results": serializer.data,
-                }
+                {"status": "error", "message": str(e)},
+                status=status.HTTP_400_BAD_REQUEST,
             )
         except Exception as e:
-            logger.error(f"Error searching orders: {str(e)}")
+            logger.error("Error searching orders: %s", e)
             return Response(
                 {"status": "error", "message": "Failed to search orders"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
+
+
+class SMSDeliveryReportView(APIView):
+    # Africa's Talking can send neither an API key nor an OIDC token, so the
+    # callback URL carries SMS_CALLBACK_TOKEN instead.
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def post(self, request):
+        """
+        Receive an Africa's Talking delivery report for an order SMS.
+
+        Query Parameters:
+            token: Must match SMS_CALLBACK_TOKEN
+
+        Returns:
+            Response: Acknowledgement once the report is buffered
+        """
+        token = request.query_params.get("token", "")
+        if not settings.SMS_CALLBACK_TOKEN or not hmac.compare_digest(
+            token, settings.SMS_CALLBACK_TOKEN
+        ):
+            return Response(
+                {"status": "error", "message": "Invalid callback token"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        message_id = request.data.get("id")
+        delivery_status = request.data.get("status")
+        if not message_id or delivery_status not in DELIVERY_STATUSES:
+            return Response(
+                {"status": "error", "message": "Invalid delivery report"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if not get_report_buffer().add(message_id, delivery_status):
+            logger.warning("SMS delivery report buffer is full")
+            return Response(
+                {"status": "error", "message": "Try again later"},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+        return Response({"status": "success"})
+
+
+class SMSDeliveryStatsView(APIView):
+    authentication_classes = [OIDCAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """
+        Daily delivery statistics of order confirmation SMSes.
+
+        Query Parameters:
+            start_date: First send date (YYYY-MM-DD)
+            end_date: Last send date (YYYY-MM-DD)
+
+        Returns:
+            Response: Per-day sent, delivered, failed and pending counts
+        """
+        try:
+            stats = SMSDeliveryStat.objects.all()
+            try:
+                start_date = request.query_params.get("start_date")
+                end_date = request.query_params.get("end_date")
+                if start_date:
+                    stats = stats.filter(
+                        date__gte=datetime.strptime(start_date, "%Y-%m-%d").date()
+                    )
+                if end_date:
+                    stats = stats.filter(
+                        date__lte=datetime.strptime(end_date, "%Y-%m-%d").date()
+                    )
+            except ValueError:
+                return Response(
+                    {
+                        "status": "error",
+                        "message": "Invalid date format. Use YYYY-MM-DD",
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            days = {}
+            for stat in stats:
+                day = days.setdefault(
+                    stat.date,
+                    {
+                        "date": stat.date,
+                        "sent": 0,
+                        "delivered": 0,
+                        "failed": 0,
+                        "pending": 0,
+                    },
+                )
+                day["sent"] += stat.count
+                if stat.status == DELIVERED:
+                    day["delivered"] += stat.count
+                elif stat.status in FINAL_STATUSES:
+                    day["failed"] += stat.count
+                else:
+                    day["pending"] += stat.count
+            for day in days.values():
+                day["delivery_rate"] = (
+                    round(day["delivered"] / day["sent"], 4) if day["sent"] else None
+                )
+            return Response({"status": "success", "results": list(days.values())})
+        except Exception as e:
+            logger.error("Error fetching SMS delivery stats: %s", e)
+            return Response(
+                {"status": "error", "message": "Failed to fetch SMS delivery stats"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
@@ -0,0 +1,39 @@
+# Generated by Django 5.1.4 on 2026-10-19 01:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="Tombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("model", models.CharField(max_length=100)),
+                ("object_id", models.BigIntegerField()),
+                ("deleted_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "db_table": "sync_tombstones",
+                "ordering": ["id"],
+                "indexes": [
+                    models.Index(
+                        fields=["model", "id"], name="sync_tombst_model_c4eabf_idx"
+                    )
+                ],
+            },
+        ),
+    ]
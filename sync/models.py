@@ -0,0 +1,23 @@
+from django.db import models
+
+
+class Tombstone(models.Model):
+    """
+    Record of a deleted row, kept so delta sync clients learn about
+    deletions. ``model`` is the deleted object's model label, e.g.
+    ``orders.order``.
+    """
+
+    model = models.CharField(max_length=100)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "sync_tombstones"
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["model", "id"]),
+        ]
+
+    def __str__(self):
+        return f"{self.model} {self.object_id} deleted at {self.deleted_at}"
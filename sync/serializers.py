@@ -0,0 +1,25 @@
+from rest_framework import serializers
+from customers.models import Customer
+from orders.models import Order
+
+
+class OrderSyncSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Order
+        fields = [
+            "id",
+            "customer",
+            "item",
+            "amount",
+            "order_time",
+            "status",
+            "updated_at",
+        ]
+        read_only_fields = fields
+
+
+class CustomerSyncSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Customer
+        fields = ["id", "name", "code", "phone_number", "created_at", "updated_at"]
+        read_only_fields = fields
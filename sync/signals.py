@@ -0,0 +1,13 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from customers.models import Customer
+from orders.models import Order
+from .models import Tombstone
+
+
+@receiver(post_delete, sender=Order)
+@receiver(post_delete, sender=Customer)
+def record_tombstone(sender, instance, **kwargs):
+    """Leave a tombstone behind for every deleted order and customer."""
+    Tombstone.objects.create(model=sender._meta.label_lower, object_id=instance.pk)
@@ -0,0 +1,73 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from orders.models import Order
+from customers.models import Customer
+from decimal import Decimal
+
+
+@pytest.mark.django_db
+class TestSyncViews:
+    @pytest.fixture
+    def auth_client(self, settings, django_user_model):
+        settings.API_KEY = "test-key"
+        settings.OIDC_OP_JWKS_ENDPOINT = "https://oidc.example.com/jwks"
+        settings.SYNC_SAFETY_LAG_SECONDS = 0
+        client = APIClient()
+        user = django_user_model.objects.create_user(username="tester")
+        client.force_authenticate(user=user)
+        client.credentials(HTTP_X_API_KEY="test-key")
+        return client
+
+    @pytest.fixture
+    def customer(self):
+        return Customer.objects.create(
+            name="Test Customer", code="TEST123", phone_number="+254722000000"
+        )
+
+    def test_sync_returns_only_changes_since_token(self, auth_client, customer):
+        orders = [
+            Order.objects.create(customer=customer, item=f"Item {i}", amount="1.00")
+            for i in range(3)
+        ]
+        url = reverse("sync", args=["orders"])
+
+        response = auth_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert [o["id"] for o in response.data["upserts"]] == [o.id for o in orders]
+        token = response.data["next_token"]
+
+        response = auth_client.get(url, {"since": token})
+        assert response.data["upserts"] == []
+        assert response.data["deletes"] == []
+
+        orders[0].status = "COMPLETED"
+        orders[0].save()
+        deleted_id = orders[1].id
+        orders[1].delete()
+
+        response = auth_client.get(url, {"since": token})
+        assert [o["id"] for o in response.data["upserts"]] == [orders[0].id]
+        assert response.data["upserts"][0]["status"] == "COMPLETED"
+        assert response.data["deletes"] == [deleted_id]
+
+    def test_sync_pages_with_limit(self, auth_client, customer):
+        for i in range(3):
+            Order.objects.create(customer=customer, item=f"Item {i}", amount="1.00")
+        url = reverse("sync", args=["orders"])
+
+        response = auth_client.get(url, {"limit": 2})
+        assert len(response.data["upserts"]) == 2
+        assert response.data["has_more"] is True
+
+        response = auth_client.get(
+            url, {"limit": 2, "since": response.data["next_token"]}
+        )
+        assert [o["item"] for o in response.data["upserts"]] == ["Item 2"]
+        assert response.data["has_more"] is False
+
+    def test_invalid_token(self, auth_client):
+        url = reverse("sync", args=["customers"])
+        response = auth_client.get(url, {"since": "not-a-token"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,66 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from core.authentication.drf import OIDCAuthentication
+from .services import SYNC_RESOURCES, InvalidSyncToken, SyncToken, get_changes
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LIMIT = 1000
+MAX_LIMIT = 10000
+
+
+class SyncView(APIView):
+    authentication_classes = [OIDCAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, resource):
+        """
+        Return rows changed and ids deleted since a sync token.
+
+        Args:
+            resource: "orders" or "customers"
+
+        Query Parameters:
+            since: Token returned by the previous sync (omit for a full sync)
+            limit: Maximum number of upserts and deletes to return
+
+        Returns:
+            Response: Changes, the next token and whether more are pending
+        """
+        if resource not in SYNC_RESOURCES:
+            return Response(
+                {"status": "error", "message": "Unknown sync resource"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        try:
+            token = SyncToken.decode(request.query_params.get("since"))
+            limit = int(request.query_params.get("limit", DEFAULT_LIMIT))
+            if not 0 < limit <= MAX_LIMIT:
+                raise ValueError
+        except InvalidSyncToken as e:
+            return Response(
+                {"status": "error", "message": str(e)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        except ValueError:
+            return Response(
+                {
+                    "status": "error",
+                    "message": f"limit must be between 1 and {MAX_LIMIT}",
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            return Response(
+                {"status": "success", **get_changes(resource, token, limit)}
+            )
+        except Exception as e:
+            logger.error("Error syncing %s: %s", resource, e)
+            return Response(
+                {"status": "error", "message": "Failed to fetch changes"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )